@@ -0,0 +1 @@
+"""Benchmarks for the quote pipeline (run with python -m benchmarks.run)."""
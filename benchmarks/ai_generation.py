@@ -0,0 +1,103 @@
+"""AI generation throughput and robustness test against the fake Anthropic API.
+
+Starts benchmarks.fake_anthropic in-process, points a QuoteGenerator at it
+and generates many quotes from a pool of worker threads, reporting
+throughput, latency, what the parser made of each response and how many
+responses were rejected by validation and generated again.
+
+Usage:
+    python -m benchmarks.ai_generation --requests 500 --workers 8
+    python -m benchmarks.ai_generation --kinds malformed --overload-rate 0.2
+    python -m benchmarks.ai_generation --streaming --kinds chatty --chunk-delay 0.02
+"""
+import argparse
+import logging
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# The fake server accepts any key, but importing the bot needs a complete
+# configuration
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "benchmark")
+os.environ.setdefault("TELEGRAM_CHAT_ID", "benchmark")
+os.environ.setdefault("ANTHROPIC_API_KEY", "benchmark")
+
+from benchmarks import fake_anthropic  # noqa: E402
+
+
+def classify(quote) -> str:
+    """Classify a generated quote by how its response was handled.
+
+    Args:
+        quote: Quote returned by _generate_ai_quote
+
+    Returns:
+        'fallback' (failed or every response rejected), 'leaked' (raw JSON
+        or fences used as the quote text), or 'parsed'
+    """
+    if quote.source == 'fallback':
+        return 'fallback'
+    if quote.text.lstrip().startswith(('{', '```')):
+        return 'leaked'
+    return 'parsed'
+
+
+def main():
+    """Run the test from the command line."""
+    parser = argparse.ArgumentParser(description="AI generation test against a fake Anthropic API")
+    parser.add_argument("--requests", type=int, default=200, help="Number of quotes to generate")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent generation threads")
+    parser.add_argument("--language", default="both", help="Quote language code, or both")
+    parser.add_argument("--streaming", action="store_true",
+                        help="Stream responses and stop at the end of the quote object")
+    fake_anthropic.add_arguments(parser)
+    args = parser.parse_args()
+
+    # Fallbacks are counted below rather than logged one by one
+    logging.disable(logging.ERROR)
+
+    from bot.feedback import FeedbackStore
+    from bot.metrics import AI_INVALID_RESPONSES
+    from bot.quote_generator import QuoteGenerator
+    from bot.token_usage import TokenUsageStore
+
+    server = fake_anthropic.start_fake_anthropic(fake_anthropic.state_from_args(args), port=0)
+    with tempfile.TemporaryDirectory() as tmp:
+        generator = QuoteGenerator(quotes_file=Path(tmp) / "quotes.json",
+                                   base_url=fake_anthropic.base_url(server), feedback=FeedbackStore(),
+                                   token_usage=TokenUsageStore())
+        generator.streaming = args.streaming
+
+        def generate(_):
+            start = time.perf_counter()
+            quote = generator._generate_ai_quote(args.language)
+            return time.perf_counter() - start, classify(quote)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.workers) as pool:
+            results = list(pool.map(generate, range(args.requests)))
+        elapsed = time.perf_counter() - start
+    server.shutdown()
+
+    latencies = sorted(latency for latency, _ in results)
+    outcomes = {}
+    for _, outcome in results:
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+    print(f"requests:     {args.requests} ({server.state.counts['requests']} HTTP calls incl. retries)")
+    print(f"elapsed:      {elapsed:.2f} s")
+    print(f"throughput:   {args.requests / elapsed:.1f} quotes/s")
+    print(f"latency p50:  {statistics.median(latencies) * 1e3:.1f} ms")
+    print(f"latency p95:  {latencies[int(len(latencies) * 0.95) - 1] * 1e3:.1f} ms")
+    print(f"server:       {server.state.counts}")
+    for outcome in ('parsed', 'leaked', 'fallback'):
+        print(f"{outcome + ':':<13} {outcomes.get(outcome, 0)}")
+    rejected = {reason: int(child.value) for (reason,), child in AI_INVALID_RESPONSES._children.items()}
+    print(f"rejected:     {sum(rejected.values())} responses {rejected}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+"""Local stand-in for the Anthropic Messages API, for generation stress tests.
+
+Answers POST /v1/messages with generated quotes in the shapes Claude really
+returns them (code-fenced JSON, bare JSON, JSON followed by commentary,
+plain text) plus malformed JSON, and can inject slow responses and 529
+overloaded errors. Requests with ``"stream": true`` get server-sent events
+with the text split into small deltas. The language of each quote follows
+the prompt (Thai prompts get Thai quotes).
+
+Point the bot at it with ANTHROPIC_BASE_URL=http://127.0.0.1:8082 and run:
+    python -m benchmarks.fake_anthropic --kinds fenced,malformed --overload-rate 0.1
+"""
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Sequence
+
+DEFAULT_PORT = 8082
+
+# Response body shapes the server can return
+RESPONSE_KINDS = ("fenced", "json", "chatty", "text", "malformed")
+
+# Characters per streamed text delta (roughly one token)
+STREAM_CHUNK_CHARS = 4
+
+# Commentary appended to 'chatty' responses
+COMMENTARY = ("\n\nThis quote is a reminder that meaningful change rarely happens all at "
+              "once. Progress comes from showing up consistently, even on the days when "
+              "motivation is low, and trusting that small efforts compound over time.")
+
+# Words the fuzzed quotes are built from
+WORDS = {
+    'en': ["every", "day", "small", "steps", "courage", "grows", "quietly", "light",
+           "begins", "within", "patience", "turns", "effort", "into", "progress"],
+    'th': ["ทุกวัน", "ก้าวเล็ก", "ความกล้า", "เติบโต", "อย่างเงียบ", "แสงสว่าง",
+           "เริ่มต้น", "จากภายใน", "ความอดทน", "เปลี่ยน", "ความพยายาม", "เป็นความก้าวหน้า"],
+}
+
+
+def _is_thai(text: str) -> bool:
+    """Check whether text contains Thai characters."""
+    return any('฀' <= ch <= '๿' for ch in text)
+
+
+class FakeAnthropicState:
+    """Behaviour settings and counters shared by all request handlers."""
+
+    def __init__(self, kinds: Sequence[str] = RESPONSE_KINDS, latency: float = 0.0,
+                 slow_rate: float = 0.0, slow_latency: float = 5.0,
+                 overload_rate: float = 0.0, chunk_delay: float = 0.0,
+                 seed: Optional[int] = None):
+        """Initialize the state.
+
+        Args:
+            kinds: Response shapes to choose from uniformly
+            latency: Seconds added to every response
+            slow_rate: Probability (0-1) that a response is slow
+            slow_latency: Seconds added to slow responses
+            overload_rate: Probability (0-1) of a 529 overloaded error
+            chunk_delay: Seconds per text delta (non-streamed responses wait
+                for all of them)
+            seed: Random seed for reproducible responses
+        """
+        unknown = set(kinds) - set(RESPONSE_KINDS)
+        if unknown:
+            raise ValueError(f"Unknown response kinds: {sorted(unknown)}")
+        self.kinds = tuple(kinds)
+        self.latency = latency
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.overload_rate = overload_rate
+        self.chunk_delay = chunk_delay
+        self.counts = {kind: 0 for kind in self.kinds}
+        self.counts.update({'requests': 0, 'slow': 0, 'overloaded': 0,
+                            'streamed_chunks': 0, 'streams_cancelled': 0})
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def plan(self) -> tuple:
+        """Decide how to answer one request.
+
+        Returns:
+            (delay seconds, response kind or 'overloaded', random seed for the body)
+        """
+        with self._lock:
+            self.counts['requests'] += 1
+            delay = self.latency
+            if self.slow_rate and self._rng.random() < self.slow_rate:
+                self.counts['slow'] += 1
+                delay += self.slow_latency
+
+            if self.overload_rate and self._rng.random() < self.overload_rate:
+                self.counts['overloaded'] += 1
+                return delay, 'overloaded', 0
+
+            kind = self._rng.choice(self.kinds)
+            self.counts[kind] += 1
+            return delay, kind, self._rng.getrandbits(32)
+
+
+def make_quote_text(kind: str, language: str, rng: random.Random) -> str:
+    """Build a response body of the given shape.
+
+    Args:
+        kind: One of RESPONSE_KINDS
+        language: 'en' or 'th'
+        rng: Random source
+
+    Returns:
+        Assistant message text
+    """
+    separator = "" if language == 'th' else " "
+    text = separator.join(rng.choice(WORDS[language]) for _ in range(rng.randint(5, 12)))
+    if language == 'en':
+        text = text.capitalize() + "."
+    author = "ไม่ระบุ" if language == 'th' else rng.choice(["Unknown", "Anonymous"])
+    body = json.dumps({'text': text, 'author': author, 'language': language},
+                      ensure_ascii=False, indent=2)
+
+    if kind == "fenced":
+        return f"```json\n{body}\n```"
+    if kind == "json":
+        return body
+    if kind == "chatty":
+        return body + COMMENTARY
+    if kind == "text":
+        return text
+    # Malformed: truncated mid-object, or a trailing comma
+    if rng.random() < 0.5:
+        return body[:rng.randint(1, len(body) - 2)]
+    return body[:-2] + ",\n}"
+
+
+def _make_handler(state: FakeAnthropicState):
+    """Build a request handler class bound to a state object."""
+
+    class FakeAnthropicHandler(BaseHTTPRequestHandler):
+        """Answer POST /v1/messages."""
+
+        def _reply(self, status: int, payload: dict):
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            try:
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('request-id', f"req_{os.urandom(8).hex()}")
+                self.end_headers()
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                # Client timed out and closed the connection
+                pass
+
+        def _event(self, event: str, data: dict):
+            """Write one server-sent event."""
+            self.wfile.write(f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+                             .encode('utf-8'))
+            self.wfile.flush()
+
+        def _stream(self, message: dict, text: str):
+            """Send a message as Messages API streaming events."""
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Cache-Control', 'no-cache')
+            self.end_headers()
+            self.close_connection = True
+
+            chunks = [text[i:i + STREAM_CHUNK_CHARS] for i in range(0, len(text), STREAM_CHUNK_CHARS)]
+            sent = 0
+            try:
+                self._event('message_start', {'type': 'message_start', 'message': dict(
+                    message, content=[], stop_reason=None,
+                    usage={'input_tokens': message['usage']['input_tokens'], 'output_tokens': 1})})
+                self._event('content_block_start', {'type': 'content_block_start', 'index': 0,
+                                                    'content_block': {'type': 'text', 'text': ''}})
+                for chunk in chunks:
+                    if state.chunk_delay:
+                        time.sleep(state.chunk_delay)
+                    self._event('content_block_delta', {'type': 'content_block_delta', 'index': 0,
+                                                        'delta': {'type': 'text_delta', 'text': chunk}})
+                    sent += 1
+                self._event('content_block_stop', {'type': 'content_block_stop', 'index': 0})
+                self._event('message_delta', {'type': 'message_delta',
+                                              'delta': {'stop_reason': 'end_turn', 'stop_sequence': None},
+                                              'usage': {'output_tokens': len(chunks)}})
+                self._event('message_stop', {'type': 'message_stop'})
+            except (BrokenPipeError, ConnectionResetError):
+                # Client stopped reading early
+                with state._lock:
+                    state.counts['streams_cancelled'] += 1
+            with state._lock:
+                state.counts['streamed_chunks'] += sent
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            try:
+                request = json.loads(self.rfile.read(length) or b"{}")
+            except json.JSONDecodeError:
+                request = {}
+
+            if self.path.split('?', 1)[0] != '/v1/messages':
+                self._reply(404, {'type': 'error',
+                                  'error': {'type': 'not_found_error', 'message': 'Not found'}})
+                return
+
+            delay, kind, seed = state.plan()
+            if delay:
+                time.sleep(delay)
+
+            if kind == 'overloaded':
+                self._reply(529, {'type': 'error',
+                                  'error': {'type': 'overloaded_error', 'message': 'Overloaded'}})
+                return
+
+            prompt = " ".join(
+                str(message.get('content', '')) for message in request.get('messages', [])
+            )
+            language = 'th' if _is_thai(prompt) else 'en'
+            text = make_quote_text(kind, language, random.Random(seed))
+            message = {
+                'id': f"msg_{os.urandom(12).hex()}",
+                'type': 'message',
+                'role': 'assistant',
+                'model': request.get('model', 'fake'),
+                'content': [{'type': 'text', 'text': text}],
+                'stop_reason': 'end_turn',
+                'stop_sequence': None,
+                'usage': {'input_tokens': len(prompt) // 4, 'output_tokens': len(text) // 4},
+            }
+            if request.get('stream'):
+                self._stream(message, text)
+            else:
+                # A complete response arrives only after every token is generated
+                if state.chunk_delay:
+                    time.sleep(state.chunk_delay * -(-len(text) // STREAM_CHUNK_CHARS))
+                self._reply(200, message)
+
+        def log_message(self, format, *args):
+            """Silence per-request logging."""
+
+    return FakeAnthropicHandler
+
+
+def start_fake_anthropic(state: Optional[FakeAnthropicState] = None, port: int = DEFAULT_PORT,
+                         host: str = '127.0.0.1') -> ThreadingHTTPServer:
+    """Serve the fake Messages API from a background daemon thread.
+
+    Args:
+        state: Behaviour settings (defaults to all response kinds, no faults)
+        port: Port to listen on (0 picks a free port)
+        host: Interface to bind
+
+    Returns:
+        The running HTTP server; its ``state`` attribute holds the counters
+    """
+    state = state or FakeAnthropicState()
+    server = ThreadingHTTPServer((host, port), _make_handler(state))
+    server.daemon_threads = True
+    server.state = state
+    thread = threading.Thread(target=server.serve_forever, name='fake-anthropic', daemon=True)
+    thread.start()
+    return server
+
+
+def base_url(server: ThreadingHTTPServer) -> str:
+    """Get the ANTHROPIC_BASE_URL value for a running fake server.
+
+    Args:
+        server: Server returned by start_fake_anthropic
+
+    Returns:
+        Base URL
+    """
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    """Add the fake server behaviour options to an argument parser."""
+    parser.add_argument("--kinds", default=",".join(RESPONSE_KINDS),
+                        help=f"Comma-separated response shapes from {RESPONSE_KINDS}")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--slow-rate", type=float, default=0.0,
+                        help="Probability that a response is slow")
+    parser.add_argument("--slow-latency", type=float, default=5.0, help="Extra seconds for slow responses")
+    parser.add_argument("--overload-rate", type=float, default=0.0,
+                        help="Probability of a 529 overloaded error")
+    parser.add_argument("--chunk-delay", type=float, default=0.0,
+                        help="Seconds between streamed text deltas")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible responses")
+
+
+def state_from_args(args: argparse.Namespace) -> FakeAnthropicState:
+    """Build a state object from parsed add_arguments() options."""
+    return FakeAnthropicState(kinds=[k for k in args.kinds.split(",") if k], latency=args.latency,
+                              slow_rate=args.slow_rate, slow_latency=args.slow_latency,
+                              overload_rate=args.overload_rate, chunk_delay=args.chunk_delay,
+                              seed=args.seed)
+
+
+def main():
+    """Run the fake server in the foreground."""
+    parser = argparse.ArgumentParser(description="Fake Anthropic Messages API server")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    server = start_fake_anthropic(state_from_args(args), port=args.port)
+    print(f"Fake Anthropic Messages API at {base_url(server)} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(10)
+            print(f"counts: {server.state.counts}")
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
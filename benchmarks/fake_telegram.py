@@ -0,0 +1,497 @@
+"""Local stand-in for the Telegram Bot API, for load testing delivery.
+
+Implements the methods the bot uses (getMe, sendMessage, sendPhoto,
+getUpdates, answerCallbackQuery, setWebhook, deleteWebhook) on the same URL layout as the real API
+(``<base_url><token>/<method>``), with configurable latency, a global
+rate limit answered with 429 ``retry_after``, and random error injection.
+Message text and captions sent with parse_mode MarkdownV2 or HTML are
+checked the way Telegram does, so badly escaped quotes are rejected with
+"can't parse entities".
+
+Point the bot at it with TELEGRAM_BASE_URL=http://127.0.0.1:8081/bot and run:
+    python -m benchmarks.fake_telegram --latency 0.05 --rate-limit 30
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from email import policy
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+from urllib.parse import parse_qsl
+
+DEFAULT_PORT = 8081
+
+# Bot account returned by getMe
+FAKE_BOT_USER = {
+    'id': 1000000,
+    'is_bot': True,
+    'first_name': 'Fake Quote Bot',
+    'username': 'fake_quote_bot',
+}
+
+# Errors returned at random when error injection is enabled
+INJECTED_ERRORS = [
+    (400, "Bad Request: chat not found"),
+    (403, "Forbidden: bot was blocked by the user"),
+    (500, "Internal Server Error"),
+]
+
+# Characters MarkdownV2 reserves outside entities, and its entity markers
+MARKDOWN_V2_RESERVED = "_*[]()~`>#+-=|{}.!"
+MARKDOWN_V2_ENTITIES = {'*': "Bold", '_': "Italic", '__': "Underline", '~': "Strikethrough",
+                        '||': "Spoiler"}
+
+# HTML tags Telegram supports
+HTML_TAGS = {'b', 'strong', 'i', 'em', 'u', 'ins', 's', 'strike', 'del', 'span', 'tg-spoiler',
+             'a', 'code', 'pre', 'blockquote', 'tg-emoji'}
+HTML_TAG = re.compile(r"<(/?)([a-z-]+)(?:\s[^<>]*)?>")
+
+
+def _markdown_v2_error(text: str) -> Optional[str]:
+    """Check MarkdownV2 text, ignoring links and pre blocks which the bot never sends."""
+    open_entities = []
+    i = 0
+    while i < len(text):
+        char = text[i]
+        if char == '\\':
+            i += 2
+            continue
+        if char == '`':
+            end = text.find('`', i + 1)
+            if end < 0:
+                return "Can't find end of Code entity"
+            i = end + 1
+            continue
+        marker = text[i:i + 2] if text[i:i + 2] in ('__', '||') else char
+        if marker in MARKDOWN_V2_ENTITIES:
+            if open_entities and open_entities[-1] == marker:
+                open_entities.pop()
+            else:
+                open_entities.append(marker)
+            i += len(marker)
+            continue
+        if char in MARKDOWN_V2_RESERVED:
+            return f"Character '{char}' is reserved and must be escaped with the preceding '\\'"
+        i += 1
+    if open_entities:
+        return f"Can't find end of {MARKDOWN_V2_ENTITIES[open_entities[-1]]} entity"
+    return None
+
+
+def _html_error(text: str) -> Optional[str]:
+    """Check HTML text for unsupported and unbalanced tags."""
+    open_tags = []
+    for position in (i for i, char in enumerate(text) if char == '<'):
+        match = HTML_TAG.match(text, position)
+        if match is None or match.group(2) not in HTML_TAGS:
+            return f"Unsupported start tag at byte offset {position}"
+        closing, tag = match.groups()
+        if not closing:
+            open_tags.append(tag)
+        elif not open_tags or open_tags.pop() != tag:
+            return f"Unexpected end tag at byte offset {position}"
+    if open_tags:
+        return f"Can't find end tag corresponding to start tag \"{open_tags[-1]}\""
+    return None
+
+
+def markup_error(text: str, parse_mode: Optional[str]) -> Optional[str]:
+    """Check message text the way Telegram parses it.
+
+    Args:
+        text: Message text or caption
+        parse_mode: 'MarkdownV2', 'HTML', or None for plain text (legacy
+            'Markdown' is not checked)
+
+    Returns:
+        The Bot API error description, or None if the text parses
+    """
+    if parse_mode == 'MarkdownV2':
+        error = _markdown_v2_error(text)
+    elif parse_mode == 'HTML':
+        error = _html_error(text)
+    else:
+        error = None
+    return f"Bad Request: can't parse entities: {error}" if error else None
+
+
+class FakeTelegramState:
+    """Behaviour settings and counters shared by all request handlers."""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, rate_limit: float = 0.0,
+                 retry_after: int = 1, error_rate: float = 0.0, seed: Optional[int] = None):
+        """Initialize the state.
+
+        Args:
+            latency: Seconds added to every response
+            jitter: Maximum extra random seconds added to the latency
+            rate_limit: Maximum sendMessage/sendPhoto calls per second (0 for unlimited)
+            retry_after: retry_after seconds returned with a 429
+            error_rate: Probability (0-1) that a sendMessage/sendPhoto call fails
+            seed: Random seed for reproducible error injection
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.error_rate = error_rate
+        self.webhook_url = ""
+        self.updates: List[dict] = []
+        self.counts = {'sent': 0, 'rate_limited': 0, 'errors': 0, 'callbacks_answered': 0,
+                       'photos_uploaded': 0, 'photos_reused': 0, 'parse_errors': 0}
+        self.photos = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._next_message_id = 1
+        self._next_update_id = 1
+        self._window_start = time.monotonic()
+        self._window_count = 0
+
+    def delay(self) -> float:
+        """Get the response delay for one request."""
+        with self._lock:
+            return self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+
+    def admit(self) -> Optional[tuple]:
+        """Apply the rate limit and error injection to a sendMessage or sendPhoto call.
+
+        Returns:
+            (status, description, parameters) if the call is rejected, else None
+        """
+        with self._lock:
+            if self.rate_limit:
+                now = time.monotonic()
+                if now - self._window_start >= 1.0:
+                    self._window_start, self._window_count = now, 0
+                if self._window_count >= self.rate_limit:
+                    self.counts['rate_limited'] += 1
+                    return (429, f"Too Many Requests: retry after {self.retry_after}",
+                            {'retry_after': self.retry_after})
+                self._window_count += 1
+
+            if self.error_rate and self._rng.random() < self.error_rate:
+                self.counts['errors'] += 1
+                status, description = self._rng.choice(INJECTED_ERRORS)
+                return status, description, None
+        return None
+
+    def record_message(self, chat_id, text: str) -> dict:
+        """Record a sent message and build its Message object.
+
+        Args:
+            chat_id: Target chat ID
+            text: Message text
+
+        Returns:
+            Message dictionary
+        """
+        with self._lock:
+            message_id = self._next_message_id
+            self._next_message_id += 1
+            self.counts['sent'] += 1
+        return {
+            'message_id': message_id,
+            'date': int(time.time()),
+            'chat': {'id': int(chat_id) if str(chat_id).lstrip('-').isdigit() else 0, 'type': 'private'},
+            'from': FAKE_BOT_USER,
+            'text': text,
+        }
+
+    def record_photo(self, chat_id, photo, caption: str = "") -> dict:
+        """Record a sent photo and build its Message object.
+
+        Args:
+            chat_id: Target chat ID
+            photo: Uploaded image bytes, or the file_id of an earlier upload
+            caption: Photo caption
+
+        Returns:
+            Message dictionary, or None if photo is an unknown file_id
+        """
+        if isinstance(photo, bytes):
+            file_id = "photo-" + hashlib.sha1(photo).hexdigest()[:16]
+            with self._lock:
+                self.photos[file_id] = len(photo)
+                self.counts['photos_uploaded'] += 1
+        else:
+            file_id = photo
+            with self._lock:
+                if file_id not in self.photos:
+                    return None
+                self.counts['photos_reused'] += 1
+
+        message = self.record_message(chat_id, caption)
+        del message['text']
+        message['caption'] = caption
+        message['photo'] = [{'file_id': file_id, 'file_unique_id': file_id[6:],
+                             'width': 1080, 'height': 1080, 'file_size': self.photos[file_id]}]
+        return message
+
+    def push_update(self, text: str, chat_id: int = 1):
+        """Queue an incoming text message for getUpdates.
+
+        Args:
+            text: Message text (e.g. '/quote')
+            chat_id: Chat the message comes from
+        """
+        with self._lock:
+            update_id = self._next_update_id
+            self._next_update_id += 1
+            self.updates.append({
+                'update_id': update_id,
+                'message': {
+                    'message_id': update_id,
+                    'date': int(time.time()),
+                    'chat': {'id': chat_id, 'type': 'private'},
+                    'from': {'id': chat_id, 'is_bot': False, 'first_name': 'Tester'},
+                    'text': text,
+                    'entities': ([{'type': 'bot_command', 'offset': 0, 'length': len(text.split()[0])}]
+                                 if text.startswith('/') else []),
+                },
+            })
+
+    def push_callback(self, data: str, user_id: int = 1, chat_id: int = 1):
+        """Queue an inline button press for getUpdates.
+
+        Args:
+            data: Callback data of the pressed button
+            user_id: User pressing the button
+            chat_id: Chat of the message the button belongs to
+        """
+        with self._lock:
+            update_id = self._next_update_id
+            self._next_update_id += 1
+            self.updates.append({
+                'update_id': update_id,
+                'callback_query': {
+                    'id': str(update_id),
+                    'from': {'id': user_id, 'is_bot': False, 'first_name': 'Tester'},
+                    'chat_instance': str(chat_id),
+                    'data': data,
+                },
+            })
+
+    def pop_updates(self, offset: int) -> List[dict]:
+        """Confirm updates below offset and return the rest.
+
+        Args:
+            offset: First update ID the client has not seen
+
+        Returns:
+            List of pending updates
+        """
+        with self._lock:
+            self.updates = [u for u in self.updates if u['update_id'] >= offset]
+            return list(self.updates)
+
+
+def _make_handler(state: FakeTelegramState):
+    """Build a request handler class bound to a state object."""
+
+    class FakeTelegramHandler(BaseHTTPRequestHandler):
+        """Answer Bot API calls at /bot<token>/<method>."""
+
+        def do_GET(self):
+            self._handle()
+
+        def do_POST(self):
+            self._handle()
+
+        def _params(self) -> dict:
+            """Parse JSON or form-encoded request parameters."""
+            length = int(self.headers.get('Content-Length') or 0)
+            body = self.rfile.read(length) if length else b""
+            content_type = self.headers.get('Content-Type', '')
+            if 'json' in content_type and body:
+                return json.loads(body)
+            if 'multipart/form-data' in content_type:
+                form = BytesParser(policy=policy.HTTP).parsebytes(
+                    b"Content-Type: " + content_type.encode('latin-1') + b"\r\n\r\n" + body
+                )
+                params = {}
+                for part in form.iter_parts():
+                    name = part.get_param('name', header='content-disposition')
+                    payload = part.get_payload(decode=True)
+                    # Uploaded files stay bytes; other fields are text
+                    params[name] = payload if part.get_filename() else payload.decode('utf-8')
+                return params
+            params = dict(parse_qsl(body.decode('utf-8')))
+            if '?' in self.path:
+                params.update(parse_qsl(self.path.split('?', 1)[1]))
+            return params
+
+        def _reply(self, status: int, payload: dict):
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            try:
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                # Client gave up waiting (e.g. a long poll cancelled on shutdown)
+                pass
+
+        def _error(self, status: int, description: str, parameters: Optional[dict] = None):
+            payload = {'ok': False, 'error_code': status, 'description': description}
+            if parameters:
+                payload['parameters'] = parameters
+            self._reply(status, payload)
+
+        def _rejects_markup(self, text: str, parse_mode: Optional[str]) -> bool:
+            """Answer 400 if the text does not parse in its parse mode."""
+            error = markup_error(text, parse_mode)
+            if error:
+                with state._lock:
+                    state.counts['parse_errors'] += 1
+                self._error(400, error)
+            return bool(error)
+
+        def _handle(self):
+            path = self.path.split('?', 1)[0]
+            method = path.rsplit('/', 1)[-1]
+            params = self._params()
+
+            delay = state.delay()
+            if delay:
+                time.sleep(delay)
+
+            if method == 'getMe':
+                self._reply(200, {'ok': True, 'result': FAKE_BOT_USER})
+            elif method == 'sendMessage':
+                if 'chat_id' not in params or 'text' not in params:
+                    self._error(400, "Bad Request: chat_id and text are required")
+                    return
+                if self._rejects_markup(params['text'], params.get('parse_mode')):
+                    return
+                rejected = state.admit()
+                if rejected:
+                    self._error(*rejected)
+                    return
+                message = state.record_message(params['chat_id'], params['text'])
+                self._reply(200, {'ok': True, 'result': message})
+            elif method == 'sendPhoto':
+                if 'chat_id' not in params or 'photo' not in params:
+                    self._error(400, "Bad Request: chat_id and photo are required")
+                    return
+                if self._rejects_markup(params.get('caption', ''), params.get('parse_mode')):
+                    return
+                rejected = state.admit()
+                if rejected:
+                    self._error(*rejected)
+                    return
+                message = state.record_photo(params['chat_id'], params['photo'],
+                                             params.get('caption', ''))
+                if message is None:
+                    self._error(400, "Bad Request: wrong file identifier/HTTP URL specified")
+                    return
+                self._reply(200, {'ok': True, 'result': message})
+            elif method == 'getUpdates':
+                updates = state.pop_updates(int(params.get('offset') or 0))
+                if not updates:
+                    # Shortened long poll so the client loop keeps turning
+                    time.sleep(min(float(params.get('timeout') or 0), 1.0))
+                self._reply(200, {'ok': True, 'result': updates})
+            elif method == 'answerCallbackQuery':
+                with state._lock:
+                    state.counts['callbacks_answered'] += 1
+                self._reply(200, {'ok': True, 'result': True})
+            elif method == 'setWebhook':
+                state.webhook_url = params.get('url', '')
+                self._reply(200, {'ok': True, 'result': True, 'description': 'Webhook was set'})
+            elif method == 'deleteWebhook':
+                state.webhook_url = ""
+                self._reply(200, {'ok': True, 'result': True, 'description': 'Webhook was deleted'})
+            else:
+                self._error(404, "Not Found")
+
+        def log_message(self, format, *args):
+            """Silence per-request logging."""
+
+    return FakeTelegramHandler
+
+
+class _FakeTelegramServer(ThreadingHTTPServer):
+    """HTTP server accepting a whole concurrent broadcast's connections at once."""
+
+    # Listen backlog; the default of 5 drops connections when a broadcast
+    # opens up to SEND_CONCURRENCY of them together
+    request_queue_size = 128
+
+
+def start_fake_telegram(state: Optional[FakeTelegramState] = None, port: int = DEFAULT_PORT,
+                        host: str = '127.0.0.1') -> ThreadingHTTPServer:
+    """Serve the fake Bot API from a background daemon thread.
+
+    Args:
+        state: Behaviour settings (defaults to no latency or faults)
+        port: Port to listen on (0 picks a free port)
+        host: Interface to bind
+
+    Returns:
+        The running HTTP server; its ``state`` attribute holds the counters
+    """
+    state = state or FakeTelegramState()
+    server = _FakeTelegramServer((host, port), _make_handler(state))
+    server.daemon_threads = True
+    server.state = state
+    thread = threading.Thread(target=server.serve_forever, name='fake-telegram', daemon=True)
+    thread.start()
+    return server
+
+
+def base_url(server: ThreadingHTTPServer) -> str:
+    """Get the TELEGRAM_BASE_URL value for a running fake server.
+
+    Args:
+        server: Server returned by start_fake_telegram
+
+    Returns:
+        Base URL ending in '/bot'
+    """
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}/bot"
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    """Add the fake server behaviour options to an argument parser."""
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Maximum extra random latency")
+    parser.add_argument("--rate-limit", type=float, default=0.0,
+                        help="sendMessage/sendPhoto calls per second before 429 (0 for unlimited)")
+    parser.add_argument("--retry-after", type=int, default=1, help="retry_after returned with 429")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Probability that a sendMessage/sendPhoto call fails")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for error injection")
+
+
+def state_from_args(args: argparse.Namespace) -> FakeTelegramState:
+    """Build a state object from parsed add_arguments() options."""
+    return FakeTelegramState(latency=args.latency, jitter=args.jitter, rate_limit=args.rate_limit,
+                             retry_after=args.retry_after, error_rate=args.error_rate, seed=args.seed)
+
+
+def main():
+    """Run the fake server in the foreground."""
+    parser = argparse.ArgumentParser(description="Fake Telegram Bot API server")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    server = start_fake_telegram(state_from_args(args), port=args.port)
+    print(f"Fake Telegram Bot API at {base_url(server)} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(10)
+            print(f"counts: {server.state.counts}")
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
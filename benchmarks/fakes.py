@@ -0,0 +1,140 @@
+"""Offline stand-ins for the Anthropic and Telegram clients used by benchmarks."""
+import json
+import random
+from pathlib import Path
+from types import SimpleNamespace
+
+from telegram.request import BaseRequest
+
+# Canned AI response in the code-fenced form Claude often returns
+FAKE_AI_RESPONSE = """```json
+{
+  "text": "Small steps every day add up to big changes.",
+  "author": "Unknown",
+  "language": "en"
+}
+```"""
+
+# The same for prompts in Thai
+FAKE_AI_RESPONSE_TH = """```json
+{
+  "text": "ก้าวเล็กๆ ทุกวันรวมกันเป็นการเปลี่ยนแปลงที่ยิ่งใหญ่",
+  "author": "ไม่ระบุ",
+  "language": "th"
+}
+```"""
+
+# Tags given to synthetic quotes (up to two each)
+SYNTHETIC_TAGS = ('morning', 'evening', 'motivation', 'calm', 'work', 'health')
+
+
+class FakeAnthropic:
+    """Mimic anthropic.Anthropic with an instant canned messages.create()."""
+
+    def __init__(self, text: str = FAKE_AI_RESPONSE, thai_text: str = FAKE_AI_RESPONSE_TH):
+        """Initialize the fake client.
+
+        Args:
+            text: Response text returned for every prompt not in Thai
+            thai_text: Response text returned for Thai prompts, so the
+                quote passes language validation
+        """
+        responses = {
+            thai: SimpleNamespace(content=[SimpleNamespace(text=body)])
+            for thai, body in ((False, text), (True, thai_text))
+        }
+
+        def create(messages, **kwargs):
+            prompt = messages[0]['content']
+            return responses[any('\u0e00' <= char <= '\u0e7f' for char in prompt)]
+
+        self.messages = SimpleNamespace(create=create)
+
+
+class FakeBot:
+    """Mimic telegram.Bot, accepting messages without network I/O."""
+
+    def __init__(self):
+        """Initialize the fake bot."""
+        self.sent = 0
+
+    async def send_message(self, **kwargs):
+        """Accept a message."""
+        self.sent += 1
+
+
+class FakeRequest(BaseRequest):
+    """Answer every Bot API call at once without network I/O.
+
+    Give it to a real Bot to time the client side of sends:
+    Bot(token, request=FakeRequest()).
+    """
+
+    # Minimal Message returned for every call
+    RESULT = b'{"ok":true,"result":{"message_id":1,"date":0,"chat":{"id":1,"type":"private"}}}'
+
+    async def initialize(self):
+        """Nothing to set up."""
+
+    async def shutdown(self):
+        """Nothing to clean up."""
+
+    @property
+    def read_timeout(self):
+        return None
+
+    async def do_request(self, url, method, request_data=None, **kwargs):
+        """Read the request parameters as a transport would and answer with RESULT."""
+        if request_data is not None:
+            request_data.multipart_data
+            request_data.json_parameters
+        return 200, self.RESULT
+
+
+class FakeMessage:
+    """Mimic telegram.Message.reply_text for command handlers."""
+
+    async def reply_text(self, text, **kwargs):
+        """Accept a reply."""
+
+
+def make_update(chat_id: int = 1) -> SimpleNamespace:
+    """Build a minimal Update carrying a message and chat.
+
+    Args:
+        chat_id: Chat ID of the update
+
+    Returns:
+        Update-like object
+    """
+    return SimpleNamespace(message=FakeMessage(), effective_chat=SimpleNamespace(id=chat_id))
+
+
+def make_context() -> SimpleNamespace:
+    """Build a minimal handler context with no arguments.
+
+    Returns:
+        Context-like object
+    """
+    return SimpleNamespace(args=[])
+
+
+def write_quotes_file(path: Path, count: int, seed: int = 0):
+    """Write a quotes.json with a synthetic en/th corpus.
+
+    Args:
+        path: Output file path
+        count: Number of quotes
+        seed: Random seed for reproducible content
+    """
+    rng = random.Random(seed)
+    quotes = []
+    for i in range(count):
+        language = 'th' if i % 2 else 'en'
+        words = rng.randint(6, 18)
+        text = " ".join(f"{'คำ' if language == 'th' else 'word'}{rng.randint(0, 9999)}" for _ in range(words))
+        tags = rng.sample(SYNTHETIC_TAGS, rng.randint(0, 2))
+        quotes.append({'text': text, 'author': f"Author {i % 500}", 'language': language, 'tags': tags})
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'quotes': quotes}, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,68 @@
+"""End-to-end fan-out load test against the fake Telegram Bot API.
+
+Starts benchmarks.fake_telegram in-process, points the bot at it and sends
+one quote to many chats through send_quotes_to_chats, reporting throughput
+and how the sends ended.
+
+Usage:
+    python -m benchmarks.fanout --chats 5000 --latency 0.05
+    python -m benchmarks.fanout --chats 1000 --rate-limit 30 --error-rate 0.01
+"""
+import argparse
+import asyncio
+import logging
+import os
+import time
+
+# The fake server accepts any token, but importing the bot needs a complete
+# configuration
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "123456:benchmark")
+os.environ.setdefault("TELEGRAM_CHAT_ID", "1")
+os.environ.setdefault("ANTHROPIC_API_KEY", "benchmark")
+
+from benchmarks import fake_telegram  # noqa: E402
+
+
+def main():
+    """Run the load test from the command line."""
+    parser = argparse.ArgumentParser(description="Fan-out load test against a fake Telegram API")
+    parser.add_argument("--chats", type=int, default=1000, help="Number of chats to send to")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="Override SEND_CONCURRENCY for this run")
+    fake_telegram.add_arguments(parser)
+    args = parser.parse_args()
+
+    # Failures are counted below rather than logged one by one
+    logging.disable(logging.ERROR)
+
+    from config.settings import config
+    import bot.telegram_bot as telegram_bot
+    from bot.quote import Quote
+
+    server = fake_telegram.start_fake_telegram(fake_telegram.state_from_args(args), port=0)
+    config.telegram_base_url = fake_telegram.base_url(server)
+    if args.concurrency:
+        telegram_bot.SEND_CONCURRENCY = args.concurrency
+
+    quote = Quote('Small steps every day add up to big changes.', 'Unknown')
+    deliveries = [(str(100000 + i), quote) for i in range(args.chats)]
+
+    start = time.perf_counter()
+    results = asyncio.run(telegram_bot.send_quotes_to_chats(deliveries, "benchmark"))
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+
+    succeeded = sum(results)
+    counts = server.state.counts
+    print(f"chats:        {args.chats}")
+    print(f"concurrency:  {telegram_bot.SEND_CONCURRENCY}")
+    print(f"elapsed:      {elapsed:.2f} s")
+    print(f"throughput:   {succeeded / elapsed:.1f} msg/s")
+    print(f"succeeded:    {succeeded}")
+    print(f"failed:       {len(results) - succeeded}")
+    print(f"429 answered: {counts['rate_limited']}")
+    print(f"errors:       {counts['errors']}")
+
+
+if __name__ == "__main__":
+    main()
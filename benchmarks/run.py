@@ -0,0 +1,385 @@
+"""Benchmark suite for the quote pipeline.
+
+Runs every benchmark offline against fake Anthropic/Telegram clients and
+temporary data files, prints the time per operation, and compares it with
+the stored baseline in benchmarks/baseline.json.
+
+Usage:
+    python -m benchmarks.run                  # run and check for regressions
+    python -m benchmarks.run --filter local   # only benchmarks matching 'local'
+    python -m benchmarks.run --skip-large     # skip the 1M-quote corpus
+    python -m benchmarks.run --save-baseline  # store results as the new baseline
+
+Exits with status 1 if any benchmark is slower than its baseline by more
+than the threshold factor.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+# Benchmarks never talk to real services, but importing the bot needs a
+# complete configuration
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "benchmark")
+os.environ.setdefault("TELEGRAM_CHAT_ID", "benchmark")
+os.environ.setdefault("ANTHROPIC_API_KEY", "benchmark")
+
+from benchmarks.fakes import (  # noqa: E402
+    FakeAnthropic,
+    FakeRequest,
+    make_context,
+    make_update,
+    write_quotes_file,
+)
+
+BASELINE_FILE = Path(__file__).parent / "baseline.json"
+
+# Recorded AI outputs, also checked by the tests in tests/
+RECORDINGS_DIR = Path(__file__).parent / "recordings"
+
+# A benchmark fails if it is this many times slower than its baseline
+DEFAULT_THRESHOLD = 2.0
+
+# Benchmarks that need the 1M-quote corpus (skipped with --skip-large)
+LARGE_BENCHMARKS = ("local_quote_1m", "corpus_quote_1m")
+
+# Benchmark name -> setup function returning the operation to time
+BENCHMARKS: Dict[str, Callable[[Path], Callable[[], object]]] = {}
+
+
+def benchmark(name: str):
+    """Register a benchmark setup function under a name."""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def _make_generator(quotes_file: Path):
+    """Create a QuoteGenerator on a quotes file with a fake AI client."""
+    from bot.feedback import FeedbackStore
+    from bot.quote_generator import QuoteGenerator
+    from bot.token_usage import TokenUsageStore
+
+    generator = QuoteGenerator(quotes_file=quotes_file, api_key="benchmark",
+                               feedback=FeedbackStore(), token_usage=TokenUsageStore())
+    generator.client = FakeAnthropic()
+    return generator
+
+
+def _local_quote_benchmark(count: int):
+    """Build a get_local_quote benchmark over a corpus of ``count`` quotes."""
+    def setup(tmp_dir: Path):
+        quotes_file = tmp_dir / f"quotes_{count}.json"
+        if not quotes_file.exists():
+            write_quotes_file(quotes_file, count)
+        generator = _make_generator(quotes_file)
+        return lambda: generator.get_local_quote("en")
+    return setup
+
+
+benchmark("local_quote_1k")(_local_quote_benchmark(1_000))
+benchmark("local_quote_100k")(_local_quote_benchmark(100_000))
+benchmark("local_quote_1m")(_local_quote_benchmark(1_000_000))
+
+
+def _make_corpus_generator(tmp_dir: Path, count: int):
+    """Create a QuoteGenerator on a compiled corpus of ``count`` quotes."""
+    from bot.corpus import compile_corpus
+
+    quotes_file = tmp_dir / f"quotes_{count}.json"
+    if not quotes_file.exists():
+        write_quotes_file(quotes_file, count)
+    # A separate name so the JSON benchmarks do not pick up the corpus
+    source = tmp_dir / f"corpus_{count}.json"
+    if not source.exists():
+        source.symlink_to(quotes_file)
+        compile_corpus(source, source.with_suffix(".bin"))
+    return _make_generator(source)
+
+
+def _corpus_quote_benchmark(count: int, time_period: str = None):
+    """Build a get_local_quote benchmark over a compiled corpus of ``count`` quotes."""
+    def setup(tmp_dir: Path):
+        generator = _make_corpus_generator(tmp_dir, count)
+        return lambda: generator.get_local_quote("en", time_period)
+    return setup
+
+
+benchmark("corpus_quote_1k")(_corpus_quote_benchmark(1_000))
+benchmark("corpus_quote_100k")(_corpus_quote_benchmark(100_000))
+benchmark("corpus_quote_1m")(_corpus_quote_benchmark(1_000_000))
+benchmark("weighted_quote_100k")(_corpus_quote_benchmark(100_000, "morning"))
+
+
+@benchmark("ranked_quote_100k")
+def setup_ranked_quote(tmp_dir: Path):
+    import random
+
+    generator = _make_corpus_generator(tmp_dir, 100_000)
+    # Reactions on a few thousand quotes switch selection to Thompson sampling
+    rng = random.Random(0)
+    for user in range(2_000):
+        quote = generator.get_local_quote("en")
+        generator.feedback.record(quote.key, str(user), rng.choice(("like", "dislike")))
+    return lambda: generator.get_local_quote("en")
+
+
+@benchmark("record_reaction")
+def setup_record_reaction(tmp_dir: Path):
+    from bot.feedback import FeedbackStore
+
+    store = FeedbackStore(tmp_dir / "feedback_bench.sqlite")
+    votes = iter(range(10 ** 9))
+    return lambda: store.record(f"quote{next(votes) % 1000}", "user", "like")
+
+
+@benchmark("profile_lookup")
+def setup_profile_lookup(tmp_dir: Path):
+    from bot.profiles import ChatProfile, ProfileStore
+
+    store = ProfileStore(tmp_dir / "profiles_bench.sqlite")
+    for chat_id in range(1_000):
+        store.save(ChatProfile(str(chat_id), 'th', ('calm',)))
+    chats = iter(range(10 ** 9))
+    return lambda: store.get(str(next(chats) % 1_000))
+
+
+@benchmark("add_quote_to_cache")
+def setup_add_quote(tmp_dir: Path):
+    quotes_file = tmp_dir / "quotes_add.json"
+    write_quotes_file(quotes_file, 1_000)
+    generator = _make_generator(quotes_file)
+    # Distinct texts, since duplicates are rejected before anything is written
+    counter = iter(range(10 ** 9))
+    return lambda: generator.add_quote_to_cache(f"Benchmark quote {next(counter)}.", "Bench", "en")
+
+
+@benchmark("record_quote")
+def setup_record_quote(tmp_dir: Path):
+    from bot.quote import Quote
+    from bot.telegram_bot import StatsManager
+
+    manager = StatsManager(tmp_dir / "stats_record.json")
+    quote = Quote('A benchmark quote.', 'Bench', 'en', 'local')
+    return lambda: manager.record_quote(quote, "morning")
+
+
+@benchmark("parse_ai_response")
+def setup_parse_ai_response(tmp_dir: Path):
+    from bot.quote_schema import InvalidQuote
+
+    generator = _make_generator(tmp_dir / "quotes_parse.json")
+    recordings = json.loads((RECORDINGS_DIR / "ai_responses.json").read_text(encoding='utf-8'))
+    responses = [(recording['response'], recording['language']) for recording in recordings['responses']]
+
+    def run():
+        for response, language in responses:
+            try:
+                generator._parse_ai_response(response, language)
+            except InvalidQuote:
+                pass
+    return run
+
+
+@benchmark("stream_parser")
+def setup_stream_parser(tmp_dir: Path):
+    from bot.stream_parser import QuoteStreamParser
+
+    streams = json.loads((RECORDINGS_DIR / "ai_streams.json").read_text(encoding='utf-8'))['streams']
+
+    def run():
+        for stream in streams:
+            parser = QuoteStreamParser()
+            for chunk in stream['chunks']:
+                if parser.feed(chunk) is not None:
+                    break
+    return run
+
+
+@benchmark("escape_markup")
+def setup_escape_markup(tmp_dir: Path):
+    from bot.markup import bold, escape
+
+    quotes = json.loads((RECORDINGS_DIR / "adversarial_quotes.json").read_text(encoding='utf-8'))['quotes']
+
+    def run():
+        for quote in quotes:
+            bold(quote['text'])
+            escape(quote['author'])
+    return run
+
+
+@benchmark("render_card")
+def setup_render_card(tmp_dir: Path):
+    from bot.cards import render_card
+    from bot.quote import Quote
+
+    counter = iter(range(10 ** 9))
+    return lambda: render_card(Quote(f"Small steps every day add up to big results {next(counter)}.", "Bench"))
+
+
+@benchmark("quote_send")
+def setup_quote_send(tmp_dir: Path):
+    from telegram import Bot
+
+    import bot.telegram_bot as telegram_bot
+    from bot.quote import Quote
+
+    bot = Bot("123456:benchmark", request=FakeRequest())
+    quote = Quote('Small steps every day add up to big changes.', 'Unknown')
+    chats = iter(range(10 ** 9))
+    loop = asyncio.new_event_loop()
+    return lambda: loop.run_until_complete(telegram_bot.send_quote_to_chat(
+        quote, bot=bot, chat_id=str(next(chats)), record_stats=False
+    ))
+
+
+def _command_benchmark(command_name: str):
+    """Build a latency benchmark for a Telegram command handler."""
+    def setup(tmp_dir: Path):
+        import bot.profiles as profiles
+        import bot.quote_generator as quote_generator
+        import bot.telegram_bot as telegram_bot
+        from bot.quote import Quote
+
+        quotes_file = tmp_dir / "quotes_1000.json"
+        if not quotes_file.exists():
+            write_quotes_file(quotes_file, 1_000)
+        quote_generator._generator = _make_generator(quotes_file)
+        profiles._store = profiles.ProfileStore()
+        telegram_bot.stats_manager = telegram_bot.StatsManager(tmp_dir / "stats_command.json")
+        telegram_bot.stats_manager.record_quote(Quote('x', 'y'))
+
+        handler = getattr(telegram_bot, command_name)
+        update, context = make_update(), make_context()
+        loop = asyncio.new_event_loop()
+        return lambda: loop.run_until_complete(handler(update, context))
+    return setup
+
+
+benchmark("quote_command")(_command_benchmark("quote_command"))
+benchmark("stats_command")(_command_benchmark("stats_command"))
+
+
+@benchmark("dashboard_load")
+def setup_dashboard_load(tmp_dir: Path):
+    import dashboard.app as app
+    from bot.quote import Quote
+    from bot.telegram_bot import StatsManager
+
+    stats_file = tmp_dir / "stats_dashboard.json"
+    manager = StatsManager(stats_file)
+    for i in range(100):
+        manager.record_quote(Quote(f'Quote {i}', 'Bench'), "morning")
+    quotes_file = tmp_dir / "quotes_dashboard.json"
+    write_quotes_file(quotes_file, 1_000)
+
+    app.STATS_FILE = stats_file
+    app.QUOTES_FILE = quotes_file
+
+    def run():
+        app.load_stats()
+        app.load_quotes()
+    return run
+
+
+def measure(operation: Callable[[], object], rounds: int, min_round_time: float) -> float:
+    """Time an operation and return the median seconds per call.
+
+    Each round repeats the operation enough times to last at least
+    ``min_round_time`` so fast operations are not dominated by timer noise.
+
+    Args:
+        operation: Zero-argument callable to time
+        rounds: Number of timed rounds
+        min_round_time: Minimum duration of a round in seconds
+
+    Returns:
+        Median seconds per call across rounds
+    """
+    start = time.perf_counter()
+    operation()
+    single = time.perf_counter() - start
+    number = max(1, int(min_round_time / single)) if single > 0 else 1000
+
+    per_call = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(number):
+            operation()
+        per_call.append((time.perf_counter() - start) / number)
+    return statistics.median(per_call)
+
+
+def _format_seconds(seconds: float) -> str:
+    """Format a duration with a readable unit."""
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:9.1f} µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:9.2f} ms"
+    return f"{seconds:9.2f} s "
+
+
+def main() -> int:
+    """Run the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description="Quote pipeline benchmarks")
+    parser.add_argument("--filter", default="", help="Only run benchmarks containing this text")
+    parser.add_argument("--rounds", type=int, default=5, help="Timed rounds per benchmark")
+    parser.add_argument("--min-round-time", type=float, default=0.2,
+                        help="Minimum seconds per round")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown factor against the baseline")
+    parser.add_argument("--skip-large", action="store_true", help="Skip the 1M-quote corpus")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Store results as the new baseline")
+    args = parser.parse_args()
+
+    # Per-call INFO logs would dominate the timings
+    logging.disable(logging.INFO)
+
+    baseline = {}
+    if BASELINE_FILE.exists():
+        baseline = json.loads(BASELINE_FILE.read_text(encoding='utf-8'))
+
+    results = {}
+    regressions = []
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        for name, setup in BENCHMARKS.items():
+            if args.filter not in name or (args.skip_large and name in LARGE_BENCHMARKS):
+                continue
+
+            seconds = measure(setup(tmp_dir), args.rounds, args.min_round_time)
+            results[name] = seconds
+
+            line = f"{name:<22} {_format_seconds(seconds)}"
+            if name in baseline:
+                ratio = seconds / baseline[name]
+                line += f"   {ratio:5.2f}x baseline"
+                if ratio > args.threshold:
+                    line += "   REGRESSION"
+                    regressions.append(name)
+            print(line)
+
+    if args.save_baseline:
+        baseline.update(results)
+        BASELINE_FILE.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n", encoding='utf-8')
+        print(f"Baseline saved to {BASELINE_FILE}")
+        return 0
+
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed beyond {args.threshold}x: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
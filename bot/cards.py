@@ -0,0 +1,397 @@
+"""Quote image cards rendered with Pillow, cached by content and uploaded once."""
+import hashlib
+import io
+import logging
+import os
+import sqlite3
+import threading
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:  # Cards are disabled without Pillow
+    Image = ImageDraw = ImageFont = None
+
+from config.settings import config
+from bot.database import LazyDatabase
+from bot.languages import get_language_registry
+from bot.metrics import CARD_RENDER_SECONDS
+from bot.quote import Quote
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS card_files (
+    card_key TEXT PRIMARY KEY,
+    file_id TEXT NOT NULL
+);
+"""
+
+# Bump when the layout changes so old cards are not reused
+CARD_VERSION = 1
+
+# Card size and the blank border around the text, in pixels
+CARD_SIZE = (1080, 1080)
+CARD_MARGIN = 96
+
+# Quote text sizes tried, largest first, until the text fits
+TEXT_SIZES = tuple(range(72, 31, -4))
+
+# Author size and line spacing relative to the text size
+AUTHOR_SCALE = 0.6
+LINE_SPACING = 1.35
+
+# Background gradient (top, bottom) and text colour, as on the dashboard
+GRADIENT = ((102, 126, 234), (118, 75, 162))
+TEXT_COLOUR = (255, 255, 255)
+AUTHOR_COLOUR = (230, 230, 250)
+
+# Directories searched for font files after config.fonts_dir
+FONT_DIRS = (
+    Path("/usr/share/fonts"),
+    Path("/usr/local/share/fonts"),
+    Path.home() / ".fonts",
+    Path.home() / ".local" / "share" / "fonts",
+    Path("/Library/Fonts"),
+    Path("/System/Library/Fonts"),
+    Path("C:/Windows/Fonts"),
+)
+FONT_SUFFIXES = (".ttf", ".otf", ".ttc")
+
+# Thai and Lao vowels written before the consonant they follow in speech;
+# a line must not break between them and that consonant
+PREPOSED_VOWELS = frozenset("\u0e40\u0e41\u0e42\u0e43\u0e44\u0ec0\u0ec1\u0ec2\u0ec3\u0ec4")
+
+# Highest code point Pillow's built-in font covers (Latin Extended-B)
+DEFAULT_FONT_MAX_CODEPOINT = 0x024F
+
+
+def cards_available() -> bool:
+    """Check whether Pillow is installed, so cards can be rendered."""
+    return Image is not None
+
+
+def card_key(quote: Quote) -> str:
+    """Get the content address of a quote's card.
+
+    Args:
+        quote: Quote drawn on the card
+
+    Returns:
+        Hex digest of the layout version, text, author and language
+    """
+    content = f"{CARD_VERSION}\0{quote.text}\0{quote.author}\0{quote.language}"
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _font_files(fonts_dir: Path) -> Dict[str, Path]:
+    """Index font files by name, preferring fonts_dir over system directories.
+
+    Args:
+        fonts_dir: Bundled fonts directory
+
+    Returns:
+        Dictionary of file name to path
+    """
+    files: Dict[str, Path] = {}
+    for directory in (Path(fonts_dir),) + FONT_DIRS:
+        if directory.is_dir():
+            for path in sorted(directory.rglob("*")):
+                if path.suffix.lower() in FONT_SUFFIXES:
+                    files.setdefault(path.name, path)
+    return files
+
+
+def find_font(names: Iterable[str], fonts_dir: Path) -> Optional[Path]:
+    """Find the first installed font of a list.
+
+    Args:
+        names: Font file names in order of preference
+        fonts_dir: Bundled fonts directory, searched first
+
+    Returns:
+        Path of the font, or None if none is installed
+    """
+    files = _font_files(Path(fonts_dir))
+    for name in names:
+        if name in files:
+            return files[name]
+    return None
+
+
+def _default_font_covers(text: str) -> bool:
+    """Check whether Pillow's built-in font has glyphs for every letter of a text."""
+    return all(ord(char) <= DEFAULT_FONT_MAX_CODEPOINT or not char.isalnum() for char in text)
+
+
+@lru_cache(maxsize=64)
+def _load_font(path: Optional[Path], size: int):
+    """Load a font at a size, or Pillow's built-in font if path is None."""
+    if path is None:
+        return ImageFont.load_default(size)
+    return ImageFont.truetype(str(path), size)
+
+
+@lru_cache(maxsize=1)
+def _background():
+    """Build the card background gradient, shared by every card."""
+    mask = Image.linear_gradient('L').resize(CARD_SIZE)
+    return Image.composite(Image.new('RGB', CARD_SIZE, GRADIENT[1]),
+                           Image.new('RGB', CARD_SIZE, GRADIENT[0]), mask)
+
+
+def _clusters(word: str) -> List[str]:
+    """Split a word into the units a line may break between.
+
+    Combining marks (e.g. Thai vowels above and below) stay with their base
+    character, and preposed vowels with the character after them.
+    """
+    clusters: List[str] = []
+    for char in word:
+        if clusters and (unicodedata.category(char).startswith('M')
+                         or clusters[-1][-1] in PREPOSED_VOWELS):
+            clusters[-1] += char
+        else:
+            clusters.append(char)
+    return clusters
+
+
+def wrap_text(draw, text: str, font, width: int) -> List[str]:
+    """Wrap text into lines no wider than width.
+
+    Lines break at spaces; a word wider than a line (or a run of text in a
+    script without spaces, such as Thai) breaks between characters.
+
+    Args:
+        draw: ImageDraw used to measure text
+        text: Text to wrap
+        font: Font the text is drawn in
+        width: Maximum line width in pixels
+
+    Returns:
+        List of lines
+    """
+    lines: List[str] = []
+    line = ""
+    for word in text.split():
+        candidate = f"{line} {word}" if line else word
+        if draw.textlength(candidate, font=font) <= width:
+            line = candidate
+            continue
+        if line:
+            lines.append(line)
+        line = ""
+        for cluster in _clusters(word):
+            if line and draw.textlength(line + cluster, font=font) > width:
+                lines.append(line)
+                line = ""
+            line += cluster
+    if line:
+        lines.append(line)
+    return lines
+
+
+def render_card(quote: Quote, font_path: Optional[Path] = None) -> bytes:
+    """Render a quote card.
+
+    Args:
+        quote: Quote to draw
+        font_path: Font file, or None for Pillow's built-in font
+
+    Returns:
+        PNG image data
+
+    Raises:
+        RuntimeError: If Pillow is not installed
+    """
+    if not cards_available():
+        raise RuntimeError("Rendering quote cards needs Pillow (pip install Pillow)")
+
+    width, height = CARD_SIZE
+    image = _background().copy()
+    draw = ImageDraw.Draw(image)
+    box_width, box_height = width - 2 * CARD_MARGIN, height - 2 * CARD_MARGIN
+    author = f"— {quote.author}"
+
+    # Largest text size at which the quote and author fit in the box
+    for size in TEXT_SIZES:
+        font = _load_font(font_path, size)
+        author_font = _load_font(font_path, int(size * AUTHOR_SCALE))
+        lines = wrap_text(draw, quote.text, font, box_width)
+        line_height = int(size * LINE_SPACING)
+        author_height = int(size * AUTHOR_SCALE * LINE_SPACING)
+        total_height = len(lines) * line_height + line_height // 2 + author_height
+        if total_height <= box_height:
+            break
+
+    y = (height - total_height) // 2
+    for line in lines:
+        draw.text((width // 2, y), line, font=font, fill=TEXT_COLOUR, anchor='ma')
+        y += line_height
+    y += line_height // 2
+    draw.text((width // 2, y), author, font=author_font, fill=AUTHOR_COLOUR, anchor='ma')
+
+    buffer = io.BytesIO()
+    image.save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+class CardStore:
+    """Rendered cards on disk and the Telegram file_ids they were uploaded as.
+
+    Each card is uploaded once; later sends, in any chat, reuse its file_id.
+    Without the file_id database, file_ids are only kept in memory.
+    """
+
+    def __init__(self, cards_dir: Union[Path, str], fonts_dir: Union[Path, str, None] = None):
+        """Initialize the store; the directory and database are created on first use.
+
+        Args:
+            cards_dir: Directory for card PNGs and file_ids.sqlite
+            fonts_dir: Bundled fonts directory (defaults to config.fonts_dir)
+        """
+        self.cards_dir = Path(cards_dir)
+        self.fonts_dir = Path(fonts_dir) if fonts_dir is not None else config.fonts_dir
+        self._lock = threading.Lock()
+        self._db = LazyDatabase(self.cards_dir / "file_ids.sqlite", SCHEMA, "Card file_id store",
+                                "card file_ids are only kept in memory")
+        self._file_ids: Dict[str, str] = {}
+
+    def path(self, quote: Quote) -> Path:
+        """Get where a quote's card is (or would be) stored."""
+        return self.cards_dir / f"{card_key(quote)}.png"
+
+    def font_for(self, quote: Quote) -> Tuple[bool, Optional[Path]]:
+        """Choose the font for a quote's card.
+
+        Args:
+            quote: Quote to draw
+
+        Returns:
+            Tuple of (whether the card can be drawn, font path or None for
+            Pillow's built-in font)
+        """
+        languages = get_language_registry()
+        names = languages.get(quote.language).fonts if quote.language in languages else ()
+        font = find_font(names, self.fonts_dir)
+        if font is not None:
+            return True, font
+        return _default_font_covers(quote.text + quote.author), None
+
+    def render(self, quote: Quote) -> Optional[Path]:
+        """Get a quote's card, rendering it if it is not cached.
+
+        Args:
+            quote: Quote to draw
+
+        Returns:
+            Path of the PNG, or None if Pillow or a suitable font is missing
+
+        Raises:
+            OSError: If the card cannot be written to the card directory
+        """
+        path = self.path(quote)
+        if path.exists():
+            return path
+        if not cards_available():
+            return None
+
+        drawable, font = self.font_for(quote)
+        if not drawable:
+            logger.warning(f"No font installed for '{quote.language}' cards; sending text instead")
+            return None
+
+        with CARD_RENDER_SECONDS.time():
+            data = render_card(quote, font)
+        # Write under a temporary name so readers never see a partial file
+        self.cards_dir.mkdir(parents=True, exist_ok=True)
+        temp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        temp.write_bytes(data)
+        os.replace(temp, path)
+        return path
+
+    def file_id(self, quote: Quote) -> Optional[str]:
+        """Get the file_id a quote's card was uploaded as.
+
+        Args:
+            quote: Quote on the card
+
+        Returns:
+            Telegram file_id, or None if the card was not uploaded yet
+        """
+        key = card_key(quote)
+        file_id = self._file_ids.get(key)
+        if file_id is None:
+            row = None
+            with self._lock:
+                conn = self._db.open()
+                if conn is not None:
+                    try:
+                        row = conn.execute(
+                            "SELECT file_id FROM card_files WHERE card_key = ?", (key,)
+                        ).fetchone()
+                    except sqlite3.Error as e:
+                        self._db.disable(e)
+            if row is not None:
+                file_id = self._file_ids[key] = row[0]
+        return file_id
+
+    def remember(self, quote: Quote, file_id: str):
+        """Store the file_id a quote's card was uploaded as.
+
+        Args:
+            quote: Quote on the card
+            file_id: Telegram file_id of the uploaded photo
+        """
+        key = card_key(quote)
+        with self._lock:
+            self._file_ids[key] = file_id
+            conn = self._db.open()
+            if conn is not None:
+                try:
+                    with conn:
+                        conn.execute(
+                            "INSERT INTO card_files (card_key, file_id) VALUES (?, ?) "
+                            "ON CONFLICT(card_key) DO UPDATE SET file_id = excluded.file_id",
+                            (key, file_id)
+                        )
+                except sqlite3.Error as e:
+                    self._db.disable(e)
+
+    def forget(self, quote: Quote):
+        """Drop a file_id Telegram no longer accepts, so the card is uploaded again.
+
+        Args:
+            quote: Quote on the card
+        """
+        key = card_key(quote)
+        with self._lock:
+            self._file_ids.pop(key, None)
+            conn = self._db.open()
+            if conn is not None:
+                try:
+                    with conn:
+                        conn.execute("DELETE FROM card_files WHERE card_key = ?", (key,))
+                except sqlite3.Error as e:
+                    self._db.disable(e)
+
+    def close(self):
+        """Close the underlying database connection, if it was opened."""
+        with self._lock:
+            self._db.close()
+
+
+# Singleton instance
+_store: Optional[CardStore] = None
+
+
+def get_card_store() -> CardStore:
+    """Get the singleton card store instance."""
+    global _store
+    if _store is None:
+        _store = CardStore(config.cards_dir)
+    return _store
@@ -0,0 +1,119 @@
+"""Circuit breaker for calls to an unreliable dependency (the AI API).
+
+Closed: calls go through and consecutive failures are counted. After
+``failure_threshold`` failures in a row the breaker opens and calls are
+rejected immediately, so callers fall back at once instead of waiting on a
+degraded API. After ``reset_timeout`` seconds it turns half-open and lets a
+limited number of probe calls through: a successful probe closes it again,
+a failed one reopens it for another ``reset_timeout``.
+"""
+import logging
+import threading
+import time
+from typing import Callable
+
+from bot.metrics import AI_CIRCUIT_REJECTED, AI_CIRCUIT_STATE, AI_CIRCUIT_TRANSITIONS
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Gauge value exported for each state
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+# Consecutive failures that open the breaker
+DEFAULT_FAILURE_THRESHOLD = 5
+
+# Seconds the breaker stays open before probing
+DEFAULT_RESET_TIMEOUT = 60.0
+
+# Probe calls allowed at once while half-open
+DEFAULT_HALF_OPEN_MAX_CALLS = 1
+
+
+class CircuitBreaker:
+    """Thread-safe closed/open/half-open circuit breaker."""
+
+    def __init__(self, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+                 half_open_max_calls: int = DEFAULT_HALF_OPEN_MAX_CALLS,
+                 clock: Callable[[], float] = time.monotonic):
+        """Initialize a closed breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the breaker
+            reset_timeout: Seconds to stay open before allowing probes
+            half_open_max_calls: Concurrent probe calls allowed while half-open
+            clock: Monotonic time source (for testing)
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        AI_CIRCUIT_STATE.set(STATE_VALUES[CLOSED])
+
+    def _transition(self, state: str):
+        """Move to a new state (lock held)."""
+        if state == self._state:
+            return
+        logger.warning(f"AI circuit breaker {self._state} -> {state}")
+        self._state = state
+        self._probes = 0
+        if state == OPEN:
+            self._opened_at = self._clock()
+        elif state == CLOSED:
+            self._failures = 0
+        AI_CIRCUIT_STATE.set(STATE_VALUES[state])
+        AI_CIRCUIT_TRANSITIONS.labels(state).inc()
+
+    def _current_state(self) -> str:
+        """Get the state, turning half-open once the reset timeout has passed (lock held)."""
+        if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._transition(HALF_OPEN)
+        return self._state
+
+    @property
+    def state(self) -> str:
+        """Current state: 'closed', 'open', or 'half_open'."""
+        with self._lock:
+            return self._current_state()
+
+    def allow_request(self) -> bool:
+        """Ask to make a call; half-open probes are reserved by this.
+
+        Returns:
+            True if the call may proceed, False if it should fall back now
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                return True
+        AI_CIRCUIT_REJECTED.inc()
+        return False
+
+    def record_success(self):
+        """Record a successful call."""
+        with self._lock:
+            self._failures = 0
+            if self._state == HALF_OPEN:
+                self._transition(CLOSED)
+
+    def record_failure(self):
+        """Record a failed call."""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._transition(OPEN)
+                return
+            self._failures += 1
+            if self._state == CLOSED and self._failures >= self.failure_threshold:
+                self._transition(OPEN)
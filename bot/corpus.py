@@ -0,0 +1,250 @@
+"""Compiled binary quote corpus with memory-mapped access.
+
+quotes.json is convenient to edit but has to be parsed into a list of dicts
+before a single quote can be picked. The compiled corpus stores the same
+quotes so they can be sampled straight from a memory map, decoding only
+the one record that was chosen.
+
+File layout (little-endian, sections 8-byte aligned):
+
+    header        magic b"QCRP", version u16, bucket count u16, quote count u32
+    buckets       per bucket: key (32 bytes, NUL padded), start u32, count u32
+    offsets       (quote count + 1) u64 record offsets into the blob
+    index         u32 record numbers, grouped by bucket
+    blob          records "text\\0author\\0language\\0tag,tag", UTF-8
+
+Bucket keys are a language code ("en") or a language and tag ("en:morning",
+"both:morning"); see bot/tag_index.py. Every quote is in all records order,
+so the 'both' language needs no bucket of its own.
+
+Build it from the JSON source with scripts/compile_quotes.py.
+"""
+import json
+import mmap
+import os
+import random
+import struct
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from bot.quote import Quote
+from bot.tag_index import index_tags
+
+MAGIC = b"QCRP"
+VERSION = 2
+
+# File extension of compiled corpora (next to the JSON source)
+CORPUS_SUFFIX = ".bin"
+
+HEADER = struct.Struct("<4sHHI")
+BUCKET_ENTRY = struct.Struct("<32sII")
+
+# Separator between the fields of a record
+FIELD_SEPARATOR = b"\0"
+
+# Separator between the tags of a record
+TAG_SEPARATOR = ","
+
+
+def _bucket_key(language: str, tag: Optional[str]) -> str:
+    """Get the key of a (language, tag) bucket."""
+    return language if tag is None else f"{language}:{tag}"
+
+
+def _align(offset: int) -> int:
+    """Round an offset up to the next multiple of 8."""
+    return (offset + 7) & ~7
+
+
+def compile_corpus(source: Union[Path, str], dest: Union[Path, str]) -> int:
+    """Compile a quotes.json file into a binary corpus.
+
+    The corpus is written to a temporary file and moved into place, so
+    readers never see a partial file.
+
+    Args:
+        source: Path to the JSON source ({"quotes": [...]})
+        dest: Path of the compiled corpus
+
+    Returns:
+        Number of quotes compiled
+
+    Raises:
+        ValueError: If a quote contains a NUL character, a tag contains a
+            comma, or a bucket key is longer than 32 bytes
+    """
+    with open(source, 'r', encoding='utf-8') as f:
+        quotes = json.load(f).get('quotes', [])
+
+    blob = bytearray()
+    offsets = [0]
+    buckets: Dict[str, List[int]] = {}
+    for number, data in enumerate(quotes):
+        quote = Quote.from_dict(data)
+        if any(TAG_SEPARATOR in tag for tag in quote.tags):
+            raise ValueError(f"Quote {number} has a tag containing '{TAG_SEPARATOR}'")
+        fields = [quote.text, quote.author, quote.language, TAG_SEPARATOR.join(quote.tags)]
+        encoded = [field.encode('utf-8') for field in fields]
+        if any(FIELD_SEPARATOR in field for field in encoded):
+            raise ValueError(f"Quote {number} contains a NUL character")
+
+        blob += FIELD_SEPARATOR.join(encoded)
+        offsets.append(len(blob))
+        buckets.setdefault(quote.language, []).append(number)
+        for tag in index_tags(quote):
+            buckets.setdefault(_bucket_key(quote.language, tag), []).append(number)
+            buckets.setdefault(_bucket_key('both', tag), []).append(number)
+
+    keys = sorted(buckets)
+    header = HEADER.pack(MAGIC, VERSION, len(keys), len(quotes))
+
+    bucket_table = bytearray()
+    index: List[int] = []
+    for key in keys:
+        encoded_key = key.encode('utf-8')
+        if len(encoded_key) > 32:
+            raise ValueError(f"Bucket key longer than 32 bytes: {key!r}")
+        bucket_table += BUCKET_ENTRY.pack(encoded_key, len(index), len(buckets[key]))
+        index.extend(buckets[key])
+
+    sections = [
+        header + bucket_table,
+        struct.pack(f"<{len(offsets)}Q", *offsets),
+        struct.pack(f"<{len(index)}I", *index),
+        bytes(blob),
+    ]
+
+    dest = Path(dest)
+    tmp_file = dest.with_suffix(dest.suffix + '.tmp')
+    with open(tmp_file, 'wb') as f:
+        for section in sections:
+            f.write(section)
+            f.write(b"\0" * (_align(f.tell()) - f.tell()))
+    os.replace(tmp_file, dest)
+    return len(quotes)
+
+
+class QuoteCorpus:
+    """Read-only view of a compiled corpus through a memory map.
+
+    Implements the same count()/pick() interface as TagIndex so either can
+    back a TagSampler.
+    """
+
+    def __init__(self, path: Union[Path, str]):
+        """Open and map a compiled corpus.
+
+        Args:
+            path: Path to the compiled corpus
+
+        Raises:
+            ValueError: If the file is not a compiled corpus of this version
+        """
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, bucket_count, self._count = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise ValueError(f"{self.path} is not a version {VERSION} quote corpus")
+
+        self._buckets: Dict[str, Tuple[int, int]] = {}
+        position = HEADER.size
+        for _ in range(bucket_count):
+            key, start, count = BUCKET_ENTRY.unpack_from(self._mmap, position)
+            self._buckets[key.rstrip(b"\0").decode('utf-8')] = (start, count)
+            position += BUCKET_ENTRY.size
+        index_size = sum(count for _, count in self._buckets.values())
+
+        # Native-order casts; every supported host is little-endian like the file
+        self._view = view = memoryview(self._mmap)
+        offsets_start = _align(position)
+        index_start = _align(offsets_start + (self._count + 1) * 8)
+        self._blob_start = _align(index_start + index_size * 4)
+        self._offsets = view[offsets_start:offsets_start + (self._count + 1) * 8].cast('Q')
+        self._index = view[index_start:index_start + index_size * 4].cast('I')
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def languages(self) -> List[str]:
+        """Language codes present in the corpus."""
+        return [key for key in self._buckets if ':' not in key]
+
+    @property
+    def tags(self) -> List[str]:
+        """Tags present in the corpus."""
+        return sorted({key.split(':', 1)[1] for key in self._buckets if key.startswith('both:')})
+
+    def count(self, language: str = "both", tag: Optional[str] = None) -> int:
+        """Count the quotes in a language, optionally only those with a tag.
+
+        Args:
+            language: Language code, or 'both' for all quotes
+            tag: Tag, or None for every quote of the language
+
+        Returns:
+            Number of quotes
+        """
+        if language == "both" and tag is None:
+            return self._count
+        return self._buckets.get(_bucket_key(language, tag), (0, 0))[1]
+
+    def pick(self, language: str, tag: Optional[str], position: int) -> Quote:
+        """Decode a quote by its position in a (language, tag) bucket.
+
+        Args:
+            language: Language code, or 'both'
+            tag: Tag, or None
+            position: Position in the bucket (0 to count - 1)
+
+        Returns:
+            Quote with source 'local'
+        """
+        if language == "both" and tag is None:
+            return self.get(position)
+        start, _ = self._buckets[_bucket_key(language, tag)]
+        return self.get(self._index[start + position])
+
+    def get(self, number: int) -> Quote:
+        """Decode one quote.
+
+        Args:
+            number: Record number (0 to len - 1)
+
+        Returns:
+            Quote with source 'local'
+        """
+        start = self._blob_start + self._offsets[number]
+        end = self._blob_start + self._offsets[number + 1]
+        text, author, language, tags = self._mmap[start:end].decode('utf-8').split("\0")
+        return Quote(text, author, language, tags=tags.split(TAG_SEPARATOR) if tags else ())
+
+    def sample(self, language: str = "both", rng: random.Random = random,
+               tag: Optional[str] = None) -> Quote:
+        """Pick a random quote in a language, optionally with a tag.
+
+        Args:
+            language: Language code, or 'both' for any quote
+            rng: Random source
+            tag: Tag the quote must have, or None
+
+        Returns:
+            Quote with source 'local'
+
+        Raises:
+            IndexError: If there are no matching quotes
+        """
+        count = self.count(language, tag)
+        if not count:
+            raise IndexError(f"No quotes in bucket '{_bucket_key(language, tag)}'")
+        return self.pick(language, tag, rng.randrange(count))
+
+    def close(self):
+        """Release the memory map."""
+        self._offsets.release()
+        self._index.release()
+        self._view.release()
+        self._mmap.close()
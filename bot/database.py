@@ -0,0 +1,105 @@
+"""Lazily opened SQLite databases shared by the bot's small persistent stores."""
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+class LazyDatabase:
+    """A SQLite database opened on first use and disabled after an error.
+
+    Not every process needs every store, and some run with a read-only data
+    directory (e.g. Cloud Functions), so nothing is opened at start-up. If
+    the database cannot be opened or written, one warning is logged and the
+    store carries on without it. Methods must be called with the owning
+    store's lock held.
+    """
+
+    def __init__(self, path: Union[Path, str], schema: str, name: str, fallback: str):
+        """Initialize the database; nothing is opened yet.
+
+        Args:
+            path: Path to the SQLite file, or ':memory:' for a non-persistent one
+            schema: SQL script creating the tables if needed
+            name: Store name used in warnings, e.g. 'Feedback store'
+            fallback: What the store does without its database, for warnings
+        """
+        self.path = path
+        self.schema = schema
+        self.name = name
+        self.fallback = fallback
+        self.unavailable = False
+        self._conn: Optional[sqlite3.Connection] = None
+        self._data_version = None
+
+    def connect(self) -> sqlite3.Connection:
+        """Open (and create if needed) the database, retrying after an earlier failure.
+
+        Returns:
+            Database connection
+
+        Raises:
+            sqlite3.Error: If the database cannot be opened or created
+        """
+        if self._conn is None:
+            if str(self.path) != ":memory:":
+                try:
+                    Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+                except OSError as e:
+                    raise sqlite3.OperationalError(f"cannot create {Path(self.path).parent}: {e}") from e
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            try:
+                conn.executescript(self.schema)
+            except sqlite3.Error:
+                conn.close()
+                raise
+            self._conn = conn
+        self.unavailable = False
+        return self._conn
+
+    def open(self) -> Optional[sqlite3.Connection]:
+        """Get the connection unless the database is unavailable.
+
+        Returns:
+            Database connection, or None if it cannot be opened
+        """
+        if self.unavailable:
+            return None
+        try:
+            return self.connect()
+        except sqlite3.Error as e:
+            self.disable(e)
+            return None
+
+    def disable(self, error: Exception):
+        """Stop using the database after an error, logging it once.
+
+        Args:
+            error: Error the database failed with
+        """
+        if not self.unavailable:
+            logger.warning(f"{self.name} {self.path} unavailable ({error}); {self.fallback}")
+        self.unavailable = True
+
+    def changed(self, conn: sqlite3.Connection) -> bool:
+        """Check whether another connection committed changes since the last check.
+
+        Args:
+            conn: Connection returned by connect() or open()
+
+        Returns:
+            True on the first check and after changes by another connection
+        """
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if version == self._data_version:
+            return False
+        self._data_version = version
+        return True
+
+    def close(self):
+        """Close the connection, if it was opened."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
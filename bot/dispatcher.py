@@ -0,0 +1,200 @@
+"""Per-subscriber quote dispatch driven by a single once-a-minute tick."""
+import logging
+from datetime import datetime, time, timedelta, timezone
+from typing import List, Optional, Tuple
+
+from config.settings import config
+from bot.profiles import get_profile_store
+from bot.quote_generator import get_quote
+from bot.send_index import NextSendIndex
+from bot.subscribers import Subscriber, SubscriberStore
+from bot.telegram_bot import get_event_loop, send_quotes_to_chats
+from bot.triggers import RandomWindowTrigger
+
+logger = logging.getLogger(__name__)
+
+# Sends overdue by more than this (e.g. after long downtime) are skipped
+# and the subscriber moves on to their next daily slot
+DISPATCH_MAX_LATENESS = timedelta(hours=12)
+
+
+class SubscriberDispatcher:
+    """Send each subscriber one quote per day inside their local window.
+
+    Next send times live in a persistent sorted index, so a tick costs only
+    as much as the subscribers due, and sends missed while the process was
+    down go out on the first tick after a restart.
+    """
+
+    def __init__(self, store: Optional[SubscriberStore] = None,
+                 index: Optional[NextSendIndex] = None,
+                 now: Optional[datetime] = None):
+        """Initialize the dispatcher and index any unscheduled subscribers.
+
+        Args:
+            store: Subscriber store (defaults to the configured file)
+            index: Next-send index (defaults to the configured SQLite file)
+            now: Current time (defaults to the system clock)
+        """
+        self.store = store if store is not None else SubscriberStore()
+        self.index = index if index is not None else NextSendIndex(config.send_index_file)
+        self._reconcile(now or datetime.now(timezone.utc))
+
+    def _reconcile(self, now: datetime, changed: Optional[List[Subscriber]] = None):
+        """Bring the index in line with the subscriber store.
+
+        Subscribers missing from the index (or listed in ``changed``) are
+        scheduled from now; index entries without a subscriber are dropped.
+
+        Args:
+            now: Current time
+            changed: Subscribers whose settings changed and need rescheduling
+        """
+        indexed = set(self.index.chat_ids())
+        subscribers = {s.chat_id: s for s in self.store.all()}
+
+        for chat_id in indexed - subscribers.keys():
+            self.index.remove(chat_id)
+
+        pending = [s for chat_id, s in subscribers.items() if chat_id not in indexed]
+        pending.extend(changed or [])
+        self.index.set_many([(s.chat_id, self.next_send_time(s, now)) for s in pending])
+
+    @staticmethod
+    def _make_trigger(subscriber: Subscriber) -> RandomWindowTrigger:
+        """Create the daily window trigger for a subscriber.
+
+        Args:
+            subscriber: Subscriber to create the trigger for
+
+        Returns:
+            RandomWindowTrigger in the subscriber's timezone
+        """
+        return RandomWindowTrigger(
+            time.fromisoformat(subscriber.window_start),
+            time.fromisoformat(subscriber.window_end),
+            timezone=subscriber.timezone,
+            seed=f"{config.schedule_seed}:{subscriber.chat_id}"
+        )
+
+    def next_send_time(self, subscriber: Subscriber, now: datetime,
+                       previous: Optional[datetime] = None) -> datetime:
+        """Compute a subscriber's next send time.
+
+        Args:
+            subscriber: Subscriber to schedule
+            now: Current time
+            previous: Send time that was just served, if any
+
+        Returns:
+            Next send time
+        """
+        return self._make_trigger(subscriber).get_next_fire_time(previous, now)
+
+    def subscribe(self, subscriber: Subscriber) -> datetime:
+        """Add or update a subscriber and index their next send.
+
+        Args:
+            subscriber: Subscriber to store
+
+        Returns:
+            Next send time
+        """
+        self.store.add(subscriber)
+        next_send = self.next_send_time(subscriber, datetime.now(timezone.utc))
+        self.index.set(subscriber.chat_id, next_send)
+        return next_send
+
+    def unsubscribe(self, chat_id: str) -> bool:
+        """Remove a subscriber and their indexed send.
+
+        Args:
+            chat_id: Telegram chat ID
+
+        Returns:
+            True if the subscriber existed, False otherwise
+        """
+        self.index.remove(str(chat_id))
+        return self.store.remove(chat_id)
+
+    def tick(self, now: Optional[datetime] = None) -> int:
+        """Send quotes to all due subscribers and reschedule them.
+
+        Subscribers sharing a language and topics in the same tick share one
+        quote, so a large batch costs one generation per distinct preference.
+        A chat's /language choice overrides the language it subscribed with.
+
+        Args:
+            now: Current time (defaults to the system clock)
+
+        Returns:
+            Number of quotes delivered successfully
+        """
+        now = now or datetime.now(timezone.utc)
+
+        # Pick up subscribers changed by another process (e.g. the bot listener)
+        changed = self.store.reload_if_changed()
+        if changed is not None:
+            self._reconcile(now, changed)
+
+        due = self.index.pop_due(now)
+        if not due:
+            return 0
+
+        profiles = get_profile_store()
+        quotes = {}
+        deliveries = []
+        rescheduled = []
+        for chat_id, send_time in due:
+            subscriber = self.store.get(chat_id)
+            if subscriber is None:
+                continue
+            rescheduled.append((chat_id, self.next_send_time(subscriber, now, previous=send_time)))
+
+            if send_time < now - DISPATCH_MAX_LATENESS:
+                logger.info(f"Skipping send to {chat_id} overdue since {send_time}")
+                continue
+
+            profile = profiles.get(chat_id)
+            preference = (profile.language or subscriber.language, profile.topics)
+            if preference not in quotes:
+                quotes[preference] = get_quote(language=preference[0], topics=preference[1])
+            deliveries.append((chat_id, quotes[preference]))
+
+        self.index.set_many(rescheduled)
+        if not deliveries:
+            return 0
+
+        results = get_event_loop().run_until_complete(
+            send_quotes_to_chats(deliveries, time_period='subscriber')
+        )
+        sent = sum(results)
+        logger.info(f"Subscriber tick: sent {sent}/{len(deliveries)} quotes")
+        return sent
+
+    def upcoming(self, offset: int = 0, limit: int = 20) -> List[Tuple[str, datetime]]:
+        """Get a page of upcoming subscriber sends in time order.
+
+        Args:
+            offset: Number of entries to skip
+            limit: Maximum number of entries to return
+
+        Returns:
+            List of (chat ID, send time) tuples
+        """
+        return self.index.page(offset, limit)
+
+    def __len__(self):
+        return len(self.index)
+
+
+# Singleton instance
+_dispatcher: Optional[SubscriberDispatcher] = None
+
+
+def get_dispatcher() -> SubscriberDispatcher:
+    """Get the singleton subscriber dispatcher instance."""
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = SubscriberDispatcher()
+    return _dispatcher
@@ -0,0 +1,166 @@
+"""Quote reactions and Thompson-sampling selection of local quotes."""
+import random
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+from config.settings import config
+from bot.database import LazyDatabase
+from bot.quote import Quote
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reactions (
+    quote_id TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    liked INTEGER NOT NULL,
+    PRIMARY KEY (quote_id, user_id)
+);
+CREATE TABLE IF NOT EXISTS quote_scores (
+    quote_id TEXT PRIMARY KEY,
+    likes INTEGER NOT NULL DEFAULT 0,
+    dislikes INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+# Reaction names used in button callbacks, and whether each counts as a like
+REACTIONS = {'like': True, 'dislike': False}
+
+# Candidates drawn per pick; the one with the best posterior draw is sent
+FEEDBACK_CANDIDATES = 8
+
+
+class FeedbackStore:
+    """Per-user quote reactions with aggregated like/dislike counters.
+
+    Each user has one row per quote, so a vote can change but not repeat,
+    and the quote's counter row is updated in the same transaction. The
+    counters are cached in memory and reloaded when another process
+    commits changes.
+    """
+
+    def __init__(self, feedback_file: Union[Path, str] = ":memory:"):
+        """Initialize the store; the database is opened on first use.
+
+        Args:
+            feedback_file: Path to the SQLite file, or ':memory:' for a
+                non-persistent store
+        """
+        self.feedback_file = feedback_file
+        self._lock = threading.Lock()
+        self._db = LazyDatabase(feedback_file, SCHEMA, "Feedback store",
+                                "choosing local quotes uniformly")
+        self._scores: Dict[str, Tuple[int, int]] = {}
+
+    def _refresh(self):
+        """Reload the counters if another connection changed them (lock held)."""
+        conn = self._db.open()
+        if conn is not None and self._db.changed(conn):
+            self._scores = {
+                quote_id: (likes, dislikes)
+                for quote_id, likes, dislikes in conn.execute(
+                    "SELECT quote_id, likes, dislikes FROM quote_scores"
+                )
+            }
+
+    def record(self, quote_id: str, user_id: str, reaction: str) -> Tuple[int, int]:
+        """Record a user's reaction to a quote, replacing their earlier one.
+
+        Args:
+            quote_id: Quote key (Quote.key)
+            user_id: Telegram user ID
+            reaction: 'like' or 'dislike'
+
+        Returns:
+            Tuple of (likes, dislikes) of the quote after the reaction
+
+        Raises:
+            ValueError: If the reaction is unknown
+            sqlite3.Error: If the database cannot be opened or written
+        """
+        if reaction not in REACTIONS:
+            raise ValueError(f"Unknown reaction '{reaction}'")
+        liked = REACTIONS[reaction]
+
+        with self._lock:
+            conn = self._db.connect()
+            with conn:
+                self._refresh()
+                row = conn.execute(
+                    "SELECT liked FROM reactions WHERE quote_id = ? AND user_id = ?",
+                    (quote_id, user_id)
+                ).fetchone()
+                previous = None if row is None else bool(row[0])
+                if previous == liked:
+                    return self._scores.get(quote_id, (0, 0))
+
+                like_delta = int(liked) - int(previous is True)
+                dislike_delta = int(not liked) - int(previous is False)
+                conn.execute(
+                    "INSERT INTO reactions (quote_id, user_id, liked) VALUES (?, ?, ?) "
+                    "ON CONFLICT(quote_id, user_id) DO UPDATE SET liked = excluded.liked",
+                    (quote_id, user_id, int(liked))
+                )
+                conn.execute(
+                    "INSERT INTO quote_scores (quote_id, likes, dislikes) VALUES (?, ?, ?) "
+                    "ON CONFLICT(quote_id) DO UPDATE SET likes = likes + excluded.likes, "
+                    "dislikes = dislikes + excluded.dislikes",
+                    (quote_id, like_delta, dislike_delta)
+                )
+                likes, dislikes = self._scores.get(quote_id, (0, 0))
+                self._scores[quote_id] = scores = (likes + like_delta, dislikes + dislike_delta)
+        return scores
+
+    def scores(self, quote_id: str) -> Tuple[int, int]:
+        """Get a quote's reaction counts, as of the last reload.
+
+        Args:
+            quote_id: Quote key (Quote.key)
+
+        Returns:
+            Tuple of (likes, dislikes)
+        """
+        return self._scores.get(quote_id, (0, 0))
+
+    def __len__(self):
+        """Number of quotes with at least one reaction."""
+        with self._lock:
+            self._refresh()
+            return len(self._scores)
+
+    def close(self):
+        """Close the underlying database connection, if it was opened."""
+        with self._lock:
+            self._db.close()
+
+
+def thompson_pick(candidates: Sequence[Quote], store: FeedbackStore,
+                  rng: random.Random = random) -> Quote:
+    """Pick the candidate with the highest draw from its reaction posterior.
+
+    Args:
+        candidates: Quotes to choose from
+        store: Reaction counters
+        rng: Random source
+
+    Returns:
+        Chosen quote
+    """
+    best, best_draw = None, -1.0
+    for quote in candidates:
+        likes, dislikes = store.scores(quote.key)
+        draw = rng.betavariate(1 + likes, 1 + dislikes)
+        if draw > best_draw:
+            best, best_draw = quote, draw
+    return best
+
+
+# Singleton instance
+_store: Optional[FeedbackStore] = None
+
+
+def get_feedback_store() -> FeedbackStore:
+    """Get the singleton feedback store instance."""
+    global _store
+    if _store is None:
+        _store = FeedbackStore(config.feedback_file)
+    return _store
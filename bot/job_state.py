@@ -0,0 +1,132 @@
+"""Lightweight persistence of scheduler job state (last-fired times).
+
+The scheduler recreates its cron jobs from configuration on every start, so
+only the time each job last fired needs to survive a restart. This module
+provides small pluggable backends for that state instead of a full
+SQLAlchemy job store.
+"""
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+from config.settings import VALID_SCHEDULER_STATE_BACKENDS
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryJobStateStore:
+    """Keep job state in memory only (lost on restart)."""
+
+    def __init__(self):
+        """Initialize an empty in-memory store."""
+        self._last_fired: Dict[str, datetime] = {}
+        self._lock = threading.Lock()
+
+    def get_last_fired(self, job_id: str) -> Optional[datetime]:
+        """Get the last time a job fired.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            Last fired datetime or None if the job never fired
+        """
+        with self._lock:
+            return self._last_fired.get(job_id)
+
+    def set_last_fired(self, job_id: str, fired_at: datetime):
+        """Record the time a job fired.
+
+        Args:
+            job_id: Job identifier
+            fired_at: Scheduled run time that was executed
+        """
+        with self._lock:
+            self._last_fired[job_id] = fired_at
+            self._flush()
+
+    def all_last_fired(self) -> Dict[str, datetime]:
+        """Get last fired times for all known jobs.
+
+        Returns:
+            Dictionary mapping job ID to last fired datetime
+        """
+        with self._lock:
+            return dict(self._last_fired)
+
+    def _flush(self):
+        """Persist state (no-op for the in-memory store)."""
+
+
+class JsonJobStateStore(MemoryJobStateStore):
+    """Keep job state in memory and mirror it to a small JSON file."""
+
+    def __init__(self, state_file: Path):
+        """Initialize the store, loading any existing state file.
+
+        Args:
+            state_file: Path to the JSON state file
+        """
+        super().__init__()
+        self.state_file = state_file
+        self._last_fired = self._load()
+
+    def _load(self) -> Dict[str, datetime]:
+        """Load last fired times from the state file.
+
+        Returns:
+            Dictionary mapping job ID to last fired datetime
+        """
+        if not self.state_file.exists():
+            return {}
+
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return {
+                job_id: datetime.fromisoformat(fired_at)
+                for job_id, fired_at in data.get('last_fired', {}).items()
+            }
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable scheduler state file: {e}")
+            return {}
+
+    def _flush(self):
+        """Write state atomically so a crash never leaves a partial file."""
+        data = {
+            'last_fired': {
+                job_id: fired_at.isoformat()
+                for job_id, fired_at in self._last_fired.items()
+            }
+        }
+        tmp_file = self.state_file.with_suffix(self.state_file.suffix + '.tmp')
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_file, self.state_file)
+        except OSError as e:
+            logger.warning(f"Could not save scheduler state: {e}")
+
+
+def get_job_state_store(backend: str, state_file: Path) -> MemoryJobStateStore:
+    """Create a job state store for the given backend.
+
+    Args:
+        backend: 'memory' or 'json'
+        state_file: Path to the state file (used by the 'json' backend)
+
+    Returns:
+        Job state store instance
+    """
+    if backend == 'memory':
+        return MemoryJobStateStore()
+    if backend == 'json':
+        return JsonJobStateStore(state_file)
+    raise ValueError(
+        f"Scheduler state backend must be one of {VALID_SCHEDULER_STATE_BACKENDS}, "
+        f"got '{backend}'"
+    )
@@ -0,0 +1,285 @@
+"""Registry of quote languages, loaded from data files.
+
+Each language is defined by one file, data/languages/<code>.json:
+
+    {
+      "label": "English",
+      "flag": "🇬🇧",
+      "tokenizer": "words",
+      "fonts": ["NotoSans-Regular.ttf", "DejaVuSans.ttf"],
+      "script": [["0041", "024F"], ["0300", "036F"]],
+      "prompt": ["Generate 1 original, inspirational quote...", "..."],
+      "fallback": {"text": "Every day is a new opportunity...", "author": "Unknown"}
+    }
+
+The prompt lines are joined with newlines. "tokenizer" names an entry of
+TOKENIZERS: "words" for scripts that separate words with spaces, "bigrams"
+for scripts that do not (such as Thai). Tokens are used to search quotes
+and to spot duplicates. "fonts" lists font files, in order of preference,
+for rendering quote cards (see bot/cards.py). "script" lists the Unicode
+ranges (hex code points, inclusive) of the language's writing system; AI
+quotes whose letters are mostly outside them are rejected as the wrong
+language (see bot/quote_schema.py). Without it any script is accepted.
+
+Adding a file is all a new language needs: configuration, subscriptions,
+/language, the dashboard and AI generation all read the registry, and the
+tag index and compiled corpus create a bucket for every language found in
+the quotes, so picking a quote stays O(1) per language.
+"""
+import json
+import random
+import re
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from config.settings import ALL_LANGUAGES, config
+from bot.quote import Quote
+
+# Unicode categories kept in tokens: letters, marks (e.g. Thai vowels) and numbers
+TOKEN_CATEGORIES = frozenset("LMN")
+
+# Letters (not digits or underscores), counted when checking a text's script
+LETTERS = re.compile(r"[^\W\d_]")
+
+
+def _letters(text: str) -> str:
+    """Case-fold text and replace everything but letters, marks and numbers with spaces."""
+    return "".join(
+        char if unicodedata.category(char)[0] in TOKEN_CATEGORIES else " "
+        for char in text.casefold()
+    )
+
+
+def _word_tokens(text: str) -> List[str]:
+    """Split text into case-folded words."""
+    return _letters(text).split()
+
+
+def _bigram_tokens(text: str) -> List[str]:
+    """Split text into overlapping character pairs, ignoring spaces and punctuation."""
+    letters = _letters(text).replace(" ", "")
+    if len(letters) < 2:
+        return [letters] if letters else []
+    return [letters[i:i + 2] for i in range(len(letters) - 1)]
+
+
+@lru_cache(maxsize=None)
+def _foreign_letters(script: Tuple[Tuple[int, int], ...]) -> re.Pattern:
+    """Compile a pattern matching letters outside a script's code point ranges."""
+    ranges = "".join(rf"\U{low:08x}-\U{high:08x}" for low, high in script)
+    return re.compile(rf"(?![{ranges}]){LETTERS.pattern}")
+
+
+# Tokenizers a language definition can name
+TOKENIZERS: Dict[str, Callable[[str], List[str]]] = {
+    'words': _word_tokens,
+    'bigrams': _bigram_tokens,
+}
+
+# Label of ALL_LANGUAGES in selectors
+ALL_LANGUAGES_LABEL = "All languages"
+
+
+@dataclass(frozen=True)
+class Language:
+    """A supported quote language."""
+
+    code: str
+    label: str
+    flag: str
+    prompt: str
+    fallback: Quote
+    tokenizer: str = 'words'
+    fonts: Tuple[str, ...] = ()
+    script: Tuple[Tuple[int, int], ...] = ()
+
+    def tokenize(self, text: str) -> List[str]:
+        """Split text into tokens for search and duplicate detection.
+
+        Args:
+            text: Text in this language
+
+        Returns:
+            List of tokens
+        """
+        return TOKENIZERS[self.tokenizer](text)
+
+    def signature(self, text: str) -> Tuple[str, ...]:
+        """Get a normalized form of a text that ignores case, spacing and punctuation.
+
+        Args:
+            text: Text in this language
+
+        Returns:
+            Tuple of tokens; equal for texts that differ only in those respects
+        """
+        return tuple(self.tokenize(text))
+
+    def script_share(self, text: str) -> float:
+        """Get the share of a text's letters written in this language's script.
+
+        Args:
+            text: Text to check
+
+        Returns:
+            Fraction of letters inside the script ranges; 1.0 if the
+            language defines no script or the text has no letters
+        """
+        if not self.script:
+            return 1.0
+        letters = len(LETTERS.findall(text))
+        if not letters:
+            return 1.0
+        return 1 - len(_foreign_letters(self.script).findall(text)) / letters
+
+
+def _load_language(path: Path) -> Language:
+    """Load one language definition file.
+
+    Args:
+        path: Path to <code>.json
+
+    Returns:
+        Language
+
+    Raises:
+        ValueError: If the file is missing a field or names an unknown tokenizer
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    code = path.stem
+    try:
+        prompt = data['prompt']
+        fallback = data['fallback']
+        language = Language(
+            code=code,
+            label=str(data.get('label') or code),
+            flag=str(data.get('flag') or ''),
+            prompt="\n".join(prompt) if isinstance(prompt, list) else str(prompt),
+            fallback=Quote(str(fallback['text']), str(fallback.get('author') or 'Unknown'),
+                           code, 'fallback'),
+            tokenizer=str(data.get('tokenizer') or 'words'),
+            fonts=tuple(str(name) for name in data.get('fonts') or ()),
+            script=tuple((int(low, 16), int(high, 16)) for low, high in data.get('script') or ()),
+        )
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Language file {path} is missing {e}")
+    except ValueError as e:
+        raise ValueError(f"Language file {path} has an invalid script range: {e}")
+
+    if language.tokenizer not in TOKENIZERS:
+        raise ValueError(
+            f"Language file {path} names unknown tokenizer '{language.tokenizer}' "
+            f"(one of {tuple(TOKENIZERS)})"
+        )
+    return language
+
+
+class LanguageRegistry:
+    """The languages defined in a directory of language files."""
+
+    def __init__(self, languages_dir: Union[Path, str]):
+        """Load every language file in a directory.
+
+        Args:
+            languages_dir: Directory of <code>.json files
+
+        Raises:
+            ValueError: If a language file is invalid
+        """
+        self.languages_dir = Path(languages_dir)
+        self._languages: Dict[str, Language] = {
+            path.stem: _load_language(path) for path in sorted(self.languages_dir.glob("*.json"))
+        }
+
+    def __contains__(self, code: str) -> bool:
+        return code in self._languages
+
+    def __iter__(self) -> Iterator[Language]:
+        return iter(self._languages.values())
+
+    def __len__(self):
+        return len(self._languages)
+
+    @property
+    def codes(self) -> List[str]:
+        """Codes of the defined languages, sorted."""
+        return list(self._languages)
+
+    @property
+    def choices(self) -> List[str]:
+        """Valid language settings: ALL_LANGUAGES followed by every code."""
+        return [ALL_LANGUAGES] + self.codes
+
+    def get(self, code: str) -> Language:
+        """Get a language by code.
+
+        Args:
+            code: Language code
+
+        Returns:
+            Language
+
+        Raises:
+            KeyError: If the language is not defined
+        """
+        return self._languages[code]
+
+    def label(self, code: str) -> str:
+        """Get the display label of a language setting, with its flag.
+
+        Args:
+            code: Language code or ALL_LANGUAGES
+
+        Returns:
+            Label such as "🇬🇧 English"; the code itself if undefined
+        """
+        if code == ALL_LANGUAGES:
+            return ALL_LANGUAGES_LABEL
+        language = self._languages.get(code)
+        if language is None:
+            return code
+        return f"{language.flag} {language.label}".strip()
+
+    def resolve(self, code: str, rng: random.Random = random) -> str:
+        """Turn a language setting into one language code.
+
+        Args:
+            code: Language code, or ALL_LANGUAGES for a random language
+            rng: Random source
+
+        Returns:
+            Language code
+        """
+        if code == ALL_LANGUAGES:
+            return rng.choice(self.codes)
+        return code
+
+    def tokenize(self, text: str, code: str) -> List[str]:
+        """Tokenize text with its language's tokenizer ('words' if undefined).
+
+        Args:
+            text: Text to tokenize
+            code: Language code of the text
+
+        Returns:
+            List of tokens
+        """
+        language = self._languages.get(code)
+        return language.tokenize(text) if language is not None else _word_tokens(text)
+
+
+# Singleton instance
+_registry: Optional[LanguageRegistry] = None
+
+
+def get_language_registry() -> LanguageRegistry:
+    """Get the singleton language registry for the configured languages directory."""
+    global _registry
+    if _registry is None:
+        _registry = LanguageRegistry(config.languages_dir)
+    return _registry
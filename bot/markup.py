@@ -0,0 +1,68 @@
+"""Escaping of quote text for Telegram's MarkdownV2 and HTML parse modes."""
+from typing import Dict
+
+from telegram.error import BadRequest
+
+# Characters MarkdownV2 reserves outside entities; each must be escaped with '\'
+MARKDOWN_V2_RESERVED = "\\_*[]()~`>#+-=|{}.!"
+
+# Characters HTML reserves in text
+HTML_RESERVED = {'&': "&amp;", '<': "&lt;", '>': "&gt;"}
+
+# Translation tables of the supported parse modes, so escaping is one
+# str.translate pass
+ESCAPE_TABLES: Dict[str, Dict[int, str]] = {
+    'MarkdownV2': str.maketrans({char: "\\" + char for char in MARKDOWN_V2_RESERVED}),
+    'HTML': str.maketrans(HTML_RESERVED),
+}
+
+# Bold markup of the supported parse modes, around escaped text
+BOLD = {
+    'MarkdownV2': ("*", "*"),
+    'HTML': ("<b>", "</b>"),
+}
+
+# Start of the Bot API error description for rejected markup
+PARSE_ERROR = "can't parse entities"
+
+
+def escape(text: str, parse_mode: str = 'MarkdownV2') -> str:
+    """Escape text so Telegram shows it literally.
+
+    Args:
+        text: Text to escape
+        parse_mode: 'MarkdownV2' or 'HTML'
+
+    Returns:
+        Escaped text
+
+    Raises:
+        KeyError: If the parse mode is not supported
+    """
+    return text.translate(ESCAPE_TABLES[parse_mode])
+
+
+def bold(text: str, parse_mode: str = 'MarkdownV2') -> str:
+    """Escape text and mark it bold.
+
+    Args:
+        text: Text to show in bold
+        parse_mode: 'MarkdownV2' or 'HTML'
+
+    Returns:
+        Bold markup of the escaped text
+    """
+    start, end = BOLD[parse_mode]
+    return f"{start}{escape(text, parse_mode)}{end}"
+
+
+def is_parse_error(error: Exception) -> bool:
+    """Check whether a Bot API error is Telegram rejecting a message's markup.
+
+    Args:
+        error: Exception raised by a send
+
+    Returns:
+        True for a BadRequest about unparsable entities
+    """
+    return isinstance(error, BadRequest) and PARSE_ERROR in str(error).lower()
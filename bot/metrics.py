@@ -0,0 +1,335 @@
+"""Minimal Prometheus-style metrics for the bot process.
+
+Counters and histograms are plain in-process objects updated under a short
+lock, and rendered in the Prometheus text exposition format on demand by a
+small HTTP server (see start_metrics_server). Nothing is exported unless the
+server is started, so instrumentation costs a lock and a few additions.
+"""
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets in seconds, from local lookups up to slow API calls
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    """Format a label set as {name="value",...}."""
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric(ABC):
+    """Base class for a metric family with optional labels."""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """Initialize and register the metric.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Names of the labels children are keyed by
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def labels(self, *values):
+        """Get the child metric for a label set, creating it on first use.
+
+        Args:
+            *values: Label values in the order of ``labelnames``
+
+        Returns:
+            Child metric
+        """
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    @abstractmethod
+    def _new_child(self):
+        """Create the child metric of a new label set."""
+
+    @abstractmethod
+    def _render_child(self, values: Tuple[str, ...], child) -> List[str]:
+        """Render one child in exposition format.
+
+        Args:
+            values: Label values of the child
+            child: Child metric
+
+        Returns:
+            List of lines
+        """
+
+    def _default(self):
+        """Get the unlabelled child."""
+        return self.labels()
+
+    def render(self) -> List[str]:
+        """Render the metric family in exposition format.
+
+        Returns:
+            List of lines
+        """
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in sorted(self._children.items()):
+            lines.extend(self._render_child(values, child))
+        return lines
+
+
+class _CounterChild:
+    """A single counter value."""
+
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        """Increase the counter."""
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        """Increase the unlabelled counter."""
+        self._default().inc(amount)
+
+    def _render_child(self, values, child) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, values)} {child.value}"]
+
+
+class _GaugeChild:
+    """A single gauge value."""
+
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float):
+        """Set the gauge."""
+        self.value = value
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float):
+        """Set the unlabelled gauge."""
+        self._default().set(value)
+
+    def _render_child(self, values, child) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, values)} {child.value}"]
+
+
+class _HistogramChild:
+    """Bucketed observations for a single label set."""
+
+    __slots__ = ('buckets', 'counts', 'sum', '_lock')
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        """Record an observation."""
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self):
+        """Observe the duration of the wrapped block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+class Histogram(_Metric):
+    """Distribution of observed values (typically latencies in seconds)."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """Initialize and register the histogram.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Names of the labels children are keyed by
+            buckets: Sorted upper bounds of the buckets
+        """
+        self.buckets = tuple(buckets)
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        """Record an observation on the unlabelled histogram."""
+        self._default().observe(value)
+
+    def time(self):
+        """Observe the duration of the wrapped block on the unlabelled histogram."""
+        return self._default().time()
+
+    def _render_child(self, values, child) -> List[str]:
+        with child._lock:
+            counts = list(child.counts)
+            total = child.sum
+
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += count
+            le = "+Inf" if bound == float('inf') else repr(bound)
+            labels = _format_labels(self.labelnames, values, f'le="{le}"')
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, values)
+        lines.append(f"{self.name}_sum{labels} {total}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+# All metrics created in this process, in creation order
+REGISTRY: List[_Metric] = []
+
+
+def render_metrics() -> str:
+    """Render every registered metric in Prometheus text format.
+
+    Returns:
+        Exposition text
+    """
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# Metrics exported by the bot
+
+AI_GENERATION_SECONDS = Histogram(
+    'quote_ai_generation_seconds', 'Time spent generating a quote with the AI API')
+AI_GENERATION_ERRORS = Counter(
+    'quote_ai_generation_errors_total', 'AI generations that failed and used a fallback quote')
+LOCAL_QUOTE_SECONDS = Histogram(
+    'quote_local_selection_seconds', 'Time spent selecting a quote from the local cache')
+QUOTES_SERVED = Counter(
+    'quote_served_total', 'Quotes returned by get_quote', ['source'])
+TELEGRAM_SEND_SECONDS = Histogram(
+    'telegram_send_seconds', 'Time spent sending a quote message to Telegram')
+TELEGRAM_SENDS = Counter(
+    'telegram_sends_total', 'Quote messages sent to Telegram', ['status'])
+MARKUP_FALLBACKS = Counter(
+    'telegram_markup_fallbacks_total', 'Quote messages resent as plain text after a markup error')
+STATS_WRITE_SECONDS = Histogram(
+    'stats_write_seconds', 'Time spent recording a sent quote in the stats file')
+COMMAND_SECONDS = Histogram(
+    'bot_command_seconds', 'Time spent handling a bot command', ['command'])
+PROFILE_CACHE_LOOKUPS = Counter(
+    'profile_cache_lookups_total', 'Chat profile lookups by cache result', ['result'])
+QUOTE_CARDS = Counter(
+    'quote_cards_total', 'Quote cards sent, by how the image was obtained', ['result'])
+CARD_RENDER_SECONDS = Histogram(
+    'quote_card_render_seconds', 'Time spent rendering a quote card image')
+QUOTE_REACTIONS = Counter(
+    'quote_reactions_total', 'Reaction button presses on sent quotes', ['reaction'])
+AI_TOKENS = Counter(
+    'quote_ai_tokens_total', 'Tokens reported in AI API usage', ['kind'])
+AI_SHARE = Gauge(
+    'quote_ai_share', 'Current probability that get_quote chooses AI generation')
+AI_CIRCUIT_STATE = Gauge(
+    'quote_ai_circuit_state', 'AI circuit breaker state (0 closed, 1 half-open, 2 open)')
+AI_CIRCUIT_TRANSITIONS = Counter(
+    'quote_ai_circuit_transitions_total', 'AI circuit breaker state changes', ['state'])
+AI_CIRCUIT_REJECTED = Counter(
+    'quote_ai_circuit_rejected_total', 'AI calls skipped because the circuit breaker was open')
+AI_DEADLINE_EXCEEDED = Counter(
+    'quote_ai_deadline_exceeded_total', 'AI calls that hit the per-call deadline')
+AI_HEDGED = Counter(
+    'quote_ai_hedged_total', 'AI calls that took longer than the hedge delay and were answered locally')
+AI_INVALID_RESPONSES = Counter(
+    'quote_ai_invalid_responses_total', 'AI responses rejected by quote validation', ['reason'])
+SCHEDULER_LAG_SECONDS = Histogram(
+    'scheduler_lag_seconds', 'Delay between a job\'s scheduled time and its submission',
+    buckets=(0.01, 0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0, 900.0))
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Serve the metrics text on /metrics."""
+
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+
+        body = render_metrics().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Silence per-request logging."""
+
+
+def start_metrics_server(port: int, host: str = '127.0.0.1') -> ThreadingHTTPServer:
+    """Serve /metrics from a background daemon thread.
+
+    Args:
+        port: Port to listen on
+        host: Interface to bind (local only by default)
+
+    Returns:
+        The running HTTP server
+    """
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True)
+    thread.start()
+    logger.info(f"Metrics available at http://{host}:{port}/metrics")
+    return server
@@ -0,0 +1,95 @@
+"""Bot API requests encoded once and sent to many chats."""
+import json
+from typing import Any, Dict, Optional
+
+from telegram import Bot
+
+
+class PreparedRequestData:
+    """Request data holding already JSON-encoded parameters.
+
+    Provides the parts of telegram.request.RequestData that the Bot's
+    request object reads when posting a request without files.
+    """
+
+    __slots__ = ('json_parameters',)
+
+    # Prepared requests never upload files
+    contains_files = False
+    multipart_data = None
+
+    def __init__(self, json_parameters: Dict[str, str]):
+        self.json_parameters = json_parameters
+
+
+def encode_parameter(value: Any) -> str:
+    """JSON-encode a parameter value the way python-telegram-bot does.
+
+    Args:
+        value: Parameter value; objects with to_dict() (e.g. reply markup)
+            are converted first
+
+    Returns:
+        The value itself for strings, otherwise its JSON encoding
+    """
+    if isinstance(value, str):
+        return value
+    if hasattr(value, 'to_dict'):
+        value = value.to_dict()
+    return json.dumps(value)
+
+
+class PreparedSend:
+    """One Bot API call with its parameters encoded once, sendable to any chat.
+
+    Only chat_id differs between the chats of a broadcast, so validating and
+    JSON-encoding the other parameters for every chat is skipped. Sends go
+    through the Bot's own request object and raise the usual telegram.error
+    exceptions.
+    """
+
+    __slots__ = ('method', '_parameters')
+
+    def __init__(self, method: str, **parameters: Any):
+        """Encode the parameters of a call.
+
+        Args:
+            method: Bot API method, e.g. 'sendMessage'
+            **parameters: Method parameters other than chat_id; None values
+                are left out
+        """
+        self.method = method
+        self._parameters = {
+            name: encode_parameter(value) for name, value in parameters.items() if value is not None
+        }
+
+    def request_data(self, chat_id: str) -> PreparedRequestData:
+        """Build the request data for one chat.
+
+        Args:
+            chat_id: Target chat
+
+        Returns:
+            Request data sharing the encoded parameters
+        """
+        parameters = dict(self._parameters)
+        parameters['chat_id'] = str(chat_id)
+        return PreparedRequestData(parameters)
+
+    async def send(self, bot: Bot, chat_id: str) -> Optional[Dict[str, Any]]:
+        """Send the call to one chat.
+
+        Args:
+            bot: Bot whose token and request object are used
+            chat_id: Target chat
+
+        Returns:
+            The Bot API result, e.g. the sent Message as a dictionary
+
+        Raises:
+            telegram.error.TelegramError: As for the Bot's own methods,
+                e.g. RetryAfter when rate limited
+        """
+        return await bot.request.post(
+            url=f"{bot.base_url}/{self.method}", request_data=self.request_data(chat_id)
+        )
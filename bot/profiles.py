@@ -0,0 +1,207 @@
+"""Per-chat preference profiles in SQLite behind an LRU cache."""
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+from config.settings import config
+from bot.database import LazyDatabase
+from bot.metrics import PROFILE_CACHE_LOOKUPS
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    chat_id TEXT PRIMARY KEY,
+    language TEXT,
+    topics TEXT NOT NULL DEFAULT ''
+);
+"""
+
+# Profiles kept in memory
+PROFILE_CACHE_SIZE = 4096
+
+# How often the cache checks for changes made by another process
+PROFILE_REFRESH_SECONDS = 5.0
+
+# Most topics a chat can follow
+MAX_TOPICS = 5
+
+# Separator between topics in the database
+TOPIC_SEPARATOR = ","
+
+
+@dataclass(frozen=True)
+class ChatProfile:
+    """Quote preferences of one chat."""
+
+    chat_id: str
+    language: Optional[str] = None
+    topics: Tuple[str, ...] = field(default_factory=tuple)
+
+    def __post_init__(self):
+        """Validate profile settings after initialization."""
+        object.__setattr__(self, 'chat_id', str(self.chat_id))
+        object.__setattr__(self, 'topics', tuple(self.topics))
+        self._validate_language()
+        self._validate_topics()
+
+    def _validate_language(self):
+        """Validate language is unset or a valid value."""
+        if self.language is not None and self.language not in config.language_choices:
+            raise ValueError(
+                f"Language must be one of {config.language_choices}, got '{self.language}'"
+            )
+
+    def _validate_topics(self):
+        """Validate there are not too many topics and none contains the separator."""
+        if len(self.topics) > MAX_TOPICS:
+            raise ValueError(f"At most {MAX_TOPICS} topics, got {len(self.topics)}")
+        for topic in self.topics:
+            if not topic or TOPIC_SEPARATOR in topic:
+                raise ValueError(f"Invalid topic '{topic}'")
+
+    @property
+    def quote_language(self) -> str:
+        """Language to send in: the chat's choice, else the bot default."""
+        return self.language or config.quote_language
+
+
+class ProfileStore:
+    """Chat profiles in SQLite behind an LRU cache.
+
+    Chats without a profile are cached too, as the default profile. Without
+    the database every chat gets the default profile.
+    """
+
+    def __init__(self, profiles_file: Union[Path, str] = ":memory:",
+                 cache_size: int = PROFILE_CACHE_SIZE):
+        """Initialize the store; the database is opened on first use.
+
+        Args:
+            profiles_file: Path to the SQLite file, or ':memory:' for a
+                non-persistent store
+            cache_size: Number of profiles kept in memory
+        """
+        self.profiles_file = profiles_file
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._db = LazyDatabase(profiles_file, SCHEMA, "Profile store",
+                                "using default profiles")
+        self._cache: "OrderedDict[str, ChatProfile]" = OrderedDict()
+        self._checked_at = float("-inf")
+
+    def _refresh(self):
+        """Drop the cache if another process changed the profiles."""
+        now = time.monotonic()
+        if now - self._checked_at < PROFILE_REFRESH_SECONDS:
+            return
+        self._checked_at = now
+        conn = self._db.open()
+        if conn is None:
+            return
+        try:
+            if self._db.changed(conn):
+                self._cache.clear()
+        except sqlite3.Error as e:
+            self._db.disable(e)
+
+    def _remember(self, profile: ChatProfile):
+        """Put a profile in the cache, evicting the least recently used."""
+        self._cache[profile.chat_id] = profile
+        self._cache.move_to_end(profile.chat_id)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def get(self, chat_id: str) -> ChatProfile:
+        """Get a chat's profile.
+
+        Args:
+            chat_id: Telegram chat ID
+
+        Returns:
+            The stored profile, or a default one if the chat has none
+        """
+        chat_id = str(chat_id)
+        with self._lock:
+            self._refresh()
+            profile = self._cache.get(chat_id)
+            if profile is not None:
+                self._cache.move_to_end(chat_id)
+                PROFILE_CACHE_LOOKUPS.labels('hit').inc()
+                return profile
+
+            PROFILE_CACHE_LOOKUPS.labels('miss').inc()
+            row = None
+            conn = self._db.open()
+            if conn is not None:
+                try:
+                    row = conn.execute(
+                        "SELECT language, topics FROM profiles WHERE chat_id = ?", (chat_id,)
+                    ).fetchone()
+                except sqlite3.Error as e:
+                    self._db.disable(e)
+            profile = ChatProfile(chat_id)
+            if row is not None:
+                language, topics = row
+                try:
+                    profile = ChatProfile(chat_id, language, [t for t in topics.split(TOPIC_SEPARATOR) if t])
+                except ValueError as e:
+                    logger.warning(f"Ignoring invalid profile of chat {chat_id}: {e}")
+            self._remember(profile)
+            return profile
+
+    def save(self, profile: ChatProfile):
+        """Store a profile, replacing the chat's previous one.
+
+        Args:
+            profile: Profile to store
+
+        Raises:
+            sqlite3.Error: If the profile cannot be written
+        """
+        with self._lock:
+            conn = self._db.connect()
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT INTO profiles (chat_id, language, topics) VALUES (?, ?, ?) "
+                        "ON CONFLICT(chat_id) DO UPDATE SET language = excluded.language, "
+                        "topics = excluded.topics",
+                        (profile.chat_id, profile.language, TOPIC_SEPARATOR.join(profile.topics))
+                    )
+            except sqlite3.Error as e:
+                self._db.disable(e)
+                raise
+            self._remember(profile)
+
+    def __len__(self):
+        with self._lock:
+            conn = self._db.open()
+            if conn is not None:
+                try:
+                    return conn.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+                except sqlite3.Error as e:
+                    self._db.disable(e)
+            return 0
+
+    def close(self):
+        """Close the underlying database connection, if it was opened."""
+        with self._lock:
+            self._db.close()
+
+
+# Singleton instance
+_store: Optional[ProfileStore] = None
+
+
+def get_profile_store() -> ProfileStore:
+    """Get the singleton profile store instance."""
+    global _store
+    if _store is None:
+        _store = ProfileStore(config.profiles_file)
+    return _store
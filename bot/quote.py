@@ -0,0 +1,121 @@
+"""Immutable quote record shared by generation, delivery, and stats."""
+import hashlib
+import sys
+from collections.abc import Mapping
+from typing import Iterable, Iterator
+
+# Fields of a quote, in display order
+QUOTE_FIELDS = ('text', 'author', 'language', 'source', 'tags')
+
+
+class Quote(Mapping):
+    """A quote with its author, language, and where it came from.
+
+    Instances use __slots__ and intern the small set of language, source and
+    tag values, so a resident quote costs a fraction of an equivalent dict. They
+    are immutable and can be shared without copying; use replace() to derive
+    a changed quote. Read access is dict-compatible (quote['text'],
+    quote.get('source'), dict(quote)) so code written against quote dicts
+    keeps working.
+    """
+
+    __slots__ = QUOTE_FIELDS
+
+    def __init__(self, text: str, author: str = "Unknown", language: str = "en",
+                 source: str = "local", tags: Iterable[str] = ()):
+        """Create a quote.
+
+        Args:
+            text: Quote text
+            author: Quote author
+            language: Language code (a file in data/languages, e.g. 'en')
+            source: Where the quote came from ('local', 'ai', or 'fallback')
+            tags: Theme, mood and time-of-day tags (e.g. 'motivation', 'morning')
+        """
+        set_field = object.__setattr__
+        set_field(self, 'text', text)
+        set_field(self, 'author', author)
+        set_field(self, 'language', sys.intern(language))
+        set_field(self, 'source', sys.intern(source))
+        set_field(self, 'tags', tuple(sys.intern(tag) for tag in tags))
+
+    @classmethod
+    def from_dict(cls, data: Mapping, source: str = "local") -> 'Quote':
+        """Create a quote from a dictionary such as a quotes.json entry.
+
+        Args:
+            data: Mapping with 'text' and optional 'author', 'language',
+                'source', 'tags'
+            source: Source used when the mapping has none
+
+        Returns:
+            Quote instance
+        """
+        return cls(
+            str(data.get('text', '')),
+            str(data.get('author') or 'Unknown'),
+            str(data.get('language') or 'en'),
+            str(data.get('source') or source),
+            [str(tag) for tag in data.get('tags') or ()],
+        )
+
+    @property
+    def key(self) -> str:
+        """Stable short identifier of the quote, derived from its text and author.
+
+        Used to refer to a quote in button callbacks and feedback counters;
+        the same quote gets the same key whether it was read from
+        quotes.json or the compiled corpus.
+        """
+        content = f"{self.text}\0{self.author}".encode('utf-8')
+        return hashlib.blake2b(content, digest_size=8).hexdigest()
+
+    def replace(self, **changes) -> 'Quote':
+        """Return a copy of the quote with some fields changed.
+
+        Args:
+            **changes: New field values
+
+        Returns:
+            New Quote instance
+        """
+        fields = {name: getattr(self, name) for name in QUOTE_FIELDS}
+        fields.update(changes)
+        return Quote(**fields)
+
+    def to_dict(self) -> dict:
+        """Convert the quote to a plain dictionary (e.g. for JSON).
+
+        Returns:
+            Dictionary with every field
+        """
+        data = {name: getattr(self, name) for name in QUOTE_FIELDS}
+        data['tags'] = list(self.tags)
+        return data
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Quote is immutable; use replace()")
+
+    def __delattr__(self, name):
+        raise AttributeError("Quote is immutable")
+
+    def __getitem__(self, key: str):
+        if key in QUOTE_FIELDS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(QUOTE_FIELDS)
+
+    def __len__(self):
+        return len(QUOTE_FIELDS)
+
+    def __hash__(self):
+        return hash((self.text, self.author, self.language, self.source, self.tags))
+
+    def __reduce__(self):
+        return Quote, (self.text, self.author, self.language, self.source, self.tags)
+
+    def __repr__(self):
+        return (f"Quote(text={self.text!r}, author={self.author!r}, "
+                f"language={self.language!r}, source={self.source!r}, tags={self.tags!r})")
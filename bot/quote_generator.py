@@ -1,193 +1,467 @@
 """Quote generation module using Claude API and local cache."""
+import contextvars
 import json
-import random
+import logging
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from pathlib import Path
-from typing import Optional
+from types import SimpleNamespace
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
 import anthropic
 
 from config.settings import config
+from bot import tracing
+from bot.circuit_breaker import CircuitBreaker
+from bot.corpus import CORPUS_SUFFIX, QuoteCorpus, compile_corpus
+from bot.feedback import FEEDBACK_CANDIDATES, FeedbackStore, get_feedback_store, thompson_pick
+from bot.languages import get_language_registry
+from bot.metrics import (
+    AI_DEADLINE_EXCEEDED,
+    AI_GENERATION_ERRORS,
+    AI_GENERATION_SECONDS,
+    AI_HEDGED,
+    AI_INVALID_RESPONSES,
+    LOCAL_QUOTE_SECONDS,
+    QUOTES_SERVED,
+)
+from bot.quote import Quote
+from bot.quote_schema import InvalidQuote, parse_quote_response
+from bot.source_policy import SourcePolicy
+from bot.stream_parser import QuoteStreamParser
+from bot.tag_index import TagIndex, TagSampler
+from bot.token_usage import TokenUsageStore, get_token_usage_store
 
 # AI model configuration
 AI_MODEL = "claude-3-5-sonnet-20241022"
 AI_MAX_TOKENS = 500
 AI_TEMPERATURE = 0.8
 
-# Fallback quotes when AI generation fails
-FALLBACK_QUOTES = {
-    'th': {
-        'text': 'ทุกวันเป็นโอกาสใหม่ในการเริ่มต้นใหม่',
-        'author': 'ไม่ระบุ',
-        'language': 'th'
-    },
-    'en': {
-        'text': 'Every day is a new opportunity to start fresh.',
-        'author': 'Unknown',
-        'language': 'en'
-    }
-}
+# SDK retries per call; left at 0 so a degraded API costs one deadline at
+# most and repeated failures are handled by the circuit breaker instead
+AI_MAX_RETRIES = 0
+
+# New generations after a response that is not a valid quote; each is a full
+# API call, so a prompt that keeps failing costs this many extra calls per quote
+AI_INVALID_RETRIES = 1
+
+# Background threads for hedged AI calls
+AI_HEDGE_WORKERS = 4
 
-# AI prompts for quote generation
-PROMPTS = {
-    'th': """สร้างคำคมเตือนใจที่สร้างแรงบันดาลใจ 1 ข้อ โดยมีลักษณะดังนี้:
-- สั้น กระชับ และมีความหมายลึกซึ้ง
-- เหมาะสำหรับแชร์ในโซเชียลมีเดีย
-- ไม่ซ้ำซาก
-- ไม่ต้องระบุผู้แต่ง (ใส่ "ไม่ระบุ")
-
-ตอบเป็น JSON เท่านั้น:
-{
-  "text": "คำคมที่สร้างขึ้น",
-  "author": "ไม่ระบุ",
-  "language": "th"
-}""",
-    'en': """Generate 1 original, inspirational quote with these characteristics:
-- Short, concise, and meaningful
-- Suitable for social media sharing
-- Unique and not cliché
-- Author can be "Unknown" if not applicable
-
-Respond ONLY with valid JSON:
-{
-  "text": "the quote text",
-  "author": "author name",
-  "language": "en"
-}"""
+# Characters per output token assumed for a stream stopped before Claude
+# reports its final usage
+STREAM_CHARS_PER_TOKEN = 4
+
+# Tag weights of local quotes per send period (see bot/tag_index.py)
+PERIOD_TAG_WEIGHTS: Dict[str, Dict[str, float]] = {
+    'morning': {'morning': 3.0},
+    'evening': {'evening': 3.0},
 }
 
+# Tag weight of each topic a chat follows (/topics)
+TOPIC_TAG_WEIGHT = 4.0
+
+logger = logging.getLogger(__name__)
+
 
 class QuoteGenerator:
     """Generate inspirational quotes from local cache or Claude AI."""
 
-    def __init__(self, quotes_file: Optional[Path] = None, api_key: Optional[str] = None):
+    def __init__(self, quotes_file: Optional[Path] = None, api_key: Optional[str] = None,
+                 base_url: Optional[str] = None, feedback: Optional[FeedbackStore] = None,
+                 token_usage: Optional[TokenUsageStore] = None):
         """Initialize the quote generator.
 
         Args:
             quotes_file: Path to quotes JSON file
             api_key: Anthropic API key for Claude
+            base_url: Anthropic API base URL (defaults to the configured one)
+            feedback: Reaction store used to rank local quotes (defaults to
+                the shared store)
+            token_usage: Store counting AI tokens against the daily budget
+                (defaults to the shared store)
         """
         self.quotes_file = quotes_file or config.quotes_file
         self.api_key = api_key or config.anthropic_api_key
-        self.client = anthropic.Anthropic(api_key=self.api_key)
+        self.base_url = base_url or config.anthropic_base_url or None
+        self.client = anthropic.Anthropic(
+            api_key=self.api_key,
+            base_url=self.base_url,
+            timeout=config.ai_timeout_seconds,
+            max_retries=AI_MAX_RETRIES,
+        )
+        self.policy = SourcePolicy(
+            config.ai_daily_token_budget, config.timezone,
+            usage=token_usage if token_usage is not None else get_token_usage_store(),
+        )
+        self.breaker = CircuitBreaker()
+        self.hedge_seconds = config.ai_hedge_ms / 1000
+        self.streaming = config.ai_streaming
+        self.feedback = feedback if feedback is not None else get_feedback_store()
+        self.languages = get_language_registry()
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        self._index: Tuple[Optional[int], Optional[TagSampler]] = (None, None)
+        self.corpus_file = self.quotes_file.with_suffix(CORPUS_SUFFIX)
+        self._corpus: Tuple[Optional[int], Optional[TagSampler]] = (None, None)
+
+    def _load_corpus(self) -> Optional[TagSampler]:
+        """Get a sampler over the compiled corpus if it is at least as new as quotes.json.
+
+        The corpus is mapped once and reopened only when the file changes.
 
-    def get_local_quote(self, language: str = "both") -> dict:
-        """Get a random quote from local cache.
+        Returns:
+            Sampler over the mapped corpus, or None to read quotes.json instead
+        """
+        try:
+            corpus_mtime = self.corpus_file.stat().st_mtime_ns
+        except OSError:
+            return None
+        try:
+            if self.quotes_file.stat().st_mtime_ns > corpus_mtime:
+                return None
+        except OSError:
+            pass
+
+        cached_mtime, sampler = self._corpus
+        if cached_mtime != corpus_mtime:
+            try:
+                sampler = TagSampler(QuoteCorpus(self.corpus_file))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not open quote corpus, using JSON: {e}")
+                return None
+            self._corpus = (corpus_mtime, sampler)
+        return sampler
+
+    def _local_sampler(self) -> Optional[TagSampler]:
+        """Get a sampler over the local quotes.
+
+        Uses the compiled corpus when it is up to date. Otherwise quotes.json
+        is parsed into a TagIndex, which is kept until the file changes.
+
+        Returns:
+            Sampler, or None if there is no quotes file
+        """
+        sampler = self._load_corpus()
+        if sampler is not None:
+            return sampler
+
+        try:
+            mtime = self.quotes_file.stat().st_mtime_ns
+        except OSError:
+            return None
+
+        cached_mtime, sampler = self._index
+        if cached_mtime != mtime:
+            with open(self.quotes_file, 'r', encoding='utf-8') as f:
+                quotes = json.load(f).get('quotes', [])
+            sampler = TagSampler(TagIndex(Quote.from_dict(quote) for quote in quotes))
+            self._index = (mtime, sampler)
+        return sampler
+
+    def available_tags(self) -> List[str]:
+        """Get the tags of the local quotes (e.g. to validate /topics).
+
+        Returns:
+            Sorted list of tags
+        """
+        sampler = self._local_sampler()
+        return sampler.source.tags if sampler is not None else []
+
+    @staticmethod
+    def _tag_weights(time_period: Optional[str], topics: Sequence[str]) -> Optional[Dict[str, float]]:
+        """Combine the tag weights of a send period and a chat's topics.
 
         Args:
-            language: Language preference ('en', 'th', or 'both')
+            time_period: Send period, or None
+            topics: Tags the chat follows
 
         Returns:
-            Dictionary with 'text', 'author', and 'language' keys
+            Weight per tag, or None for a uniform pick
         """
-        if not self.quotes_file.exists():
-            return self._generate_ai_quote(language)
+        weights = dict(PERIOD_TAG_WEIGHTS.get(time_period, {}))
+        for topic in topics:
+            weights[topic] = weights.get(topic, 1.0) + TOPIC_TAG_WEIGHT - 1.0
+        return weights or None
 
-        with open(self.quotes_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+    def _local_pool_size(self, language: str) -> int:
+        """Count the local quotes available for a language.
 
-        quotes = data.get('quotes', [])
+        Args:
+            language: Language preference (a language code or 'both')
 
-        # Filter by language if specified
-        if language != "both":
-            quotes = [q for q in quotes if q.get('language') == language]
+        Returns:
+            Number of matching local quotes
+        """
+        sampler = self._local_sampler()
+        return sampler.source.count(language) if sampler is not None else 0
 
-        if not quotes:
-            return self._generate_ai_quote(language)
+    def get_local_quote(self, language: str = "both", time_period: Optional[str] = None,
+                        topics: Sequence[str] = (), ai_tried: bool = False) -> Quote:
+        """Get a random quote from local cache.
 
-        return random.choice(quotes)
+        Samples from the compiled corpus when it is up to date, otherwise
+        from quotes.json. Quotes tagged for the time period are favoured
+        according to PERIOD_TAG_WEIGHTS, and so are quotes on the given
+        topics. Once quotes have reactions, the best of FEEDBACK_CANDIDATES
+        picks is chosen by Thompson sampling.
 
-    def _parse_ai_response(self, content: str, lang: str) -> dict:
-        """Parse AI response, handling various JSON formats.
+        A language without local quotes gets an AI quote, within the daily
+        token budget and circuit breaker, or else its fallback quote.
+
+        Args:
+            language: Language preference (a language code or 'both')
+            time_period: Send period ('morning', 'evening', ...), or None
+            topics: Tags to favour (a chat's /topics)
+            ai_tried: True if this request already tried AI generation
+
+        Returns:
+            Quote with source 'local', or 'ai' / 'fallback' if there are no
+            local quotes for the language
+        """
+        with LOCAL_QUOTE_SECONDS.time(), tracing.span('quote.local', language=language):
+            sampler = self._local_sampler()
+            if sampler is not None and sampler.source.count(language):
+                weights = self._tag_weights(time_period, topics)
+                if not self.feedback:
+                    return sampler.sample(language, weights)
+                candidates = [sampler.sample(language, weights) for _ in range(FEEDBACK_CANDIDATES)]
+                return thompson_pick(candidates, self.feedback)
+
+        lang = self.languages.resolve(language)
+        quote = None
+        if not ai_tried and not self.policy.budget_exhausted():
+            quote = self._request_ai_quote(lang)
+        return quote or self.languages.get(lang).fallback
+
+    def _parse_ai_response(self, content: str, lang: str, data: Optional[dict] = None) -> Quote:
+        """Extract and validate the quote in an AI response.
 
         Args:
             content: Raw response content from Claude
-            lang: Expected language code
+            lang: Requested language code
+            data: Object already extracted while streaming, if any
 
         Returns:
-            Parsed quote dictionary
+            Quote with source 'ai'
+
+        Raises:
+            InvalidQuote: If the response holds no valid quote object
         """
-        # Remove markdown code blocks if present
-        if content.startswith("```"):
-            parts = content.split("```")
-            if len(parts) >= 2:
-                content = parts[1].strip()
-                # Remove language identifier if present (e.g., "json", "python")
-                if content.startswith(("json", "python", "text")):
-                    content = content.split("\n", 1)[1].strip() if "\n" in content else content.strip()
-
-        # Try to parse as JSON
-        try:
-            quote_data = json.loads(content)
-            # Ensure required fields exist
-            quote_data.setdefault('text', content)
-            quote_data.setdefault('author', 'Claude AI')
-            quote_data.setdefault('language', lang)
-            return quote_data
-        except json.JSONDecodeError:
-            # If not JSON, return the text as quote
-            return {
-                'text': content,
-                'author': 'Claude AI',
-                'language': lang
-            }
-
-    def _generate_ai_quote(self, language: str = "both") -> dict:
+        return parse_quote_response(content, self.languages.get(lang), data)
+
+    def _call_ai(self, lang: str) -> Tuple[Optional[dict], str, object]:
+        """Make one AI generation call.
+
+        Args:
+            lang: Language code
+
+        Returns:
+            Tuple of (object extracted while streaming or None, response
+            text, usage)
+        """
+        if self.streaming:
+            return self._stream_ai_response(lang)
+        response = self.client.messages.create(
+            model=AI_MODEL,
+            max_tokens=AI_MAX_TOKENS,
+            temperature=AI_TEMPERATURE,
+            messages=[{"role": "user", "content": self.languages.get(lang).prompt}]
+        )
+        return None, response.content[0].text.strip(), getattr(response, 'usage', None)
+
+    def _try_ai_quote(self, lang: str) -> Optional[Quote]:
+        """Generate a quote with Claude AI unless the circuit breaker is open.
+
+        A response that is not a valid quote is rejected and generated again,
+        up to AI_INVALID_RETRIES times. Such calls still count as successes
+        for the circuit breaker: the API answered.
+
+        Args:
+            lang: Language code
+
+        Returns:
+            Validated quote, or None if the call was skipped or failed or
+            every response was invalid
+        """
+        for attempt in range(AI_INVALID_RETRIES + 1):
+            if not self.breaker.allow_request():
+                return None
+
+            start = time.perf_counter()
+            try:
+                with AI_GENERATION_SECONDS.time(), tracing.span('quote.ai', language=lang,
+                                                                streaming=self.streaming):
+                    parsed, content, usage = self._call_ai(lang)
+            except Exception as e:
+                if isinstance(e, anthropic.APITimeoutError):
+                    AI_DEADLINE_EXCEEDED.inc()
+                logger.error(f"Error generating AI quote: {e}")
+                AI_GENERATION_ERRORS.inc()
+                self.policy.record_failure(time.perf_counter() - start)
+                self.breaker.record_failure()
+                return None
+
+            self.policy.record_success(
+                time.perf_counter() - start,
+                getattr(usage, 'input_tokens', 0) or 0,
+                getattr(usage, 'output_tokens', 0) or 0,
+            )
+            self.breaker.record_success()
+            try:
+                return self._parse_ai_response(content, lang, parsed)
+            except InvalidQuote as e:
+                AI_INVALID_RESPONSES.labels(e.reason).inc()
+                retry = attempt < AI_INVALID_RETRIES
+                logger.warning(f"Rejected AI quote response: {e}"
+                               f"{'; generating another' if retry else ''}")
+
+        AI_GENERATION_ERRORS.inc()
+        return None
+
+    def _stream_ai_response(self, lang: str) -> Tuple[Optional[dict], str, object]:
+        """Stream a generation and stop as soon as a complete JSON object arrives.
+
+        Args:
+            lang: Language code
+
+        Returns:
+            Tuple of (parsed object or None, streamed text, usage so far,
+            with output tokens estimated if the stream was stopped early)
+
+        Raises:
+            anthropic.APITimeoutError: If the stream runs past AI_TIMEOUT_SECONDS
+                without a complete object
+        """
+        parser = QuoteStreamParser()
+        # The SDK timeout restarts with every delta, so bound the whole stream too
+        deadline = time.monotonic() + config.ai_timeout_seconds
+        deltas = 0
+        with self.client.messages.stream(
+            model=AI_MODEL,
+            max_tokens=AI_MAX_TOKENS,
+            temperature=AI_TEMPERATURE,
+            messages=[{"role": "user", "content": self.languages.get(lang).prompt}]
+        ) as stream:
+            for chunk in stream.text_stream:
+                deltas += 1
+                if parser.feed(chunk) is not None:
+                    # Leaving the block closes the connection, ending generation early
+                    break
+                if time.monotonic() >= deadline:
+                    raise anthropic.APITimeoutError(request=stream.response.request)
+            usage = getattr(stream.current_message_snapshot, 'usage', None)
+
+        if parser.result is not None:
+            # Stopped before the final usage arrived: the snapshot still holds
+            # the output count from message_start, so estimate it from the text
+            usage = SimpleNamespace(
+                input_tokens=getattr(usage, 'input_tokens', 0) or 0,
+                output_tokens=max(getattr(usage, 'output_tokens', 0) or 0, deltas,
+                                  math.ceil(len(parser.text) / STREAM_CHARS_PER_TOKEN)),
+            )
+        return parser.result, parser.text.strip(), usage
+
+    def _generate_ai_quote(self, language: str = "both") -> Quote:
         """Generate a new inspirational quote using Claude AI.
 
         Args:
-            language: Language preference ('en', 'th', or 'both')
+            language: Language preference (a language code or 'both')
 
         Returns:
-            Dictionary with 'text', 'author', and 'language' keys
+            Quote with 'text', 'author', 'language', and 'source'
         """
         # Determine language for prompt
-        lang = random.choice(["en", "th"]) if language == "both" else language
-        prompt = PROMPTS[lang]
+        lang = self.languages.resolve(language)
+        return self._try_ai_quote(lang) or self.languages.get(lang).fallback
 
-        try:
-            response = self.client.messages.create(
-                model=AI_MODEL,
-                max_tokens=AI_MAX_TOKENS,
-                temperature=AI_TEMPERATURE,
-                messages=[{"role": "user", "content": prompt}]
-            )
+    def _request_ai_quote(self, language: str) -> Optional[Quote]:
+        """Generate an AI quote, giving up on it after the hedge delay.
+
+        With hedging enabled the call runs in a background thread; if it has
+        not answered within the hedge delay the caller serves a local quote
+        while the call finishes and still updates the breaker and policy.
 
-            content = response.content[0].text.strip()
-            return self._parse_ai_response(content, lang)
+        Args:
+            language: Language preference (a language code or 'both')
 
-        except Exception as e:
-            logger = __import__('logging').getLogger(__name__)
-            logger.error(f"Error generating AI quote: {e}")
-            return FALLBACK_QUOTES[lang].copy()
+        Returns:
+            Quote, or None to fall back to a local quote
+        """
+        lang = self.languages.resolve(language)
+        if not self.hedge_seconds:
+            return self._try_ai_quote(lang)
 
-    def get_quote(self, prefer_ai: bool = False, language: str = "both") -> dict:
+        if self._hedge_executor is None:
+            self._hedge_executor = ThreadPoolExecutor(
+                max_workers=AI_HEDGE_WORKERS, thread_name_prefix='ai-hedge'
+            )
+        # Run in a copy of the context so the AI span joins the current trace
+        context = contextvars.copy_context()
+        future = self._hedge_executor.submit(context.run, self._try_ai_quote, lang)
+        try:
+            return future.result(timeout=self.hedge_seconds)
+        except FutureTimeoutError:
+            AI_HEDGED.inc()
+            logger.info(f"AI quote not ready after {self.hedge_seconds:.1f}s, using a local quote")
+            return None
+
+    def get_quote(self, prefer_ai: bool = False, language: str = "both",
+                  time_period: Optional[str] = None, topics: Sequence[str] = ()) -> Quote:
         """Get a quote from local cache or AI generation.
 
+        AI generation falls back to a local quote when it fails, is too slow
+        (with hedging enabled), or the circuit breaker is open.
+
         Args:
             prefer_ai: If True, prefer AI-generated quotes
-            language: Language preference ('en', 'th', or 'both')
+            language: Language preference (a language code or 'both')
+            time_period: Send period, used to favour suitable local quotes
+            topics: Tags to favour in local quotes
 
         Returns:
-            Dictionary with 'text', 'author', and 'language' keys
+            Quote with 'text', 'author', 'language', and 'source'
         """
-        # Use AI if explicitly requested or randomly (30% chance)
-        if prefer_ai or random.random() < 0.3:
-            quote = self._generate_ai_quote(language)
-            quote['source'] = 'ai'
-        else:
-            quote = self.get_local_quote(language)
-            quote['source'] = 'local'
+        # Use AI if explicitly requested or as often as the source policy allows
+        with tracing.span('quote.get', language=language) as span:
+            quote = None
+            ai_tried = prefer_ai or self.policy.choose_ai(self._local_pool_size(language))
+            if ai_tried:
+                quote = self._request_ai_quote(language)
+
+            if quote is None:
+                quote = self.get_local_quote(language, time_period, topics, ai_tried)
 
+            if span:
+                span.set_attribute('source', quote.source)
+
+        QUOTES_SERVED.labels(quote.source).inc()
         return quote
 
-    def add_quote_to_cache(self, text: str, author: str = "Unknown", language: str = "en"):
-        """Add a new quote to the local cache.
+    def add_quote_to_cache(self, text: str, author: str = "Unknown", language: str = "en",
+                           tags: Iterable[str] = ()) -> bool:
+        """Add a new quote to the local cache unless it is already there.
+
+        Quotes count as duplicates when their texts have the same tokens in
+        the language's tokenizer, i.e. differ only in case, spacing or
+        punctuation.
 
         Args:
             text: Quote text
             author: Quote author
-            language: Quote language ('en' or 'th')
+            language: Quote language code
+            tags: Theme, mood and time-of-day tags
+
+        Returns:
+            True if the quote was added, False if it was a duplicate
         """
+        quote = Quote(text, author, language, tags=tags)
+        cached_mtime, sampler = self._index
+        try:
+            index_current = cached_mtime == self.quotes_file.stat().st_mtime_ns
+        except OSError:
+            index_current = False
+
         # Load existing quotes or create new structure
         if self.quotes_file.exists():
             with open(self.quotes_file, 'r', encoding='utf-8') as f:
@@ -195,17 +469,39 @@ class QuoteGenerator:
         else:
             data = {'quotes': []}
 
+        signature = tuple(self.languages.tokenize(text, language))
+        for existing in data['quotes']:
+            if (existing.get('language') == language
+                    and tuple(self.languages.tokenize(str(existing.get('text', '')), language)) == signature):
+                logger.info(f"Not adding duplicate quote: {text[:50]}")
+                return False
+
         # Add new quote
-        data['quotes'].append({
+        entry = {
             'text': text,
             'author': author,
             'language': language
-        })
+        }
+        if quote.tags:
+            entry['tags'] = list(quote.tags)
+        data['quotes'].append(entry)
 
         # Save back to file
         with open(self.quotes_file, 'w', encoding='utf-8') as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
 
+        # Update the in-memory index in place rather than re-reading the file;
+        # only the language's alias tables are rebuilt, on next use
+        if index_current:
+            sampler.source.add(quote)
+            sampler.invalidate(language)
+            self._index = (self.quotes_file.stat().st_mtime_ns, sampler)
+
+        # Keep an existing compiled corpus in step with the JSON source
+        if self.corpus_file.exists():
+            compile_corpus(self.quotes_file, self.corpus_file)
+        return True
+
 
 # Singleton instance
 _generator: Optional[QuoteGenerator] = None
@@ -219,14 +515,18 @@ def get_quote_generator() -> QuoteGenerator:
     return _generator
 
 
-def get_quote(prefer_ai: bool = False, language: str = "both") -> dict:
+def get_quote(prefer_ai: bool = False, language: str = "both",
+              time_period: Optional[str] = None, topics: Sequence[str] = ()) -> Quote:
     """Convenience function to get a quote.
 
     Args:
         prefer_ai: If True, prefer AI-generated quotes
-        language: Language preference ('en', 'th', or 'both')
+        language: Language preference (a language code or 'both')
+        time_period: Send period, used to favour suitable local quotes
+        topics: Tags to favour in local quotes
 
     Returns:
-        Dictionary with 'text', 'author', and 'language' keys
+        Quote with 'text', 'author', 'language', and 'source'
     """
-    return get_quote_generator().get_quote(prefer_ai=prefer_ai, language=language)
+    return get_quote_generator().get_quote(prefer_ai=prefer_ai, language=language,
+                                           time_period=time_period, topics=topics)
@@ -0,0 +1,132 @@
+"""Validation of AI responses against the quote schema.
+
+Claude is asked for a JSON object {"text", "author", "language"}, but its
+reply can wrap the object in prose or code fences, leave it out, truncate
+it, or answer in the wrong language. parse_quote_response() extracts the
+first JSON object anywhere in the reply (see bot/stream_parser.py) and
+validate_quote() checks it:
+
+- "text" is a string of MIN_TEXT_LENGTH to MAX_TEXT_LENGTH characters once
+  surrounding whitespace and quotation marks are removed
+- "author" is a string of at most MAX_AUTHOR_LENGTH characters, or missing
+- "language", if given as the code of another defined language, matches
+  the requested one
+- at least MIN_SCRIPT_SHARE of the text's letters are in the requested
+  language's script (e.g. the Thai block for Thai), if its definition
+  lists one
+
+Invalid responses raise InvalidQuote, whose reason labels the rejection in
+metrics; the caller generates a new quote instead of sending it.
+"""
+from typing import Any, Optional
+
+from bot.languages import Language, get_language_registry
+from bot.quote import Quote
+from bot.stream_parser import extract_object
+
+# Length limits of a quote's text and author, in characters
+MIN_TEXT_LENGTH = 8
+MAX_TEXT_LENGTH = 300
+MAX_AUTHOR_LENGTH = 80
+
+# Share of the text's letters that must be in the requested language's script
+MIN_SCRIPT_SHARE = 0.7
+
+# Author of AI quotes that name none
+DEFAULT_AUTHOR = 'Claude AI'
+
+# Quotation marks stripped from around the text
+QUOTATION_MARKS = "\"'“”‘’«»„"
+
+
+class InvalidQuote(ValueError):
+    """An AI response that is not a valid quote."""
+
+    def __init__(self, reason: str, message: str):
+        """Initialize the error.
+
+        Args:
+            reason: Short label of the check that failed, e.g. 'too_long'
+            message: Description for logs
+        """
+        super().__init__(message)
+        self.reason = reason
+
+
+def _string(data: dict, field: str) -> Optional[str]:
+    """Get a string field of a quote object, stripped.
+
+    Args:
+        data: Parsed JSON object
+        field: Field name
+
+    Returns:
+        The stripped value, or None if the field is missing, null or empty
+
+    Raises:
+        InvalidQuote: If the field is not a string
+    """
+    value: Any = data.get(field)
+    if value is None:
+        return None
+    if not isinstance(value, str):
+        raise InvalidQuote(f'bad_{field}', f"'{field}' is a {type(value).__name__}, not a string")
+    return value.strip() or None
+
+
+def validate_quote(data: dict, language: Language) -> Quote:
+    """Check a parsed AI quote object against the schema.
+
+    Args:
+        data: Parsed JSON object
+        language: Language the quote was requested in
+
+    Returns:
+        Quote with source 'ai' in the requested language
+
+    Raises:
+        InvalidQuote: If the object breaks a rule of the schema
+    """
+    text = _string(data, 'text')
+    if text is None:
+        raise InvalidQuote('missing_text', "the object has no 'text'")
+    text = text.strip(QUOTATION_MARKS).strip()
+    if len(text) < MIN_TEXT_LENGTH:
+        raise InvalidQuote('too_short', f"text is {len(text)} characters, below {MIN_TEXT_LENGTH}")
+    if len(text) > MAX_TEXT_LENGTH:
+        raise InvalidQuote('too_long', f"text is {len(text)} characters, above {MAX_TEXT_LENGTH}")
+
+    author = _string(data, 'author') or DEFAULT_AUTHOR
+    if len(author) > MAX_AUTHOR_LENGTH:
+        raise InvalidQuote('too_long', f"author is {len(author)} characters, above {MAX_AUTHOR_LENGTH}")
+
+    claimed = _string(data, 'language')
+    if claimed and claimed != language.code and claimed in get_language_registry():
+        raise InvalidQuote('wrong_language', f"quote is marked '{claimed}', not '{language.code}'")
+    share = language.script_share(text)
+    if share < MIN_SCRIPT_SHARE:
+        raise InvalidQuote('wrong_language',
+                           f"only {share:.0%} of the text is in the '{language.code}' script")
+
+    return Quote(text, author, language.code, 'ai')
+
+
+def parse_quote_response(content: str, language: Language, data: Optional[dict] = None) -> Quote:
+    """Extract and validate the quote in an AI response.
+
+    Args:
+        content: Response text
+        language: Language the quote was requested in
+        data: Object already extracted from the text (e.g. while streaming)
+
+    Returns:
+        Quote with source 'ai'
+
+    Raises:
+        InvalidQuote: If the response holds no JSON object or an invalid one
+    """
+    if data is None:
+        data = extract_object(content)
+    if data is None:
+        raise InvalidQuote('no_json', "the response has no complete JSON object")
+    return validate_quote(data, language)
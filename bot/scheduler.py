@@ -1,17 +1,22 @@
 """Scheduler module for sending daily quotes at scheduled times."""
 import logging
-import random
-from datetime import datetime, time
-from pathlib import Path
-from typing import Optional
+from datetime import datetime, time, timedelta
+from typing import List, Optional, Tuple
 
+from apscheduler.events import EVENT_JOB_EXECUTED, EVENT_JOB_SUBMITTED
 from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.date import DateTrigger
 
 from config.settings import config
+from bot.dispatcher import get_dispatcher
+from bot import tracing
+from bot.job_state import MemoryJobStateStore, get_job_state_store
+from bot.metrics import SCHEDULER_LAG_SECONDS
+from bot.profiles import get_profile_store
 from bot.quote_generator import get_quote
 from bot.telegram_bot import send_quote_sync
+from bot.triggers import RandomWindowTrigger
 
 # Setup logging
 logging.basicConfig(
@@ -20,8 +25,19 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Scheduler configuration
-SCHEDULER_TIMEZONE = 'Asia/Bangkok'
+# Run a late job if it is at most this many seconds past its slot
+# (e.g. after a short pause), merging multiple missed runs into one
+JOB_DEFAULTS = {
+    'coalesce': True,
+    'misfire_grace_time': 15 * 60,
+}
+
+# Catch-up of slots missed while the process was down:
+# only slots newer than CATCHUP_MAX_AGE are replayed, at most
+# CATCHUP_MAX_SENDS of them, spaced CATCHUP_INTERVAL_SECONDS apart
+CATCHUP_MAX_AGE = timedelta(hours=12)
+CATCHUP_MAX_SENDS = 8
+CATCHUP_INTERVAL_SECONDS = 30
 
 # Job IDs and names
 JOBS = {
@@ -29,8 +45,12 @@ JOBS = {
     'evening': {'id': 'evening_quote', 'name': 'Evening Quote'}
 }
 
+# Once-a-minute job driving all per-subscriber sends (see bot.dispatcher);
+# it catches up on its own, so its runs are not tracked for replay
+SUBSCRIBER_TICK_JOB = {'id': 'subscriber_tick', 'name': 'Subscriber Dispatch'}
+
 
-# Standalone function for scheduled jobs (must be at module level for pickle)
+# Standalone function for scheduled jobs (module level so jobs stay serializable)
 def send_scheduled_quote(time_period: str = "unknown"):
     """Send a scheduled quote (standalone function for pickle compatibility).
 
@@ -39,8 +59,13 @@ def send_scheduled_quote(time_period: str = "unknown"):
     """
     logger.info(f"Sending scheduled {time_period} quote...")
 
-    quote = get_quote(language=config.quote_language)
-    success = send_quote_sync(quote, time_period=time_period)
+    with tracing.span('send_scheduled_quote', time_period=time_period) as span:
+        profile = get_profile_store().get(config.telegram_chat_id)
+        quote = get_quote(language=profile.quote_language, time_period=time_period,
+                          topics=profile.topics)
+        success = send_quote_sync(quote, time_period=time_period)
+        if span:
+            span.set_attribute('success', success)
 
     if success:
         logger.info(f"Successfully sent {time_period} quote")
@@ -51,23 +76,56 @@ def send_scheduled_quote(time_period: str = "unknown"):
 class QuoteScheduler:
     """Scheduler for sending daily quotes."""
 
-    def __init__(self, stats_dir: Optional[Path] = None):
+    def __init__(self, state_store: Optional[MemoryJobStateStore] = None):
         """Initialize the scheduler.
 
+        Jobs live in APScheduler's in-memory store because setup_schedule()
+        recreates them on every start; only last-fired times are persisted.
+
         Args:
-            stats_dir: Directory for scheduler database (defaults to data directory)
+            state_store: Job state backend (defaults to the configured backend)
         """
-        db_dir = stats_dir or config.stats_file.parent
-        job_stores = {
-            'default': SQLAlchemyJobStore(url=f'sqlite:///{db_dir}/scheduler.sqlite')
-        }
+        self.state_store = state_store or get_job_state_store(
+            config.scheduler_state_backend, config.scheduler_state_file
+        )
 
         self.scheduler = BackgroundScheduler(
-            jobstores=job_stores,
-            timezone=SCHEDULER_TIMEZONE
+            job_defaults=JOB_DEFAULTS,
+            timezone=config.timezone
         )
+        # Catch-up job ID -> (original job ID, missed slot it replays)
+        self._catchup_jobs = {}
+
+        self.scheduler.add_listener(self._on_job_executed, EVENT_JOB_EXECUTED)
+        self.scheduler.add_listener(self._on_job_submitted, EVENT_JOB_SUBMITTED)
         self.scheduler.start()
 
+    def _on_job_submitted(self, event):
+        """Record how late a job was handed to the executor.
+
+        Args:
+            event: APScheduler job submission event
+        """
+        now = datetime.now(self.scheduler.timezone)
+        for run_time in event.scheduled_run_times:
+            SCHEDULER_LAG_SECONDS.observe(max((now - run_time).total_seconds(), 0.0))
+
+    def _on_job_executed(self, event):
+        """Record the slot a job fired for in the state store.
+
+        Args:
+            event: APScheduler job execution event
+        """
+        if event.job_id == SUBSCRIBER_TICK_JOB['id']:
+            return
+
+        job_id, fired_at = self._catchup_jobs.pop(
+            event.job_id, (event.job_id, event.scheduled_run_time)
+        )
+        last_fired = self.state_store.get_last_fired(job_id)
+        if last_fired is None or fired_at > last_fired:
+            self.state_store.set_last_fired(job_id, fired_at)
+
     @staticmethod
     def _parse_time(time_str: str) -> time:
         """Parse time string (HH:MM) to time object.
@@ -81,27 +139,22 @@ class QuoteScheduler:
         hour, minute = map(int, time_str.split(':'))
         return time(hour=hour, minute=minute)
 
-    @staticmethod
-    def _get_random_time_in_window(start_str: str, end_str: str) -> time:
-        """Get a random time within a time window.
+    def _make_window_trigger(self, job_id: str, start: time, end: time) -> RandomWindowTrigger:
+        """Create a trigger firing at a fresh random time in a window each day.
 
         Args:
-            start_str: Start time in HH:MM format
-            end_str: End time in HH:MM format
+            job_id: Job identifier (mixed into the seed so jobs differ)
+            start: Window start time
+            end: Window end time
 
         Returns:
-            datetime.time object with random time
+            RandomWindowTrigger in the scheduler timezone
         """
-        start_time = QuoteScheduler._parse_time(start_str)
-        end_time = QuoteScheduler._parse_time(end_str)
-
-        # Convert to minutes since midnight
-        start_minutes = start_time.hour * 60 + start_time.minute
-        end_minutes = end_time.hour * 60 + end_time.minute
-
-        # Get random minute in range and convert back to time
-        random_minutes = random.randint(start_minutes, end_minutes)
-        return time(hour=random_minutes // 60, minute=random_minutes % 60)
+        return RandomWindowTrigger(
+            start, end,
+            timezone=self.scheduler.timezone,
+            seed=f"{config.schedule_seed}:{job_id}"
+        )
 
     def _remove_job(self, job_id: str):
         """Remove a job if it exists.
@@ -124,43 +177,42 @@ class QuoteScheduler:
             start_time: Start time in HH:MM format
             end_time: End time in HH:MM format
         """
-        random_time = self._get_random_time_in_window(start_time, end_time)
         job_info = JOBS[period]
+        trigger = self._make_window_trigger(
+            job_info['id'], self._parse_time(start_time), self._parse_time(end_time)
+        )
 
-        logger.info(f"Scheduling {period} quote at {random_time}")
-
-        self.scheduler.add_job(
+        job = self.scheduler.add_job(
             send_scheduled_quote,
-            trigger=CronTrigger(hour=random_time.hour, minute=random_time.minute),
+            trigger=trigger,
             args=[period],
             id=job_info['id'],
             name=job_info['name'],
             replace_existing=True
         )
+        logger.info(f"Scheduled {period} quote, next at {job.next_run_time}")
 
     def setup_schedule(self):
         """Setup the schedule based on configuration."""
         # Remove all existing jobs
         for job_info in JOBS.values():
             self._remove_job(job_info['id'])
+        self._remove_job(SUBSCRIBER_TICK_JOB['id'])
 
         # Support for 'daily' mode: 8 quotes per day (7:00-19:00)
         if config.schedule_window == 'daily':
             self._setup_daily_schedule(8, '07:00', '19:00')
         # Support for 'random' mode: random time once per day
         elif config.schedule_window == 'random':
-            import random
-            random_hour = random.randint(7, 19)
-            random_time = time(hour=random_hour, minute=random.randint(0, 59))
-            self.scheduler.add_job(
+            job = self.scheduler.add_job(
                 send_scheduled_quote,
-                trigger=CronTrigger(hour=random_time.hour, minute=random_time.minute),
+                trigger=self._make_window_trigger('random_quote', time(7, 0), time(19, 59)),
                 args=['random'],
                 id='random_quote',
                 name='Random Daily Quote',
                 replace_existing=True
             )
-            logger.info(f"Random daily quote scheduled at {random_time}")
+            logger.info(f"Random daily quote scheduled, next at {job.next_run_time}")
         # Original modes: morning, evening, both
         else:
             if config.schedule_window in ('morning', 'both'):
@@ -169,8 +221,25 @@ class QuoteScheduler:
             if config.schedule_window in ('evening', 'both'):
                 self._schedule_quote('evening', config.evening_start, config.evening_end)
 
+        self.setup_subscriber_tick()
+
         logger.info(f"Schedule setup complete: {config.schedule_window}")
 
+    def setup_subscriber_tick(self):
+        """Add the once-a-minute subscriber dispatch job if anyone is subscribed."""
+        dispatcher = get_dispatcher()
+        if not len(dispatcher.store):
+            return
+
+        self.scheduler.add_job(
+            dispatcher.tick,
+            trigger=CronTrigger(second=0, timezone=self.scheduler.timezone),
+            id=SUBSCRIBER_TICK_JOB['id'],
+            name=SUBSCRIBER_TICK_JOB['name'],
+            replace_existing=True
+        )
+        logger.info(f"Subscriber dispatch enabled for {len(dispatcher.store)} subscriber(s)")
+
     def _setup_daily_schedule(self, times_per_day: int, start_time: str, end_time: str):
         """Setup multiple daily quotes spread throughout the day.
 
@@ -191,27 +260,104 @@ class QuoteScheduler:
             # Calculate base time for this slot
             base_minutes = (start.hour * 60 + start.minute) + (interval * (i + 1))
 
-            # Add randomness: +/- 15 minutes from base time
-            random_offset = random.randint(-15, 15)
-            slot_minutes = base_minutes + random_offset
-
-            # Convert to time object
-            slot_hour = (slot_minutes // 60) % 24
-            slot_minute = slot_minutes % 60
+            # Add randomness: +/- 15 minutes from base time, re-drawn daily
+            slot_start = base_minutes - 15
+            slot_end = base_minutes + 15
 
             # Create job
             job_id = f'daily_quote_{i + 1}'
             job_name = f'Daily Quote #{i + 1}'
 
-            self.scheduler.add_job(
+            job = self.scheduler.add_job(
                 send_scheduled_quote,
-                trigger=CronTrigger(hour=slot_hour, minute=slot_minute),
+                trigger=self._make_window_trigger(
+                    job_id,
+                    time(hour=slot_start // 60, minute=slot_start % 60),
+                    time(hour=slot_end // 60, minute=slot_end % 60)
+                ),
                 args=['daily'],
                 id=job_id,
                 name=job_name,
                 replace_existing=True
             )
-            logger.info(f"Scheduled {job_name} at {slot_hour:02d}:{slot_minute:02d}")
+            logger.info(f"Scheduled {job_name}, next at {job.next_run_time}")
+
+    def find_missed_runs(self, now: Optional[datetime] = None) -> List[Tuple[str, datetime]]:
+        """Find slots that should have fired since each job last fired.
+
+        Jobs that never fired are ignored, and slots older than
+        CATCHUP_MAX_AGE are not considered.
+
+        Args:
+            now: Current time (defaults to the scheduler clock)
+
+        Returns:
+            List of (job ID, missed slot) tuples, oldest first
+        """
+        now = now or datetime.now(self.scheduler.timezone)
+        cutoff = now - CATCHUP_MAX_AGE
+        missed = []
+
+        for job in self.scheduler.get_jobs():
+            last_fired = self.state_store.get_last_fired(job.id)
+            if last_fired is None:
+                continue
+
+            start = max(last_fired, cutoff)
+            fire_time = job.trigger.get_next_fire_time(start, start)
+            while fire_time and fire_time < now:
+                missed.append((job.id, fire_time))
+                fire_time = job.trigger.get_next_fire_time(fire_time, fire_time)
+
+        return sorted(missed, key=lambda item: item[1])
+
+    def replay_missed_runs(self, policy: Optional[str] = None,
+                           now: Optional[datetime] = None) -> List[Tuple[str, datetime]]:
+        """Replay slots missed during downtime as a rate-limited batch.
+
+        Args:
+            policy: 'coalesce' (one send per job), 'all' (every missed slot)
+                or 'skip' (mark missed slots as handled without sending);
+                defaults to the configured policy
+            now: Current time (defaults to the scheduler clock)
+
+        Returns:
+            List of (job ID, missed slot) tuples scheduled for replay
+        """
+        policy = policy or config.catchup_policy
+        now = now or datetime.now(self.scheduler.timezone)
+        missed = self.find_missed_runs(now)
+
+        if not missed:
+            return []
+
+        if policy == 'skip':
+            for job_id, slot in missed:
+                self.state_store.set_last_fired(job_id, slot)
+            logger.info(f"Skipped {len(missed)} missed run(s)")
+            return []
+
+        if policy == 'coalesce':
+            latest = {job_id: slot for job_id, slot in missed}
+            missed = sorted(latest.items(), key=lambda item: item[1])
+
+        replay = missed[-CATCHUP_MAX_SENDS:]
+        for index, (job_id, slot) in enumerate(replay):
+            job = self.scheduler.get_job(job_id)
+            catchup_id = f"{job_id}_catchup_{index + 1}"
+            self._catchup_jobs[catchup_id] = (job_id, slot)
+
+            self.scheduler.add_job(
+                send_scheduled_quote,
+                trigger=DateTrigger(now + timedelta(seconds=index * CATCHUP_INTERVAL_SECONDS)),
+                args=job.args,
+                id=catchup_id,
+                name=f"{job.name} (catch-up)",
+                replace_existing=True
+            )
+            logger.info(f"Replaying missed {job.name} from {slot}")
+
+        return replay
 
     def get_next_run_time(self, job_id: str) -> Optional[datetime]:
         """Get the next run time for a job.
@@ -235,15 +381,36 @@ class QuoteScheduler:
             List of dictionaries with job information
         """
         jobs = self.scheduler.get_jobs()
+        last_fired = self.state_store.all_last_fired()
         return [
             {
                 'id': job.id,
                 'name': job.name,
-                'next_run_time': job.next_run_time.isoformat() if job.next_run_time else None
+                'next_run_time': job.next_run_time.isoformat() if job.next_run_time else None,
+                'last_fired': last_fired[job.id].isoformat() if job.id in last_fired else None
             }
             for job in jobs
         ]
 
+    def list_upcoming_sends(self, offset: int = 0, limit: int = 20):
+        """List a page of upcoming per-subscriber sends.
+
+        Args:
+            offset: Number of entries to skip
+            limit: Maximum number of entries to return
+
+        Returns:
+            List of dictionaries in the same shape as list_jobs()
+        """
+        return [
+            {
+                'id': f"subscriber_{chat_id}",
+                'name': f"Subscriber {chat_id}",
+                'next_run_time': send_at.isoformat()
+            }
+            for chat_id, send_at in get_dispatcher().upcoming(offset, limit)
+        ]
+
     def shutdown(self):
         """Shutdown the scheduler."""
         self.scheduler.shutdown()
@@ -259,9 +426,16 @@ def get_scheduler() -> QuoteScheduler:
     if _scheduler is None:
         _scheduler = QuoteScheduler()
         _scheduler.setup_schedule()
+        _scheduler.replay_missed_runs()
     return _scheduler
 
 
+def ensure_subscriber_tick():
+    """Enable subscriber dispatch on the running scheduler, if this process has one."""
+    if _scheduler is not None and _scheduler.scheduler.get_job(SUBSCRIBER_TICK_JOB['id']) is None:
+        _scheduler.setup_subscriber_tick()
+
+
 if __name__ == "__main__":
     import time as time_module
 
@@ -0,0 +1,128 @@
+"""Persistent index of each subscriber's next send time.
+
+Backed by a single SQLite table with an index on the send time, so the
+dispatcher can fetch everyone due with one range query and callers such as
+the dashboard can page through upcoming sends without loading them all.
+"""
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Tuple, Union
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS next_send (
+    chat_id TEXT PRIMARY KEY,
+    send_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_next_send_send_at ON next_send (send_at);
+"""
+
+
+def _from_timestamp(timestamp: float) -> datetime:
+    """Convert a UTC timestamp to an aware UTC datetime."""
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc)
+
+
+class NextSendIndex:
+    """Sorted index of (send time, chat ID) entries, one per subscriber."""
+
+    def __init__(self, index_file: Union[Path, str] = ":memory:"):
+        """Open (and create if needed) the index.
+
+        Args:
+            index_file: Path to the SQLite file, or ':memory:' for a
+                non-persistent index
+        """
+        self.index_file = index_file
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(index_file), check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+
+    def set(self, chat_id: str, send_at: datetime):
+        """Insert or move a subscriber's next send time.
+
+        Args:
+            chat_id: Telegram chat ID
+            send_at: Timezone-aware next send time
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO next_send (chat_id, send_at) VALUES (?, ?) "
+                "ON CONFLICT(chat_id) DO UPDATE SET send_at = excluded.send_at",
+                (chat_id, send_at.timestamp())
+            )
+
+    def set_many(self, entries: List[Tuple[str, datetime]]):
+        """Insert or move several subscribers' next send times in one transaction.
+
+        Args:
+            entries: List of (chat ID, next send time) tuples
+        """
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO next_send (chat_id, send_at) VALUES (?, ?) "
+                "ON CONFLICT(chat_id) DO UPDATE SET send_at = excluded.send_at",
+                [(chat_id, send_at.timestamp()) for chat_id, send_at in entries]
+            )
+
+    def remove(self, chat_id: str):
+        """Remove a subscriber from the index.
+
+        Args:
+            chat_id: Telegram chat ID
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM next_send WHERE chat_id = ?", (chat_id,))
+
+    def pop_due(self, now: datetime) -> List[Tuple[str, datetime]]:
+        """Remove and return every entry due at or before now.
+
+        Args:
+            now: Current time
+
+        Returns:
+            List of (chat ID, send time) tuples, earliest first
+        """
+        cutoff = now.timestamp()
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "SELECT chat_id, send_at FROM next_send WHERE send_at <= ? ORDER BY send_at",
+                (cutoff,)
+            ).fetchall()
+            self._conn.execute("DELETE FROM next_send WHERE send_at <= ?", (cutoff,))
+        return [(chat_id, _from_timestamp(send_at)) for chat_id, send_at in rows]
+
+    def page(self, offset: int = 0, limit: int = 20) -> List[Tuple[str, datetime]]:
+        """Get a page of upcoming sends in time order.
+
+        Args:
+            offset: Number of entries to skip
+            limit: Maximum number of entries to return
+
+        Returns:
+            List of (chat ID, send time) tuples
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT chat_id, send_at FROM next_send ORDER BY send_at LIMIT ? OFFSET ?",
+                (limit, offset)
+            ).fetchall()
+        return [(chat_id, _from_timestamp(send_at)) for chat_id, send_at in rows]
+
+    def chat_ids(self) -> List[str]:
+        """Get the chat IDs of all indexed subscribers.
+
+        Returns:
+            List of chat IDs
+        """
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT chat_id FROM next_send")]
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM next_send").fetchone()[0]
+
+    def close(self):
+        """Close the underlying database connection."""
+        self._conn.close()
@@ -0,0 +1,177 @@
+"""Adaptive choice between AI-generated and local quotes.
+
+The share of quotes generated with AI starts from a base rate and is scaled
+by what the API has recently been doing:
+
+- latency: once the smoothed generation latency exceeds the target, the
+  share shrinks in proportion, so a slow API stops holding up sends;
+- errors: the share shrinks as the smoothed error rate rises;
+- local pool: a small local pool for the language raises the share so
+  quotes do not repeat too often;
+- budget: the share tapers off over the last part of the daily token budget
+  and drops to zero once it is spent. Usage is kept in a TokenUsageStore
+  (see bot/token_usage.py), so the budget is shared by every process using
+  the same file and survives restarts.
+
+Outside an exhausted budget a small probe share is always kept, so latency
+and error estimates recover once the API does.
+"""
+import random
+import threading
+from datetime import date, datetime
+from typing import Callable, Optional
+from zoneinfo import ZoneInfo
+
+from bot.metrics import AI_SHARE, AI_TOKENS
+from bot.token_usage import TokenUsageStore
+
+# Share of quotes generated with AI when the API is healthy
+BASE_AI_SHARE = 0.3
+
+# Bounds of the adapted share (the minimum keeps probing a degraded API)
+MIN_AI_SHARE = 0.02
+MAX_AI_SHARE = 0.8
+
+# Generation latency above which the AI share is reduced
+LATENCY_TARGET_SECONDS = 5.0
+
+# Smoothed error rate at which the AI share reaches the minimum
+MAX_ERROR_RATE = 0.5
+
+# Local pools smaller than this raise the AI share
+SMALL_POOL_SIZE = 50
+
+# Fraction of the daily token budget after which the share tapers off
+BUDGET_TAPER_START = 0.8
+
+# Weight of the newest observation in the moving averages
+EWMA_ALPHA = 0.2
+
+
+class SourcePolicy:
+    """Track AI generation health and usage, and decide when to use AI."""
+
+    def __init__(self, daily_token_budget: int = 0, timezone: str = "UTC",
+                 today: Optional[Callable[[], date]] = None,
+                 usage: Optional[TokenUsageStore] = None):
+        """Initialize the policy.
+
+        Args:
+            daily_token_budget: Input plus output tokens allowed per day (0 for unlimited)
+            timezone: Timezone the budget day is counted in
+            today: Function returning the current date (for testing)
+            usage: Store of the tokens used per day (in memory if omitted)
+        """
+        self.daily_token_budget = daily_token_budget
+        self._today = today or (lambda: datetime.now(ZoneInfo(timezone)).date())
+        self._lock = threading.Lock()
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.usage = usage if usage is not None else TokenUsageStore()
+
+    @property
+    def tokens_used(self) -> int:
+        """Tokens used today by every process sharing the usage store."""
+        return self.usage.used(self._today())
+
+    def _smooth(self, latency: float, failed: bool):
+        """Fold an observation into the moving averages (lock held)."""
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += EWMA_ALPHA * (latency - self.latency)
+        self.error_rate += EWMA_ALPHA * ((1.0 if failed else 0.0) - self.error_rate)
+
+    def record_success(self, latency: float, input_tokens: int = 0, output_tokens: int = 0):
+        """Record a successful AI generation.
+
+        Args:
+            latency: Seconds the API call took
+            input_tokens: Input tokens reported in the response usage
+            output_tokens: Output tokens reported in the response usage
+        """
+        with self._lock:
+            self._smooth(latency, failed=False)
+        if input_tokens + output_tokens:
+            self.usage.add(self._today(), input_tokens + output_tokens)
+        AI_TOKENS.labels('input').inc(input_tokens)
+        AI_TOKENS.labels('output').inc(output_tokens)
+
+    def record_failure(self, latency: float):
+        """Record a failed AI generation.
+
+        Args:
+            latency: Seconds spent before the call failed
+        """
+        with self._lock:
+            self._smooth(latency, failed=True)
+
+    def budget_exhausted(self) -> bool:
+        """Check whether today's token budget is spent.
+
+        Returns:
+            True if a budget is set and the tokens used reach it
+        """
+        return bool(self.daily_token_budget) and self.tokens_used >= self.daily_token_budget
+
+    def ai_share(self, pool_size: Optional[int] = None) -> float:
+        """Compute the current probability of choosing AI.
+
+        Args:
+            pool_size: Number of local quotes available for the language
+                (None if unknown)
+
+        Returns:
+            Probability between 0 and MAX_AI_SHARE
+        """
+        with self._lock:
+            latency, error_rate = self.latency, self.error_rate
+
+        budget_factor = 1.0
+        if self.daily_token_budget:
+            used = self.tokens_used / self.daily_token_budget
+            if used >= 1.0:
+                AI_SHARE.set(0.0)
+                return 0.0
+            if used > BUDGET_TAPER_START:
+                budget_factor = (1.0 - used) / (1.0 - BUDGET_TAPER_START)
+
+        share = BASE_AI_SHARE
+        if pool_size is not None and pool_size < SMALL_POOL_SIZE:
+            share += (MAX_AI_SHARE - share) * (1.0 - pool_size / SMALL_POOL_SIZE)
+        if latency is not None and latency > LATENCY_TARGET_SECONDS:
+            share *= LATENCY_TARGET_SECONDS / latency
+        share *= max(0.0, 1.0 - error_rate / MAX_ERROR_RATE)
+
+        share = min(MAX_AI_SHARE, max(MIN_AI_SHARE, share)) * budget_factor
+        AI_SHARE.set(share)
+        return share
+
+    def choose_ai(self, pool_size: Optional[int] = None, rng: random.Random = random) -> bool:
+        """Decide whether the next quote should be AI-generated.
+
+        Args:
+            pool_size: Number of local quotes available for the language
+            rng: Random source
+
+        Returns:
+            True to generate with AI, False to use a local quote
+        """
+        return rng.random() < self.ai_share(pool_size)
+
+    def snapshot(self) -> dict:
+        """Get the current policy state for monitoring.
+
+        Returns:
+            Dictionary with latency, error rate, token usage, and budget
+        """
+        today = self._today()
+        tokens_used = self.usage.used(today)
+        with self._lock:
+            return {
+                'latency': self.latency,
+                'error_rate': self.error_rate,
+                'tokens_used': tokens_used,
+                'daily_token_budget': self.daily_token_budget,
+                'budget_day': today.isoformat(),
+            }
@@ -0,0 +1,113 @@
+"""Incremental extraction of a JSON quote object from AI text.
+
+Claude's reply arrives as text deltas. QuoteStreamParser scans each delta
+once, tracking brace depth outside of JSON strings, and reports the first
+complete top-level object as soon as its closing brace arrives, so the
+caller can stop the stream instead of waiting for (and paying for) closing
+code fences or trailing commentary.
+
+The object can be anywhere in the text: after prose, inside a code fence,
+or as the first element of a JSON array. Candidates that are not valid
+JSON (e.g. "{text: draft}") are skipped and the scan continues after them.
+extract_object() finds the same object in a complete response.
+"""
+import json
+from typing import List, Optional
+
+# Decoder for the fast path of extract_object()
+_DECODER = json.JSONDecoder()
+
+
+class QuoteStreamParser:
+    """Find the first complete JSON object in text fed piece by piece."""
+
+    def __init__(self):
+        """Initialize an empty parser."""
+        self._chunks: List[str] = []
+        self._object: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self.result: Optional[dict] = None
+
+    @property
+    def text(self) -> str:
+        """All text fed so far."""
+        return "".join(self._chunks)
+
+    def feed(self, chunk: str) -> Optional[dict]:
+        """Consume a text delta.
+
+        Args:
+            chunk: Next piece of streamed text
+
+        Returns:
+            The parsed object once it is complete, otherwise None
+        """
+        self._chunks.append(chunk)
+        if self.result is not None:
+            return self.result
+
+        start = 0
+        for i, ch in enumerate(chunk):
+            if self._depth == 0:
+                if ch == '{':
+                    self._depth = 1
+                    start = i
+                continue
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == '\\':
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == '{':
+                self._depth += 1
+            elif ch == '}':
+                self._depth -= 1
+                if self._depth == 0:
+                    self._object.append(chunk[start:i + 1])
+                    candidate = "".join(self._object)
+                    self._object = []
+                    try:
+                        data = json.loads(candidate)
+                    except json.JSONDecodeError:
+                        # Not valid JSON after all; keep looking for the next object
+                        continue
+                    if isinstance(data, dict):
+                        self.result = data
+                        return data
+
+        if self._depth > 0:
+            self._object.append(chunk[start:])
+        return None
+
+
+def extract_object(text: str) -> Optional[dict]:
+    """Find the first complete JSON object in a complete response.
+
+    Usually the first '{' starts the quote object, and decoding it directly
+    in C is several times faster than scanning the text character by
+    character. Only if that fails is the text scanned, which gives the same
+    result the stream parser would.
+
+    Args:
+        text: Response text, possibly with prose or code fences around the object
+
+    Returns:
+        The parsed object, or None if the text contains no valid JSON object
+    """
+    start = text.find('{')
+    if start < 0:
+        return None
+    try:
+        data, _ = _DECODER.raw_decode(text, start)
+    except json.JSONDecodeError:
+        data = None
+    if isinstance(data, dict):
+        return data
+    return QuoteStreamParser().feed(text[start:])
@@ -0,0 +1,177 @@
+"""Subscriber model and persistent subscriber store."""
+import json
+import logging
+import os
+import threading
+from dataclasses import asdict, dataclass
+from datetime import time
+from pathlib import Path
+from typing import Dict, List, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from config.settings import (
+    DEFAULT_MORNING_END,
+    DEFAULT_MORNING_START,
+    DEFAULT_TIMEZONE,
+    config,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Subscriber:
+    """A chat receiving one quote per day within its own local window."""
+
+    chat_id: str
+    timezone: str = DEFAULT_TIMEZONE
+    window_start: str = DEFAULT_MORNING_START
+    window_end: str = DEFAULT_MORNING_END
+    language: str = "both"
+
+    def __post_init__(self):
+        """Validate subscriber settings after initialization."""
+        self.chat_id = str(self.chat_id)
+        self._validate_timezone()
+        self._validate_window()
+        self._validate_language()
+
+    def _validate_timezone(self):
+        """Validate timezone is a known IANA timezone name."""
+        try:
+            ZoneInfo(self.timezone)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError(f"Unknown timezone '{self.timezone}'")
+
+    def _validate_window(self):
+        """Validate the send window is HH:MM-HH:MM within one day."""
+        try:
+            start = time.fromisoformat(self.window_start)
+            end = time.fromisoformat(self.window_end)
+        except ValueError:
+            start = end = None
+
+        if start is None or start > end:
+            raise ValueError(f"Invalid window '{self.window_start}-{self.window_end}'")
+
+    def _validate_language(self):
+        """Validate language is a valid value."""
+        if self.language not in config.language_choices:
+            raise ValueError(
+                f"Language must be one of {config.language_choices}, got '{self.language}'"
+            )
+
+
+class SubscriberStore:
+    """Keep subscribers in memory and mirror them to a JSON file."""
+
+    def __init__(self, subscribers_file: Optional[Path] = None):
+        """Initialize the store, loading any existing subscribers file.
+
+        Args:
+            subscribers_file: Path to subscribers JSON file
+        """
+        self.subscribers_file = subscribers_file or config.subscribers_file
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._subscribers = self._load()
+
+    def _load(self) -> Dict[str, Subscriber]:
+        """Load subscribers from file.
+
+        Returns:
+            Dictionary mapping chat ID to subscriber
+        """
+        if not self.subscribers_file.exists():
+            return {}
+
+        self._mtime = self.subscribers_file.stat().st_mtime_ns
+        with open(self.subscribers_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        subscribers = {}
+        for entry in data.get('subscribers', []):
+            try:
+                subscriber = Subscriber(**entry)
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Skipping invalid subscriber {entry}: {e}")
+                continue
+            subscribers[subscriber.chat_id] = subscriber
+        return subscribers
+
+    def _save(self):
+        """Write subscribers atomically to file."""
+        data = {'subscribers': [asdict(s) for s in self._subscribers.values()]}
+        tmp_file = self.subscribers_file.with_suffix(self.subscribers_file.suffix + '.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, self.subscribers_file)
+        self._mtime = self.subscribers_file.stat().st_mtime_ns
+
+    def reload_if_changed(self) -> Optional[List[Subscriber]]:
+        """Reload subscribers if the file was changed by another process.
+
+        Returns:
+            Subscribers that were added or whose settings changed, or None
+            if the file was not reloaded
+        """
+        try:
+            mtime = self.subscribers_file.stat().st_mtime_ns
+        except OSError:
+            return None
+
+        with self._lock:
+            if mtime == self._mtime:
+                return None
+            before, self._subscribers = self._subscribers, self._load()
+            return [s for chat_id, s in self._subscribers.items() if before.get(chat_id) != s]
+
+    def get(self, chat_id: str) -> Optional[Subscriber]:
+        """Get a subscriber by chat ID.
+
+        Args:
+            chat_id: Telegram chat ID
+
+        Returns:
+            Subscriber or None if not subscribed
+        """
+        with self._lock:
+            return self._subscribers.get(str(chat_id))
+
+    def all(self) -> List[Subscriber]:
+        """Get all subscribers.
+
+        Returns:
+            List of subscribers
+        """
+        with self._lock:
+            return list(self._subscribers.values())
+
+    def add(self, subscriber: Subscriber):
+        """Add or replace a subscriber.
+
+        Args:
+            subscriber: Subscriber to store
+        """
+        with self._lock:
+            self._subscribers[subscriber.chat_id] = subscriber
+            self._save()
+
+    def remove(self, chat_id: str) -> bool:
+        """Remove a subscriber.
+
+        Args:
+            chat_id: Telegram chat ID
+
+        Returns:
+            True if the subscriber existed, False otherwise
+        """
+        with self._lock:
+            if self._subscribers.pop(str(chat_id), None) is None:
+                return False
+            self._save()
+            return True
+
+    def __len__(self):
+        with self._lock:
+            return len(self._subscribers)
@@ -0,0 +1,250 @@
+"""Tag buckets and weighted quote selection with Walker's alias method.
+
+Quotes are grouped into buckets by (language, tag); the bucket with tag None
+holds every quote of the language, and language 'both' spans all languages.
+A weighted pick such as "three times as likely if tagged 'morning'" is a
+mixture of those buckets: the whole language bucket with weight 1 per quote
+plus each boosted tag's bucket with the extra weight per quote. An alias
+table over the mixture picks a bucket in O(1), and the quote within it is
+picked uniformly, so sampling never scans the quotes.
+
+Length tags ('short', 'medium', 'long') are derived from the text when a
+quote is indexed, so they do not need to be stored with the quote.
+"""
+import random
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from bot.quote import Quote
+
+# Upper bounds (in characters) of the derived length tags; longer is 'long'
+LENGTH_TAGS = (('short', 40), ('medium', 80))
+
+# Alias tables kept per sampler; per-chat topic weights make many combinations
+MAX_ALIAS_TABLES = 1024
+
+
+def length_tag(text: str) -> str:
+    """Get the derived length tag of a quote text.
+
+    Args:
+        text: Quote text
+
+    Returns:
+        'short', 'medium', or 'long'
+    """
+    for tag, limit in LENGTH_TAGS:
+        if len(text) <= limit:
+            return tag
+    return 'long'
+
+
+def index_tags(quote: Quote) -> Tuple[str, ...]:
+    """Get the tags a quote is indexed under: its own plus its length tag.
+
+    Args:
+        quote: Quote to index
+
+    Returns:
+        Sorted tuple of distinct tags
+    """
+    return tuple(sorted(set(quote.tags) | {length_tag(quote.text)}))
+
+
+class AliasSampler:
+    """Walker's alias method: O(1) sampling from a fixed discrete distribution.
+
+    Built in O(n) with Vose's algorithm. Each column holds the probability of
+    keeping its own outcome and the outcome to use otherwise.
+    """
+
+    __slots__ = ('_probability', '_alias')
+
+    def __init__(self, weights: Sequence[float]):
+        """Build the alias table.
+
+        Args:
+            weights: Non-negative weight of each outcome
+
+        Raises:
+            ValueError: If there are no weights, one is negative, or all are zero
+        """
+        count = len(weights)
+        total = float(sum(weights))
+        if not count or total <= 0 or min(weights) < 0:
+            raise ValueError("Alias sampler needs non-negative weights with a positive sum")
+
+        scaled = [weight * count / total for weight in weights]
+        self._probability = [1.0] * count
+        self._alias = list(range(count))
+        small = [i for i, weight in enumerate(scaled) if weight < 1.0]
+        large = [i for i, weight in enumerate(scaled) if weight >= 1.0]
+        while small and large:
+            low, high = small.pop(), large.pop()
+            self._probability[low] = scaled[low]
+            self._alias[low] = high
+            scaled[high] -= 1.0 - scaled[low]
+            (small if scaled[high] < 1.0 else large).append(high)
+        # Whatever is left is 1.0 up to rounding and keeps its own outcome
+
+    def __len__(self):
+        return len(self._probability)
+
+    def sample(self, rng: random.Random = random) -> int:
+        """Pick an outcome.
+
+        Args:
+            rng: Random source
+
+        Returns:
+            Index of the outcome
+        """
+        column = rng.randrange(len(self._probability))
+        return column if rng.random() < self._probability[column] else self._alias[column]
+
+
+class TagIndex:
+    """In-memory (language, tag) buckets of quotes, for quotes.json collections.
+
+    Implements the same count()/pick() interface as QuoteCorpus so either can
+    back a TagSampler.
+    """
+
+    def __init__(self, quotes: Iterable[Quote] = ()):
+        """Index quotes.
+
+        Args:
+            quotes: Quotes to index
+        """
+        self._buckets: Dict[Tuple[str, Optional[str]], List[Quote]] = {}
+        for quote in quotes:
+            self.add(quote)
+
+    def add(self, quote: Quote):
+        """Add a quote to its language and tag buckets.
+
+        Args:
+            quote: Quote to index
+        """
+        for language in (quote.language, 'both'):
+            self._buckets.setdefault((language, None), []).append(quote)
+            for tag in index_tags(quote):
+                self._buckets.setdefault((language, tag), []).append(quote)
+
+    @property
+    def tags(self) -> List[str]:
+        """Tags present in the index."""
+        return sorted({tag for language, tag in self._buckets if tag is not None})
+
+    def count(self, language: str = "both", tag: Optional[str] = None) -> int:
+        """Count the quotes in a bucket.
+
+        Args:
+            language: Language code, or 'both' for all quotes
+            tag: Tag, or None for every quote of the language
+
+        Returns:
+            Number of quotes
+        """
+        return len(self._buckets.get((language, tag), ()))
+
+    def pick(self, language: str, tag: Optional[str], position: int) -> Quote:
+        """Get a quote by its position in a bucket.
+
+        Args:
+            language: Language code, or 'both'
+            tag: Tag, or None
+            position: Position in the bucket (0 to count - 1)
+
+        Returns:
+            Quote
+        """
+        return self._buckets[(language, tag)][position]
+
+
+class TagSampler:
+    """Weighted quote selection over the buckets of a TagIndex or QuoteCorpus.
+
+    Alias tables are built on first use for each (language, weights) pair
+    and cached, up to MAX_ALIAS_TABLES (oldest dropped first). Call
+    invalidate() after adding quotes; only the tables of the affected
+    language (and 'both') are rebuilt, on their next use.
+    """
+
+    def __init__(self, source):
+        """Create a sampler.
+
+        Args:
+            source: Bucket source with count(language, tag) and
+                pick(language, tag, position), e.g. TagIndex or QuoteCorpus
+        """
+        self.source = source
+        self._tables: Dict[tuple, Tuple[AliasSampler, List[Tuple[Optional[str], int]]]] = {}
+
+    def sample(self, language: str = "both", weights: Optional[Mapping[str, float]] = None,
+               rng: random.Random = random) -> Quote:
+        """Pick a quote, favouring tagged quotes by the given weights.
+
+        A quote's weight is 1 plus (weight - 1) for each of its tags in
+        weights, so {'morning': 3} makes morning quotes three times as
+        likely as the rest. Weights below 1 are treated as 1.
+
+        Args:
+            language: Language code, or 'both' for any quote
+            weights: Weight per tag, or None for a uniform pick
+            rng: Random source
+
+        Returns:
+            Quote
+
+        Raises:
+            IndexError: If there are no quotes in the language
+        """
+        key = (language, tuple(sorted(weights.items())) if weights else ())
+        entry = self._tables.get(key)
+        if entry is None:
+            entry = self._build(language, key[1])
+            if len(self._tables) >= MAX_ALIAS_TABLES:
+                self._tables.pop(next(iter(self._tables)))
+            self._tables[key] = entry
+
+        table, buckets = entry
+        tag, size = buckets[table.sample(rng) if len(buckets) > 1 else 0]
+        return self.source.pick(language, tag, rng.randrange(size))
+
+    def _build(self, language: str, weights: Tuple[Tuple[str, float], ...]):
+        """Build the alias table over the buckets of a weighted pick.
+
+        Args:
+            language: Language code, or 'both'
+            weights: Sorted (tag, weight) pairs
+
+        Returns:
+            Tuple of (alias table, [(tag, bucket size), ...])
+
+        Raises:
+            IndexError: If there are no quotes in the language
+        """
+        size = self.source.count(language)
+        if not size:
+            raise IndexError(f"No quotes in language '{language}'")
+
+        buckets = [(None, size)]
+        bucket_weights = [float(size)]
+        for tag, weight in weights:
+            tagged = self.source.count(language, tag)
+            if tagged and weight > 1:
+                buckets.append((tag, tagged))
+                bucket_weights.append(tagged * (weight - 1))
+        return AliasSampler(bucket_weights), buckets
+
+    def invalidate(self, language: Optional[str] = None):
+        """Drop cached alias tables after the quotes changed.
+
+        Args:
+            language: Language whose quotes changed, or None for all
+        """
+        if language is None:
+            self._tables.clear()
+            return
+        for key in [key for key in self._tables if key[0] in (language, 'both')]:
+            del self._tables[key]
@@ -1,16 +1,45 @@
 """Telegram bot module for sending quotes and handling commands."""
 import json
 import logging
+import sqlite3
+import weakref
+from dataclasses import replace
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
 import asyncio
-from telegram import Update
-from telegram.ext import Application, CommandHandler, ContextTypes
+from telegram import Bot, InlineKeyboardButton, InlineKeyboardMarkup, Update
+from telegram.error import BadRequest, RetryAfter
+from telegram.ext import (
+    Application,
+    ApplicationBuilder,
+    CallbackQueryHandler,
+    CommandHandler,
+    ContextTypes,
+)
+from telegram.request import HTTPXRequest
 
 from config.settings import config
-from bot.quote_generator import get_quote
+from bot import tracing
+from bot.cards import card_key, get_card_store
+from bot.feedback import REACTIONS, get_feedback_store
+from bot.languages import get_language_registry
+from bot.markup import bold, escape, is_parse_error
+from bot.metrics import (
+    COMMAND_SECONDS,
+    MARKUP_FALLBACKS,
+    QUOTE_CARDS,
+    QUOTE_REACTIONS,
+    STATS_WRITE_SECONDS,
+    TELEGRAM_SEND_SECONDS,
+    TELEGRAM_SENDS,
+)
+from bot.payloads import PreparedSend
+from bot.profiles import get_profile_store
+from bot.quote import Quote
+from bot.quote_generator import get_quote, get_quote_generator
 
 # Setup logging
 logging.basicConfig(
@@ -19,6 +48,31 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Maximum in-flight sendMessage calls during a broadcast
+SEND_CONCURRENCY = 20
+
+# Retries of a send rejected with 429, and the longest retry_after honoured
+SEND_MAX_RETRIES = 2
+MAX_RETRY_AFTER_SECONDS = 30
+
+# Parse mode of quote messages; quote text is escaped for it (bot/markup.py)
+QUOTE_PARSE_MODE = 'MarkdownV2'
+
+# Quotes whose prepared send payloads are kept; a broadcast sends a handful
+# of distinct quotes to many chats
+PREPARED_QUOTES = 256
+
+# Card uploads in progress, by card key; other sends of the same card wait
+# for the upload and then reuse its file_id
+_card_uploads: Dict[str, '_CardUpload'] = {}
+
+# Shared Bot per event loop, with the (token, base URL) it was built for;
+# its connection pool is bound to the loop it sends on
+_bots: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+# Callback data of reaction buttons: "react:<reaction>:<quote key>"
+REACTION_CALLBACK_PREFIX = "react"
+
 # Default statistics structure
 DEFAULT_STATS = {
     'total_quotes_sent': 0,
@@ -86,39 +140,55 @@ class StatsManager:
         if stats['current_streak'] > stats['longest_streak']:
             stats['longest_streak'] = stats['current_streak']
 
-    def _create_history_entry(self, quote: dict, time_period: str, now: datetime) -> dict:
+    def _create_history_entry(self, quote: Quote, time_period: str, now: datetime) -> dict:
         """Create a history entry for a sent quote.
 
         Args:
-            quote: Quote dictionary
+            quote: Sent quote
             time_period: Time period identifier
             now: Current datetime
 
         Returns:
             History entry dictionary
         """
-        return {
+        entry = {
             'timestamp': now.isoformat(),
-            'text': quote.get('text', '')[:100],
-            'author': quote.get('author', 'Unknown'),
-            'language': quote.get('language', 'en'),
-            'source': quote.get('source', 'local'),
+            'text': quote.text[:100],
+            'author': quote.author,
+            'language': quote.language,
+            'source': quote.source,
             'time_period': time_period
         }
 
-    def record_quote(self, quote: dict, time_period: str = "unknown"):
+        # Link the entry to the trace that produced it, when tracing
+        trace_id = tracing.current_trace_id()
+        if trace_id:
+            entry['trace_id'] = trace_id
+        return entry
+
+    def record_quote(self, quote: Quote, time_period: str = "unknown"):
         """Record a sent quote.
 
         Args:
-            quote: Quote dictionary
+            quote: Sent quote
             time_period: 'morning', 'evening', or 'unknown'
         """
+        with STATS_WRITE_SECONDS.time(), tracing.span('stats.record', time_period=time_period):
+            self._record_quote(quote, time_period)
+
+    def _record_quote(self, quote: Quote, time_period: str):
+        """Update and save statistics for a sent quote.
+
+        Args:
+            quote: Sent quote
+            time_period: Time period identifier
+        """
         stats = self.load_stats()
         now = datetime.now()
 
         # Update counters
         stats['total_quotes_sent'] += 1
-        stats['ai_quotes_sent' if quote.get('source') == 'ai' else 'local_quotes_sent'] += 1
+        stats['ai_quotes_sent' if quote.source == 'ai' else 'local_quotes_sent'] += 1
 
         if time_period in ('morning', 'evening'):
             stats[f'{time_period}_quotes_sent'] += 1
@@ -142,68 +212,345 @@ stats_manager = StatsManager()
 # Helper functions
 
 
-def _format_quote_message(quote: dict) -> str:
+def _format_quote_message(quote: Quote, plain: bool = False) -> str:
     """Format a quote for Telegram message.
 
     Args:
-        quote: Quote dictionary with 'text' and 'author'
+        quote: Quote to format
+        plain: Format as plain text instead of QUOTE_PARSE_MODE markup
 
     Returns:
         Formatted message string
     """
-    return f"🌟 *{quote['text']}*\n\n— {quote['author']}"
+    if plain:
+        return f"🌟 {quote.text}\n\n— {quote.author}"
+    return f"🌟 {bold(quote.text, QUOTE_PARSE_MODE)}\n\n— {escape(quote.author, QUOTE_PARSE_MODE)}"
+
+
+def _parse_mode(plain: bool) -> Optional[str]:
+    """Get the parse mode of a quote message formatted with _format_quote_message."""
+    return None if plain else QUOTE_PARSE_MODE
+
+
+def _quote_keyboard(quote: Quote) -> InlineKeyboardMarkup:
+    """Build the reaction buttons shown under a quote.
+
+    Args:
+        quote: Quote being sent
+
+    Returns:
+        Inline keyboard with 👍 and 👎 buttons
+    """
+    return InlineKeyboardMarkup([[
+        InlineKeyboardButton(label, callback_data=f"{REACTION_CALLBACK_PREFIX}:{reaction}:{quote.key}")
+        for label, reaction in (("👍", "like"), ("👎", "dislike"))
+    ]])
+
+
+@lru_cache(maxsize=PREPARED_QUOTES)
+def _prepared_message(quote: Quote, plain: bool = False) -> PreparedSend:
+    """Get the sendMessage call for a quote, encoded once for all chats.
+
+    Args:
+        quote: Quote to send
+        plain: Send as plain text
+
+    Returns:
+        Prepared sendMessage call
+    """
+    return PreparedSend('sendMessage', text=_format_quote_message(quote, plain),
+                        parse_mode=_parse_mode(plain), reply_markup=_quote_keyboard(quote))
+
+
+@lru_cache(maxsize=PREPARED_QUOTES)
+def _prepared_card(quote: Quote, file_id: str, plain: bool = False) -> PreparedSend:
+    """Get the sendPhoto call re-sending a quote's uploaded card, encoded once for all chats.
+
+    Args:
+        quote: Quote on the card
+        file_id: Telegram file_id of the uploaded card
+        plain: Send the caption as plain text
+
+    Returns:
+        Prepared sendPhoto call
+    """
+    return PreparedSend('sendPhoto', photo=file_id, caption=_format_quote_message(quote, plain),
+                        parse_mode=_parse_mode(plain), reply_markup=_quote_keyboard(quote))
+
+
+def _application_builder() -> ApplicationBuilder:
+    """Create an Application builder for the configured token and API base URL.
+
+    Returns:
+        ApplicationBuilder ready to build()
+    """
+    return Application.builder().token(config.telegram_bot_token).base_url(config.telegram_base_url)
+
+
+def build_bot(settings=None) -> Bot:
+    """Create a Bot for the configured token and API base URL.
+
+    The connection pool is sized for SEND_CONCURRENCY; the library default
+    of one connection would serialize a broadcast, and concurrent sends
+    beyond the first would time out waiting for it.
+
+    Args:
+        settings: Configuration to use (defaults to the global config)
+
+    Returns:
+        Bot instance
+    """
+    settings = settings or config
+    return Bot(
+        token=settings.telegram_bot_token,
+        base_url=settings.telegram_base_url,
+        request=HTTPXRequest(connection_pool_size=SEND_CONCURRENCY),
+    )
+
+
+def get_bot(settings=None) -> Bot:
+    """Get the Bot shared by all sends on the running event loop.
+
+    Sends reuse its connection pool instead of each opening their own. It
+    is rebuilt if the token or API base URL changes.
+
+    Args:
+        settings: Configuration to use (defaults to the global config)
+
+    Returns:
+        Bot instance
+    """
+    settings = settings or config
+    key = (settings.telegram_bot_token, settings.telegram_base_url)
+    loop = asyncio.get_running_loop()
+    cached = _bots.get(loop)
+    if cached is None or cached[0] != key:
+        cached = _bots[loop] = (key, build_bot(settings))
+    return cached[1]
+
+
+async def _send_with_retry(send, **kwargs):
+    """Call a Bot send method, waiting out 429 responses up to SEND_MAX_RETRIES times.
+
+    Args:
+        send: Bound Bot method (e.g. bot.send_photo) or PreparedSend.send
+        **kwargs: Arguments of the send method
+
+    Returns:
+        The sent Message, or the Bot API result for a PreparedSend
+    """
+    for attempt in range(SEND_MAX_RETRIES + 1):
+        try:
+            return await send(**kwargs)
+        except RetryAfter as e:
+            if attempt == SEND_MAX_RETRIES or e.retry_after > MAX_RETRY_AFTER_SECONDS:
+                raise
+            TELEGRAM_SENDS.labels('rate_limited').inc()
+            logger.warning(f"Rate limited by Telegram, retrying in {e.retry_after}s")
+            await asyncio.sleep(e.retry_after)
+
+
+async def _send_with_fallback(send):
+    """Send a quote message, resending it as plain text if Telegram rejects its markup.
+
+    Args:
+        send: Function of plain (bool) returning the send coroutine for the
+            message formatted accordingly
+
+    Returns:
+        Result of the successful send
+    """
+    try:
+        return await send(False)
+    except BadRequest as e:
+        if not is_parse_error(e):
+            raise
+        MARKUP_FALLBACKS.inc()
+        logger.warning(f"Telegram rejected the quote markup ({e}); resending as plain text")
+        return await send(True)
+
+
+class _CardUpload:
+    """Lock serializing the upload of one card, and how many sends use it."""
+
+    __slots__ = ('lock', 'users')
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.users = 0
 
 
-async def send_quote_to_chat(quote: dict, time_period: str = "unknown") -> bool:
-    """Send a quote to the configured Telegram chat.
+async def _send_card(bot: Bot, chat_id: str, quote: Quote):
+    """Send a quote as an image card, uploading the card only once.
+
+    The first send of a card renders (if not cached) and uploads it; the
+    file_id Telegram returns is stored and every later send reuses it.
+    Concurrent first sends of the same card wait for the one upload.
 
     Args:
-        quote: Quote dictionary with 'text' and 'author'
+        bot: Bot instance
+        chat_id: Target chat
+        quote: Quote to send
+
+    Returns:
+        The sent message (a Message after an upload, the Bot API result
+        dictionary when re-sent by file_id), or None if no card could be
+        rendered
+    """
+    store = get_card_store()
+
+    def resend(file_id: str):
+        return _send_with_fallback(lambda plain: _send_with_retry(
+            _prepared_card(quote, file_id, plain).send, bot=bot, chat_id=chat_id
+        ))
+
+    async def upload(plain: bool):
+        with open(path, 'rb') as photo:
+            return await _send_with_retry(
+                bot.send_photo, chat_id=chat_id, photo=photo,
+                caption=_format_quote_message(quote, plain), parse_mode=_parse_mode(plain),
+                reply_markup=_quote_keyboard(quote)
+            )
+
+    file_id = store.file_id(quote)
+    if file_id is not None:
+        try:
+            message = await resend(file_id)
+            QUOTE_CARDS.labels('reused').inc()
+            return message
+        except BadRequest as e:
+            if "file" not in str(e).lower():
+                raise
+            logger.warning(f"Stored card file_id rejected ({e}); uploading the card again")
+            store.forget(quote)
+
+    # The entry stays until the last send waiting on it is done, so a send
+    # arriving meanwhile queues behind the same upload
+    key = card_key(quote)
+    card_upload = _card_uploads.setdefault(key, _CardUpload())
+    card_upload.users += 1
+    try:
+        async with card_upload.lock:
+            file_id = store.file_id(quote)
+            if file_id is not None:
+                message = await resend(file_id)
+                QUOTE_CARDS.labels('reused').inc()
+                return message
+
+            try:
+                path = await asyncio.to_thread(store.render, quote)
+            except Exception as e:
+                logger.warning(f"Could not render quote card ({e}); sending text")
+                path = None
+            if path is None:
+                QUOTE_CARDS.labels('unavailable').inc()
+                return None
+            message = await _send_with_fallback(upload)
+            store.remember(quote, message.photo[-1].file_id)
+            QUOTE_CARDS.labels('uploaded').inc()
+            return message
+    finally:
+        card_upload.users -= 1
+        if not card_upload.users:
+            del _card_uploads[key]
+
+
+async def send_quote_to_chat(quote: Quote, time_period: str = "unknown",
+                             bot: Optional[Bot] = None, chat_id: Optional[str] = None,
+                             record_stats: bool = True) -> bool:
+    """Send a quote to a Telegram chat.
+
+    Args:
+        quote: Quote to send
         time_period: 'morning', 'evening', or 'unknown'
+        bot: Bot instance to send with (defaults to the event loop's shared Bot)
+        chat_id: Target chat (defaults to the configured chat)
+        record_stats: Whether to record the send in the stats file
 
     Returns:
         True if successful, False otherwise
     """
     try:
-        application = Application.builder().token(config.telegram_bot_token).build()
-
-        await application.bot.send_message(
-            chat_id=config.telegram_chat_id,
-            text=_format_quote_message(quote),
-            parse_mode='Markdown'
-        )
+        if bot is None:
+            bot = get_bot()
+
+        chat_id = chat_id or config.telegram_chat_id
+        with TELEGRAM_SEND_SECONDS.time(), tracing.span('telegram.send', time_period=time_period):
+            sent = None
+            if config.quote_cards:
+                sent = await _send_card(bot, chat_id, quote)
+            if sent is None:
+                await _send_with_fallback(lambda plain: _send_with_retry(
+                    _prepared_message(quote, plain).send, bot=bot, chat_id=chat_id
+                ))
+        TELEGRAM_SENDS.labels('success').inc()
 
         # Record in stats (skip if read-only filesystem like Cloud Functions)
-        try:
-            stats_manager.record_quote(quote, time_period)
-        except (OSError, IOError) as e:
-            logger.warning(f"Could not save stats (read-only filesystem): {e}")
+        if record_stats:
+            try:
+                stats_manager.record_quote(quote, time_period)
+            except (OSError, IOError) as e:
+                logger.warning(f"Could not save stats (read-only filesystem): {e}")
 
-        logger.info(f"Quote sent successfully: {quote['text'][:50]}...")
+        logger.info(f"Quote sent successfully: {quote.text[:50]}...")
         return True
 
     except Exception as e:
         logger.error(f"Error sending quote: {e}")
+        TELEGRAM_SENDS.labels('failed').inc()
         return False
 
 
-def send_quote_sync(quote: dict, time_period: str = "unknown") -> bool:
-    """Synchronous wrapper for send_quote_to_chat.
+async def send_quotes_to_chats(deliveries: List[Tuple[str, Quote]],
+                               time_period: str = "unknown") -> List[bool]:
+    """Send quotes to many chats concurrently with the event loop's shared Bot.
+
+    Stats are not recorded per delivery; callers log an aggregate instead.
 
     Args:
-        quote: Quote dictionary
-        time_period: 'morning', 'evening', or 'unknown'
+        deliveries: List of (chat ID, quote) pairs
+        time_period: Time period identifier
 
     Returns:
-        True if successful, False otherwise
+        List of success flags in the same order as ``deliveries``
+    """
+    bot = get_bot()
+    semaphore = asyncio.Semaphore(SEND_CONCURRENCY)
+
+    async def send_one(chat_id: str, quote: Quote) -> bool:
+        async with semaphore:
+            return await send_quote_to_chat(
+                quote, time_period, bot=bot, chat_id=chat_id, record_stats=False
+            )
+
+    return await asyncio.gather(*(send_one(chat_id, quote) for chat_id, quote in deliveries))
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """Get the current event loop, creating one if this thread has none.
+
+    Returns:
+        Event loop reused across synchronous calls (e.g. warm Cloud Functions)
     """
     try:
-        loop = asyncio.get_event_loop()
+        return asyncio.get_event_loop()
     except RuntimeError:
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
+        return loop
 
-    return loop.run_until_complete(send_quote_to_chat(quote, time_period))
+
+def send_quote_sync(quote: Quote, time_period: str = "unknown") -> bool:
+    """Synchronous wrapper for send_quote_to_chat.
+
+    Args:
+        quote: Quote to send
+        time_period: 'morning', 'evening', or 'unknown'
+
+    Returns:
+        True if successful, False otherwise
+    """
+    return get_event_loop().run_until_complete(send_quote_to_chat(quote, time_period))
 
 
 # Telegram Bot Command Handlers
@@ -217,6 +564,9 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         "Available commands:\n"
         "/quote - Get a random quote now\n"
         "/stats - View your quote statistics\n"
+        "/subscribe - Get a daily quote in your own time window\n"
+        "/language - Choose your quote language\n"
+        "/topics - Choose the topics you like\n"
         "/help - Show this help message"
     )
     await update.message.reply_text(welcome_message)
@@ -224,8 +574,14 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def quote_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /quote command."""
-    quote = get_quote()
-    await update.message.reply_text(_format_quote_message(quote), parse_mode='Markdown')
+    profile = get_profile_store().get(update.effective_chat.id)
+    quote = get_quote(language=profile.quote_language, topics=profile.topics)
+    if config.quote_cards and await _send_card(context.bot, update.effective_chat.id, quote):
+        return
+    await _send_with_fallback(lambda plain: update.message.reply_text(
+        _format_quote_message(quote, plain), parse_mode=_parse_mode(plain),
+        reply_markup=_quote_keyboard(quote)
+    ))
 
 
 async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -258,28 +614,217 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         "/start - Welcome message\n"
         "/quote - Get a random quote now\n"
         "/stats - View your quote statistics\n"
+        "/subscribe [timezone] [HH:MM-HH:MM] - Daily quote in your window\n"
+        "/schedule [timezone] [HH:MM-HH:MM] - Show or change your window\n"
+        "/unsubscribe - Stop your daily quote\n"
+        "/language [code|both] - Show or change your quote language\n"
+        "/topics [topic ...|clear] - Show or change your favourite topics\n"
         "/help - Show this help message\n\n"
         "The bot will automatically send you quotes "
-        "based on your configured schedule."
+        "based on your configured schedule.\n"
+        "Tap 👍 or 👎 under a quote to help pick better ones."
     )
     await update.message.reply_text(help_text, parse_mode='Markdown')
 
 
+async def subscribe_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle /subscribe [timezone] [HH:MM-HH:MM] command."""
+    # Imported lazily: the dispatcher and scheduler import this module
+    from bot.dispatcher import get_dispatcher
+    from bot.scheduler import ensure_subscriber_tick
+    from bot.subscribers import Subscriber
+
+    args = context.args or []
+    settings = {'chat_id': str(update.effective_chat.id)}
+    if len(args) >= 1:
+        settings['timezone'] = args[0]
+    if len(args) >= 2:
+        settings['window_start'], _, settings['window_end'] = args[1].partition('-')
+
+    try:
+        subscriber = Subscriber(**settings)
+    except ValueError as e:
+        await update.message.reply_text(
+            f"⚠️ {e}\nUsage: /subscribe [timezone] [HH:MM-HH:MM]\n"
+            "Example: /subscribe Europe/London 07:30-08:30"
+        )
+        return
+
+    next_send = get_dispatcher().subscribe(subscriber)
+    ensure_subscriber_tick()
+    await update.message.reply_text(
+        f"✅ Subscribed! You'll get one quote a day between "
+        f"{subscriber.window_start} and {subscriber.window_end} ({subscriber.timezone}).\n"
+        f"Next quote: {next_send.strftime('%Y-%m-%d %H:%M')}"
+    )
+
+
+async def unsubscribe_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle /unsubscribe command."""
+    from bot.dispatcher import get_dispatcher
+
+    if get_dispatcher().unsubscribe(str(update.effective_chat.id)):
+        await update.message.reply_text("👋 Unsubscribed. Use /subscribe to start again.")
+    else:
+        await update.message.reply_text("You are not subscribed.")
+
+
+async def reaction_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle a press of a quote's reaction button."""
+    query = update.callback_query
+    _, reaction, quote_id = query.data.split(':', 2)
+    if reaction not in REACTIONS:
+        await query.answer()
+        return
+
+    try:
+        likes, dislikes = get_feedback_store().record(quote_id, str(query.from_user.id), reaction)
+    except sqlite3.Error as e:
+        logger.warning(f"Could not save reaction to {quote_id}: {e}")
+        await query.answer("Sorry, your feedback could not be saved right now.")
+        return
+    QUOTE_REACTIONS.labels(reaction).inc()
+    await query.answer(f"Thanks for the feedback! 👍 {likes} · 👎 {dislikes}")
+
+
+async def language_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle /language [code|both] command."""
+    store = get_profile_store()
+    profile = store.get(update.effective_chat.id)
+    languages = get_language_registry()
+    usage = "/language " + "|".join(languages.choices)
+    args = context.args or []
+    if not args:
+        options = "\n".join(f"{code} - {languages.label(code)}" for code in languages.choices)
+        await update.message.reply_text(
+            f"🌐 Your quote language: {languages.label(profile.quote_language)}\n"
+            f"Change it with {usage}\n\n{options}"
+        )
+        return
+
+    try:
+        profile = replace(profile, language=args[0].lower())
+    except ValueError as e:
+        await update.message.reply_text(f"⚠️ {e}\nUsage: {usage}")
+        return
+
+    try:
+        store.save(profile)
+    except sqlite3.Error as e:
+        logger.warning(f"Could not save language of chat {profile.chat_id}: {e}")
+        await update.message.reply_text("Sorry, your language could not be saved right now.")
+        return
+    await update.message.reply_text(f"✅ Your quotes will be in: {languages.label(profile.language)}")
+
+
+async def topics_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle /topics [topic ...|clear] command."""
+    store = get_profile_store()
+    profile = store.get(update.effective_chat.id)
+    available = get_quote_generator().available_tags()
+    args = [arg.lower() for arg in context.args or []]
+    if not args:
+        current = ", ".join(profile.topics) or "none"
+        await update.message.reply_text(
+            f"🏷️ Your topics: {current}\n"
+            f"Available: {', '.join(available)}\n"
+            "Change them with /topics motivation calm, or /topics clear"
+        )
+        return
+
+    topics = () if args == ["clear"] else tuple(dict.fromkeys(args))
+    unknown = [topic for topic in topics if topic not in available]
+    if unknown:
+        await update.message.reply_text(
+            f"⚠️ Unknown topic(s): {', '.join(unknown)}\nAvailable: {', '.join(available)}"
+        )
+        return
+
+    try:
+        profile = replace(profile, topics=topics)
+    except ValueError as e:
+        await update.message.reply_text(f"⚠️ {e}")
+        return
+
+    try:
+        store.save(profile)
+    except sqlite3.Error as e:
+        logger.warning(f"Could not save topics of chat {profile.chat_id}: {e}")
+        await update.message.reply_text("Sorry, your topics could not be saved right now.")
+        return
+    if topics:
+        await update.message.reply_text(f"✅ You'll get more quotes about: {', '.join(topics)}")
+    else:
+        await update.message.reply_text("✅ Topics cleared.")
+
+
+async def schedule_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle /schedule [timezone] [HH:MM-HH:MM] command."""
+    if context.args:
+        await subscribe_command(update, context)
+        return
+
+    from bot.dispatcher import get_dispatcher
+
+    subscriber = get_dispatcher().store.get(str(update.effective_chat.id))
+    if subscriber is None:
+        await update.message.reply_text(
+            "You have no daily quote yet.\n"
+            "Set one up with /schedule [timezone] [HH:MM-HH:MM], "
+            "e.g. /schedule Asia/Bangkok 07:00-08:00"
+        )
+        return
+
+    await update.message.reply_text(
+        f"🕐 Your daily quote arrives between {subscriber.window_start} and "
+        f"{subscriber.window_end} ({subscriber.timezone}).\n"
+        "Change it with /schedule [timezone] [HH:MM-HH:MM]"
+    )
+
+
+def _timed_command(command: str, handler):
+    """Wrap a command handler to record its latency.
+
+    Args:
+        command: Command name used as the metric label
+        handler: Async command handler
+
+    Returns:
+        Wrapped async handler
+    """
+    histogram = COMMAND_SECONDS.labels(command)
+
+    async def timed_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        with histogram.time():
+            await handler(update, context)
+
+    return timed_handler
+
+
 def run_bot():
     """Run the Telegram bot (blocking)."""
-    application = Application.builder().token(config.telegram_bot_token).build()
+    application = _application_builder().build()
 
     # Register command handlers
     for cmd, handler in [
         ("start", start_command),
         ("quote", quote_command),
         ("stats", stats_command),
+        ("subscribe", subscribe_command),
+        ("unsubscribe", unsubscribe_command),
+        ("schedule", schedule_command),
+        ("language", language_command),
+        ("topics", topics_command),
         ("help", help_command),
     ]:
-        application.add_handler(CommandHandler(cmd, handler))
+        application.add_handler(CommandHandler(cmd, _timed_command(cmd, handler)))
+
+    application.add_handler(CallbackQueryHandler(
+        _timed_command("reaction", reaction_callback), pattern=f"^{REACTION_CALLBACK_PREFIX}:"
+    ))
 
     logger.info("Starting Telegram bot...")
-    application.run_polling(allowed_updates=["message"])
+    application.run_polling(allowed_updates=["message", "callback_query"])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,113 @@
+"""Daily AI token usage, shared by every process counting against the budget."""
+import sqlite3
+import threading
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from config.settings import config
+from bot.database import LazyDatabase
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS token_usage (
+    day TEXT PRIMARY KEY,
+    tokens INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+# Days of usage kept in the database
+USAGE_HISTORY_DAYS = 30
+
+
+class TokenUsageStore:
+    """Tokens used per day, in a SQLite file shared between processes.
+
+    Each AI call adds its tokens with one atomic upsert, so concurrent
+    processes never lose an update. Without the database, usage is counted
+    for this process only.
+    """
+
+    def __init__(self, usage_file: Union[Path, str] = ":memory:"):
+        """Initialize the store; the database is opened on first use.
+
+        Args:
+            usage_file: Path to the SQLite file, or ':memory:' for a
+                non-persistent store
+        """
+        self.usage_file = usage_file
+        self._lock = threading.Lock()
+        self._db = LazyDatabase(usage_file, SCHEMA, "Token usage store",
+                                "the daily token budget only counts this process")
+        self._totals: Dict[str, int] = {}
+
+    def used(self, day: date) -> int:
+        """Get the tokens used on a day.
+
+        Args:
+            day: Budget day
+
+        Returns:
+            Tokens used by every process sharing the store
+        """
+        with self._lock:
+            conn = self._db.open()
+            if conn is not None:
+                try:
+                    if self._db.changed(conn):
+                        self._totals = dict(conn.execute("SELECT day, tokens FROM token_usage"))
+                except sqlite3.Error as e:
+                    self._db.disable(e)
+            return self._totals.get(day.isoformat(), 0)
+
+    def add(self, day: date, tokens: int) -> int:
+        """Add tokens to a day's usage.
+
+        Args:
+            day: Budget day
+            tokens: Tokens used by one AI call
+
+        Returns:
+            The day's total after the addition
+        """
+        key = day.isoformat()
+        with self._lock:
+            conn = self._db.open()
+            if conn is not None:
+                try:
+                    with conn:
+                        conn.execute(
+                            "INSERT INTO token_usage (day, tokens) VALUES (?, ?) "
+                            "ON CONFLICT(day) DO UPDATE SET tokens = tokens + excluded.tokens",
+                            (key, tokens)
+                        )
+                        conn.execute(
+                            "DELETE FROM token_usage WHERE day < ?",
+                            ((day - timedelta(days=USAGE_HISTORY_DAYS)).isoformat(),)
+                        )
+                        total = conn.execute(
+                            "SELECT tokens FROM token_usage WHERE day = ?", (key,)
+                        ).fetchone()[0]
+                    self._totals[key] = total
+                    return total
+                except sqlite3.Error as e:
+                    self._db.disable(e)
+
+            self._totals[key] = total = self._totals.get(key, 0) + tokens
+            return total
+
+    def close(self):
+        """Close the underlying database connection, if it was opened."""
+        with self._lock:
+            self._db.close()
+
+
+# Singleton instance
+_store: Optional[TokenUsageStore] = None
+
+
+def get_token_usage_store() -> TokenUsageStore:
+    """Get the singleton token usage store instance."""
+    global _store
+    if _store is None:
+        _store = TokenUsageStore(config.token_usage_file)
+    return _store
@@ -0,0 +1,181 @@
+"""Lightweight span tracing across quote generation and delivery.
+
+Spans follow the OpenTelemetry data model (128-bit trace ID, 64-bit span
+ID, parent span ID, nanosecond start/end times, attributes, status) and are
+exported as one JSON object per line, either to the log (console) or to a
+local file that an OpenTelemetry collector's file receiver can ingest.
+
+The current span is tracked in a context variable, so a trace started in
+send_scheduled_quote or the GCF handler follows the work through awaits and
+asyncio.to_thread() down to stats recording. When no exporter is configured
+span() does nothing beyond a single check.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    """A single timed operation within a trace."""
+
+    __slots__ = ('name', 'trace_id', 'span_id', 'parent_span_id', 'start_time',
+                 'end_time', 'attributes', 'status')
+
+    def __init__(self, name: str, parent: Optional['Span'] = None, **attributes):
+        """Start a span.
+
+        Args:
+            name: Operation name
+            parent: Parent span (a new trace is started if omitted)
+            **attributes: Span attributes
+        """
+        self.name = name
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = parent.span_id if parent else None
+        self.start_time = time.time_ns()
+        self.end_time = None
+        self.attributes = attributes
+        self.status = 'OK'
+
+    def set_attribute(self, key: str, value):
+        """Set a span attribute.
+
+        Args:
+            key: Attribute name
+            value: Attribute value (str, number or bool)
+        """
+        self.attributes[key] = value
+
+    def to_dict(self) -> dict:
+        """Convert the span to an OpenTelemetry-style dictionary.
+
+        Returns:
+            Span dictionary
+        """
+        return {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'parentSpanId': self.parent_span_id,
+            'name': self.name,
+            'startTimeUnixNano': self.start_time,
+            'endTimeUnixNano': self.end_time,
+            'durationMs': round((self.end_time - self.start_time) / 1e6, 3),
+            'attributes': self.attributes,
+            'status': self.status,
+        }
+
+
+class ConsoleSpanExporter:
+    """Write finished spans to the log."""
+
+    def export(self, span: Span):
+        """Export a finished span.
+
+        Args:
+            span: Finished span
+        """
+        logger.info(f"span {json.dumps(span.to_dict(), ensure_ascii=False)}")
+
+
+class FileSpanExporter:
+    """Append finished spans to a JSON-lines file."""
+
+    def __init__(self, trace_file: Path):
+        """Initialize the exporter.
+
+        Args:
+            trace_file: Path to the JSON-lines file
+        """
+        self.trace_file = trace_file
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        """Export a finished span.
+
+        Args:
+            span: Finished span
+        """
+        line = json.dumps(span.to_dict(), ensure_ascii=False) + "\n"
+        try:
+            with self._lock, open(self.trace_file, 'a', encoding='utf-8') as f:
+                f.write(line)
+        except OSError as e:
+            logger.warning(f"Could not write span: {e}")
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar('current_span', default=None)
+_exporter = None
+
+
+def configure_tracing(exporter: str, trace_file: Optional[Path] = None):
+    """Select where finished spans are exported.
+
+    Args:
+        exporter: 'none', 'console', or 'file'
+        trace_file: Path to the JSON-lines file (for the 'file' exporter)
+    """
+    global _exporter
+    if exporter == 'console':
+        _exporter = ConsoleSpanExporter()
+    elif exporter == 'file':
+        _exporter = FileSpanExporter(trace_file)
+    else:
+        _exporter = None
+
+
+def current_span() -> Optional[Span]:
+    """Get the span active in the current context.
+
+    Returns:
+        Current span or None
+    """
+    return _current_span.get()
+
+
+def current_trace_id() -> Optional[str]:
+    """Get the trace ID active in the current context.
+
+    Returns:
+        Trace ID hex string or None outside a trace
+    """
+    span = _current_span.get()
+    return span.trace_id if span else None
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Trace the wrapped block as a child of the current span.
+
+    Args:
+        name: Operation name
+        **attributes: Span attributes
+
+    Yields:
+        The span, or None when tracing is disabled
+    """
+    exporter = _exporter
+    if exporter is None:
+        yield None
+        return
+
+    current = Span(name, _current_span.get(), **attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.status = 'ERROR'
+        current.attributes['exception'] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        current.end_time = time.time_ns()
+        _current_span.reset(token)
+        exporter.export(current)
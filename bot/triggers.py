@@ -0,0 +1,79 @@
+"""Custom APScheduler triggers for quote scheduling."""
+import random
+from datetime import datetime, time, timedelta
+
+from apscheduler.triggers.base import BaseTrigger
+from apscheduler.util import astimezone, localize
+
+
+class RandomWindowTrigger(BaseTrigger):
+    """Fire once per day at a random minute within a time window.
+
+    The minute is derived from a generator seeded with the trigger seed and
+    the date, so each day gets a fresh time while every computation for the
+    same day (including after a restart) agrees on it. Computing the next
+    fire time only looks at today and tomorrow, so it is O(1) and the job
+    never needs to be removed and re-added.
+    """
+
+    __slots__ = 'start', 'end', 'timezone', 'seed'
+
+    def __init__(self, start: time, end: time, timezone, seed: str = ""):
+        """Initialize the trigger.
+
+        Args:
+            start: Window start time (inclusive)
+            end: Window end time (inclusive), same day as start
+            timezone: Timezone the window is expressed in
+            seed: Seed mixed with the date to pick each day's minute
+        """
+        self.start = start
+        self.end = end
+        self.timezone = astimezone(timezone)
+        self.seed = seed
+
+    def get_fire_time_for_day(self, day) -> datetime:
+        """Get the fire time selected for a given day.
+
+        Args:
+            day: Date to compute the fire time for
+
+        Returns:
+            Timezone-aware datetime within the window on that day
+        """
+        start_minutes = self.start.hour * 60 + self.start.minute
+        end_minutes = self.end.hour * 60 + self.end.minute
+
+        rng = random.Random(f"{self.seed}:{day.isoformat()}")
+        minutes = rng.randint(start_minutes, end_minutes)
+        fire_time = datetime.combine(day, time(hour=minutes // 60, minute=minutes % 60))
+        return localize(fire_time, self.timezone)
+
+    def get_next_fire_time(self, previous_fire_time, now):
+        """Get the next fire time after the previous one and not before now.
+
+        Args:
+            previous_fire_time: Previous fire time, or None
+            now: Current datetime
+
+        Returns:
+            Next fire datetime
+        """
+        earliest = now
+        if previous_fire_time and previous_fire_time >= earliest:
+            earliest = previous_fire_time + timedelta(microseconds=1)
+
+        today = earliest.astimezone(self.timezone).date()
+        fire_time = self.get_fire_time_for_day(today)
+        if fire_time < earliest:
+            fire_time = self.get_fire_time_for_day(today + timedelta(days=1))
+        return fire_time
+
+    def __str__(self):
+        return f"random_window[{self.start:%H:%M}-{self.end:%H:%M}]"
+
+    def __repr__(self):
+        return (
+            f"<{self.__class__.__name__} (start='{self.start:%H:%M}', "
+            f"end='{self.end:%H:%M}', timezone='{self.timezone}')>"
+        )
@@ -1,8 +1,10 @@
 """Configuration management for Daily Quote Bot."""
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from dotenv import load_dotenv
 
@@ -14,7 +16,21 @@ BASE_DIR = Path(__file__).parent.parent
 
 # Valid configuration values
 VALID_SCHEDULE_WINDOWS = ("morning", "evening", "both", "daily", "random")
-VALID_LANGUAGES = ("en", "th", "both")
+VALID_SCHEDULER_STATE_BACKENDS = ("memory", "json")
+VALID_CATCHUP_POLICIES = ("coalesce", "all", "skip")
+VALID_TRACE_EXPORTERS = ("none", "console", "file")
+
+# Language value meaning "any supported language"
+ALL_LANGUAGES = "both"
+
+# Language definitions, one <code>.json per language (see bot/languages.py)
+DEFAULT_LANGUAGES_DIR = BASE_DIR / "data" / "languages"
+
+# Reaction and daily token usage databases, written at run time; point
+# FEEDBACK_FILE and TOKEN_USAGE_FILE at a writable path such as /tmp where
+# the data directory is read-only (Cloud Functions)
+DEFAULT_FEEDBACK_FILE = BASE_DIR / "data" / "feedback.sqlite"
+DEFAULT_TOKEN_USAGE_FILE = BASE_DIR / "data" / "token_usage.sqlite"
 
 # Default time windows
 DEFAULT_MORNING_START = "07:00"
@@ -22,6 +38,29 @@ DEFAULT_MORNING_END = "09:00"
 DEFAULT_EVENING_START = "18:00"
 DEFAULT_EVENING_END = "20:00"
 
+# Default timezone for schedules and new subscribers
+DEFAULT_TIMEZONE = "Asia/Bangkok"
+
+# Default port for the local metrics endpoint (0 disables it)
+DEFAULT_METRICS_PORT = 9108
+
+# Default number of randomly timed sends per day (GCF 'random' period)
+DEFAULT_RANDOM_SENDS_PER_DAY = 1
+
+# Hours (inclusive) the GCF 'random' period picks its send hours from,
+# at most one send per hour
+RANDOM_HOUR_MIN = 10
+RANDOM_HOUR_MAX = 17
+
+# Default daily AI token budget (input + output tokens, 0 for unlimited)
+DEFAULT_AI_DAILY_TOKEN_BUDGET = 100_000
+
+# Default deadline for a single AI API call in seconds
+DEFAULT_AI_TIMEOUT_SECONDS = 10.0
+
+# Default Telegram Bot API base URL (the bot token is appended to it)
+DEFAULT_TELEGRAM_BASE_URL = "https://api.telegram.org/bot"
+
 
 @dataclass
 class Config:
@@ -40,19 +79,77 @@ class Config:
     morning_end: str = DEFAULT_MORNING_END
     evening_start: str = DEFAULT_EVENING_START
     evening_end: str = DEFAULT_EVENING_END
+    random_sends_per_day: int = DEFAULT_RANDOM_SENDS_PER_DAY
 
     # Quote Language
-    quote_language: str = "both"  # en, th, or both
+    quote_language: str = "both"  # a language code from data/languages, or both
+
+    # Timezone the owner chat's schedule windows are expressed in
+    timezone: str = DEFAULT_TIMEZONE
+
+    # Seed for the per-day random send times (same seed -> same times)
+    schedule_seed: str = ""
+
+    # Scheduler job state (last-fired times): memory or json
+    scheduler_state_backend: str = "json"
+
+    # Replay of sends missed while down: coalesce, all, or skip
+    catchup_policy: str = "coalesce"
+
+    # Local Prometheus metrics endpoint port (0 disables it)
+    metrics_port: int = DEFAULT_METRICS_PORT
+
+    # Span export for tracing: none, console, or file
+    trace_exporter: str = "none"
+
+    # Telegram Bot API base URL (point at a local fake server for load tests)
+    telegram_base_url: str = DEFAULT_TELEGRAM_BASE_URL
+
+    # Anthropic API base URL (empty for the SDK default)
+    anthropic_base_url: str = ""
+
+    # AI tokens allowed per day before only local quotes are served (0 for unlimited)
+    ai_daily_token_budget: int = DEFAULT_AI_DAILY_TOKEN_BUDGET
+
+    # Deadline for a single AI API call, and the delay after which a local
+    # quote is served instead of waiting for AI (0 disables hedging)
+    ai_timeout_seconds: float = DEFAULT_AI_TIMEOUT_SECONDS
+    ai_hedge_ms: int = 0
+
+    # Stream AI responses and stop once the quote object is complete
+    ai_streaming: bool = False
+
+    # Send quotes as rendered image cards (needs Pillow) instead of text
+    quote_cards: bool = False
 
     # Data Paths
     quotes_file: Path = BASE_DIR / "data" / "quotes.json"
     stats_file: Path = BASE_DIR / "data" / "stats.json"
+    scheduler_state_file: Path = BASE_DIR / "data" / "scheduler_state.json"
+    subscribers_file: Path = BASE_DIR / "data" / "subscribers.json"
+    send_index_file: Path = BASE_DIR / "data" / "send_index.sqlite"
+    feedback_file: Path = DEFAULT_FEEDBACK_FILE
+    token_usage_file: Path = DEFAULT_TOKEN_USAGE_FILE
+    profiles_file: Path = BASE_DIR / "data" / "profiles.sqlite"
+    languages_dir: Path = DEFAULT_LANGUAGES_DIR
+    cards_dir: Path = BASE_DIR / "data" / "cards"
+    fonts_dir: Path = BASE_DIR / "data" / "fonts"
+    trace_file: Path = BASE_DIR / "data" / "traces.jsonl"
 
     def __post_init__(self):
         """Validate configuration after initialization."""
         self._validate_required_fields()
         self._validate_schedule_window()
         self._validate_quote_language()
+        self._validate_random_sends_per_day()
+        self._validate_timezone()
+        self._validate_scheduler_state_backend()
+        self._validate_catchup_policy()
+        self._validate_trace_exporter()
+        self._validate_telegram_base_url()
+        self._validate_anthropic_base_url()
+        self._validate_ai_daily_token_budget()
+        self._validate_ai_deadlines()
         self._ensure_data_directories()
 
     def _validate_required_fields(self):
@@ -79,20 +176,112 @@ class Config:
                 f"got '{self.schedule_window}'"
             )
 
+    @property
+    def language_choices(self) -> Tuple[str, ...]:
+        """Valid language settings: every defined language plus ALL_LANGUAGES."""
+        return discover_languages(self.languages_dir) + (ALL_LANGUAGES,)
+
     def _validate_quote_language(self):
-        """Validate quote language is a valid value."""
-        if self.quote_language not in VALID_LANGUAGES:
+        """Validate quote language is a defined language or ALL_LANGUAGES."""
+        if self.quote_language not in self.language_choices:
             raise ValueError(
-                f"QUOTE_LANGUAGE must be one of {VALID_LANGUAGES}, "
+                f"QUOTE_LANGUAGE must be one of {self.language_choices}, "
                 f"got '{self.quote_language}'"
             )
 
+    def _validate_random_sends_per_day(self):
+        """Validate the number of random sends per day fits the random window."""
+        window_hours = RANDOM_HOUR_MAX - RANDOM_HOUR_MIN + 1
+        if not 1 <= self.random_sends_per_day <= window_hours:
+            raise ValueError(
+                f"RANDOM_SENDS_PER_DAY must be between 1 and {window_hours} "
+                f"(one per hour from {RANDOM_HOUR_MIN}:00 to {RANDOM_HOUR_MAX}:00), "
+                f"got {self.random_sends_per_day}"
+            )
+
+    def _validate_timezone(self):
+        """Validate timezone is a known IANA timezone name."""
+        try:
+            ZoneInfo(self.timezone)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError(f"TIMEZONE must be a valid IANA timezone, got '{self.timezone}'")
+
+    def _validate_scheduler_state_backend(self):
+        """Validate scheduler state backend is a valid value."""
+        if self.scheduler_state_backend not in VALID_SCHEDULER_STATE_BACKENDS:
+            raise ValueError(
+                f"SCHEDULER_STATE_BACKEND must be one of {VALID_SCHEDULER_STATE_BACKENDS}, "
+                f"got '{self.scheduler_state_backend}'"
+            )
+
+    def _validate_catchup_policy(self):
+        """Validate catch-up policy is a valid value."""
+        if self.catchup_policy not in VALID_CATCHUP_POLICIES:
+            raise ValueError(
+                f"CATCHUP_POLICY must be one of {VALID_CATCHUP_POLICIES}, "
+                f"got '{self.catchup_policy}'"
+            )
+
+    def _validate_trace_exporter(self):
+        """Validate trace exporter is a valid value."""
+        if self.trace_exporter not in VALID_TRACE_EXPORTERS:
+            raise ValueError(
+                f"TRACE_EXPORTER must be one of {VALID_TRACE_EXPORTERS}, "
+                f"got '{self.trace_exporter}'"
+            )
+
+    def _validate_telegram_base_url(self):
+        """Validate the Telegram base URL is an HTTP(S) URL."""
+        if not self.telegram_base_url.startswith(("http://", "https://")):
+            raise ValueError(
+                f"TELEGRAM_BASE_URL must start with http:// or https://, "
+                f"got '{self.telegram_base_url}'"
+            )
+
+    def _validate_anthropic_base_url(self):
+        """Validate the Anthropic base URL is empty or an HTTP(S) URL."""
+        if self.anthropic_base_url and not self.anthropic_base_url.startswith(("http://", "https://")):
+            raise ValueError(
+                f"ANTHROPIC_BASE_URL must start with http:// or https://, "
+                f"got '{self.anthropic_base_url}'"
+            )
+
+    def _validate_ai_daily_token_budget(self):
+        """Validate the daily AI token budget is not negative."""
+        if self.ai_daily_token_budget < 0:
+            raise ValueError(
+                f"AI_DAILY_TOKEN_BUDGET must be 0 or more, "
+                f"got {self.ai_daily_token_budget}"
+            )
+
+    def _validate_ai_deadlines(self):
+        """Validate the AI call deadline is positive and the hedge delay is not negative."""
+        if self.ai_timeout_seconds <= 0:
+            raise ValueError(
+                f"AI_TIMEOUT_SECONDS must be positive, got {self.ai_timeout_seconds}"
+            )
+        if self.ai_hedge_ms < 0:
+            raise ValueError(f"AI_HEDGE_MS must be 0 or more, got {self.ai_hedge_ms}")
+
     def _ensure_data_directories(self):
         """Ensure data directories exist."""
         self.quotes_file.parent.mkdir(parents=True, exist_ok=True)
         self.stats_file.parent.mkdir(parents=True, exist_ok=True)
 
 
+@lru_cache(maxsize=None)
+def discover_languages(languages_dir: Path) -> Tuple[str, ...]:
+    """List the languages defined in a directory of <code>.json files.
+
+    Args:
+        languages_dir: Directory of language definitions
+
+    Returns:
+        Sorted language codes
+    """
+    return tuple(sorted(path.stem for path in Path(languages_dir).glob("*.json")))
+
+
 def load_config() -> Config:
     """Load configuration from environment variables.
 
@@ -108,7 +297,23 @@ def load_config() -> Config:
         morning_end=os.getenv("MORNING_END", DEFAULT_MORNING_END),
         evening_start=os.getenv("EVENING_START", DEFAULT_EVENING_START),
         evening_end=os.getenv("EVENING_END", DEFAULT_EVENING_END),
+        random_sends_per_day=int(os.getenv("RANDOM_SENDS_PER_DAY", DEFAULT_RANDOM_SENDS_PER_DAY)),
         quote_language=os.getenv("QUOTE_LANGUAGE", "both"),
+        timezone=os.getenv("TIMEZONE", DEFAULT_TIMEZONE),
+        schedule_seed=os.getenv("SCHEDULE_SEED", ""),
+        scheduler_state_backend=os.getenv("SCHEDULER_STATE_BACKEND", "json"),
+        catchup_policy=os.getenv("CATCHUP_POLICY", "coalesce"),
+        trace_exporter=os.getenv("TRACE_EXPORTER", "none"),
+        metrics_port=int(os.getenv("METRICS_PORT", DEFAULT_METRICS_PORT)),
+        telegram_base_url=os.getenv("TELEGRAM_BASE_URL", DEFAULT_TELEGRAM_BASE_URL),
+        anthropic_base_url=os.getenv("ANTHROPIC_BASE_URL", ""),
+        ai_daily_token_budget=int(os.getenv("AI_DAILY_TOKEN_BUDGET", DEFAULT_AI_DAILY_TOKEN_BUDGET)),
+        ai_timeout_seconds=float(os.getenv("AI_TIMEOUT_SECONDS", DEFAULT_AI_TIMEOUT_SECONDS)),
+        ai_hedge_ms=int(os.getenv("AI_HEDGE_MS", 0)),
+        ai_streaming=os.getenv("AI_STREAMING", "false").lower() in ("1", "true", "yes"),
+        quote_cards=os.getenv("QUOTE_CARDS", "false").lower() in ("1", "true", "yes"),
+        feedback_file=Path(os.getenv("FEEDBACK_FILE") or DEFAULT_FEEDBACK_FILE),
+        token_usage_file=Path(os.getenv("TOKEN_USAGE_FILE") or DEFAULT_TOKEN_USAGE_FILE),
     )
 
 
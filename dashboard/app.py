@@ -41,6 +41,11 @@ CUSTOM_CSS = """
 DATA_DIR = Path(__file__).parent.parent / "data"
 STATS_FILE = DATA_DIR / "stats.json"
 QUOTES_FILE = DATA_DIR / "quotes.json"
+LANGUAGES_DIR = DATA_DIR / "languages"
+SEND_INDEX_FILE = DATA_DIR / "send_index.sqlite"
+
+# Upcoming subscriber sends shown per page
+UPCOMING_PAGE_SIZE = 25
 
 # Default stats structure
 DEFAULT_STATS = {
@@ -81,6 +86,39 @@ def load_quotes() -> list:
     return []
 
 
+def load_languages():
+    """Load the languages defined in data/languages.
+
+    Returns:
+        LanguageRegistry giving the codes and display labels the bot uses
+    """
+    from bot.languages import LanguageRegistry
+
+    return LanguageRegistry(LANGUAGES_DIR)
+
+
+def load_upcoming_sends(offset: int, limit: int) -> tuple:
+    """Load one page of upcoming subscriber sends from the send index.
+
+    Args:
+        offset: Number of entries to skip
+        limit: Maximum number of entries to return
+
+    Returns:
+        Tuple of (list of (chat ID, send time) tuples, total entries)
+    """
+    if not SEND_INDEX_FILE.exists():
+        return [], 0
+
+    from bot.send_index import NextSendIndex
+
+    index = NextSendIndex(SEND_INDEX_FILE)
+    try:
+        return index.page(offset, limit), len(index)
+    finally:
+        index.close()
+
+
 def format_quote_for_display(quote: dict) -> str:
     """Format a quote for display.
 
@@ -133,11 +171,12 @@ def generate_ai_quote(language: str) -> str:
     return format_quote_for_display(quote)
 
 
-def render_sidebar(stats: dict):
+def render_sidebar(stats: dict, languages):
     """Render the sidebar with controls and quick stats.
 
     Args:
         stats: Statistics dictionary
+        languages: Language registry from load_languages()
     """
     with st.sidebar:
         st.header("⚙️ Controls")
@@ -162,7 +201,7 @@ def render_sidebar(stats: dict):
 
         # Generate AI quote
         st.subheader("Generate AI Quote")
-        language = st.selectbox("Language", ["both", "en", "th"])
+        language = st.selectbox("Language", languages.choices, format_func=languages.label)
         if st.button("🤖 Generate", use_container_width=True):
             with st.spinner("Generating..."):
                 st.success(generate_ai_quote(language))
@@ -294,11 +333,12 @@ def render_timeline_tab(stats: dict):
         st.info("No quote history yet")
 
 
-def render_history_tab(stats: dict):
+def render_history_tab(stats: dict, languages):
     """Render quote history tab with filters.
 
     Args:
         stats: Statistics dictionary
+        languages: Language registry from load_languages()
     """
     st.subheader("Quote History")
     if stats['history']:
@@ -307,7 +347,7 @@ def render_history_tab(stats: dict):
         with col1:
             source_filter = st.selectbox("Filter by Source", ["All", "local", "ai"])
         with col2:
-            lang_filter = st.selectbox("Filter by Language", ["All", "en", "th"])
+            lang_filter = st.selectbox("Filter by Language", ["All"] + languages.codes)
         with col3:
             period_filter = st.selectbox("Filter by Time", ["All", "morning", "evening"])
 
@@ -333,17 +373,18 @@ def render_history_tab(stats: dict):
         st.info("No quote history yet")
 
 
-def render_quotes_cache_tab(quotes: list):
+def render_quotes_cache_tab(quotes: list, languages):
     """Render local quote cache tab.
 
     Args:
         quotes: List of cached quotes
+        languages: Language registry from load_languages()
     """
     st.subheader("Local Quote Cache")
     st.info(f"Total quotes in cache: {len(quotes)}")
 
     # Language filter
-    lang_filter = st.selectbox("Filter by Language", ["All", "en", "th"], key="cache_filter")
+    lang_filter = st.selectbox("Filter by Language", ["All"] + languages.codes, key="cache_filter")
 
     filtered_quotes = quotes
     if lang_filter != "All":
@@ -351,12 +392,38 @@ def render_quotes_cache_tab(quotes: list):
 
     # Display quotes
     for quote in filtered_quotes:
-        lang_emoji = "🇬🇧" if quote.get('language') == 'en' else "🇹🇭"
-        with st.expander(f"{lang_emoji} {quote['text'][:50]}..."):
+        code = quote.get('language')
+        lang_label = languages.label(code) if code in languages else "🌐"
+        with st.expander(f"{lang_label} · {quote['text'][:50]}..."):
             st.markdown(format_quote_for_display(quote))
             st.caption(f"Language: {quote.get('language', 'unknown').upper()}")
 
 
+def render_upcoming_tab():
+    """Render upcoming per-subscriber sends, one page at a time."""
+    st.subheader("Upcoming Subscriber Sends")
+
+    page = st.number_input("Page", min_value=1, value=1, step=1)
+    entries, total = load_upcoming_sends((page - 1) * UPCOMING_PAGE_SIZE, UPCOMING_PAGE_SIZE)
+
+    if not total:
+        st.info("No subscribers yet")
+        return
+
+    st.caption(f"{total} subscriber(s) scheduled")
+    if entries:
+        st.dataframe(
+            pd.DataFrame(
+                [(chat_id, send_at.strftime('%Y-%m-%d %H:%M UTC')) for chat_id, send_at in entries],
+                columns=['Chat ID', 'Next Send']
+            ),
+            use_container_width=True,
+            hide_index=True
+        )
+    else:
+        st.info("No entries on this page")
+
+
 def main():
     """Main dashboard function."""
     st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
@@ -366,16 +433,19 @@ def main():
     # Load data
     stats = load_stats()
     quotes = load_quotes()
+    languages = load_languages()
 
     # Render sidebar
-    render_sidebar(stats)
+    render_sidebar(stats, languages)
 
     # Render main metrics
     render_metrics(stats)
     st.markdown("---")
 
     # Render tabs
-    tab1, tab2, tab3, tab4 = st.tabs(["📈 Overview", "🕐 Timeline", "💬 Quote History", "📚 Local Quotes"])
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(
+        ["📈 Overview", "🕐 Timeline", "💬 Quote History", "📚 Local Quotes", "📅 Upcoming"]
+    )
 
     with tab1:
         render_overview_tab(stats)
@@ -384,10 +454,13 @@ def main():
         render_timeline_tab(stats)
 
     with tab3:
-        render_history_tab(stats)
+        render_history_tab(stats, languages)
 
     with tab4:
-        render_quotes_cache_tab(quotes)
+        render_quotes_cache_tab(quotes, languages)
+
+    with tab5:
+        render_upcoming_tab()
 
 
 if __name__ == "__main__":
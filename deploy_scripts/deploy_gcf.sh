@@ -130,7 +130,7 @@ gcloud functions deploy "$FUNCTION_NAME" \
     --entry-point=send_daily_quote \
     --requirements-file=gcf_requirements.txt \
     --allow-unauthenticated \
-    --set-env-vars=TELEGRAM_BOT_TOKEN="$TELEGRAM_BOT_TOKEN",TELEGRAM_CHAT_ID="$TELEGRAM_CHAT_ID",ANTHROPIC_API_KEY="$ANTHROPIC_API_KEY" \
+    --set-env-vars=TELEGRAM_BOT_TOKEN="$TELEGRAM_BOT_TOKEN",TELEGRAM_CHAT_ID="$TELEGRAM_CHAT_ID",ANTHROPIC_API_KEY="$ANTHROPIC_API_KEY",FEEDBACK_FILE=/tmp/feedback.sqlite,TOKEN_USAGE_FILE=/tmp/token_usage.sqlite \
     --memory=256MB \
     --timeout=60s \
     --max-instances=1
@@ -0,0 +1,41 @@
+"""Compile data/quotes.json into the binary corpus the bot samples from.
+
+Run after editing quotes.json (the bot falls back to the JSON file while the
+compiled corpus is missing or older than it):
+    python -m scripts.compile_quotes
+    python -m scripts.compile_quotes --source big_quotes.json --dest big_quotes.bin
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from bot.corpus import CORPUS_SUFFIX, compile_corpus
+from config.settings import BASE_DIR
+
+DEFAULT_SOURCE = BASE_DIR / "data" / "quotes.json"
+
+
+def main() -> int:
+    """Compile the corpus from the command line."""
+    parser = argparse.ArgumentParser(description="Compile quotes.json into a binary corpus")
+    parser.add_argument("--source", type=Path, default=DEFAULT_SOURCE, help="JSON source file")
+    parser.add_argument("--dest", type=Path, default=None,
+                        help=f"Compiled corpus (defaults to the source with a {CORPUS_SUFFIX} suffix)")
+    args = parser.parse_args()
+
+    dest = args.dest or args.source.with_suffix(CORPUS_SUFFIX)
+    start = time.perf_counter()
+    try:
+        count = compile_corpus(args.source, dest)
+    except (OSError, ValueError) as e:
+        print(f"Error compiling {args.source}: {e}")
+        return 1
+
+    print(f"Compiled {count} quotes into {dest} "
+          f"({dest.stat().st_size / 1024:.1f} KiB, {time.perf_counter() - start:.2f} s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,62 +3,89 @@
 This module handles HTTP requests from Google Cloud Scheduler to send quotes.
 Stateless implementation - no database or persistent scheduler used.
 """
+import asyncio
 import logging
 import random
-from datetime import datetime
+from datetime import date, datetime
+from functools import lru_cache
+from typing import List, Tuple
 
 from flask import jsonify, request
+from telegram import Bot
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Import our bot modules
+from bot import tracing
 from bot.quote_generator import get_quote
-from bot.telegram_bot import send_quote_sync
-from config.settings import load_config
+from bot.telegram_bot import get_bot, get_event_loop, send_quote_to_chat
+from config.settings import RANDOM_HOUR_MAX, RANDOM_HOUR_MIN, load_config
 
-# Random scheduling configuration
-RANDOM_HOUR_MIN = 10
-RANDOM_HOUR_MAX = 17
+# Overall time budget for one invocation's sends, kept below the
+# Cloud Function timeout (60s) so partial results are still returned
+SEND_DEADLINE_SECONDS = 50
 
 
-def should_send_random_quote(hour: int) -> bool:
+@lru_cache(maxsize=16)
+def get_random_hours_for_day(day: date, sends_per_day: int = 1) -> Tuple[int, ...]:
+    """Select the hours at which random quotes are sent on a given day.
+
+    Uses a dedicated generator seeded with the date, so every invocation on
+    the same day agrees on the selection without touching the global
+    ``random`` state used for quote selection.
+
+    Args:
+        day: Date to compute the schedule for
+        sends_per_day: Number of distinct hours to select
+
+    Returns:
+        Sorted tuple of selected hours (at most one per hour in the window)
+    """
+    hours = range(RANDOM_HOUR_MIN, RANDOM_HOUR_MAX + 1)
+    rng = random.Random(day.isoformat())
+    return tuple(sorted(rng.sample(hours, min(sends_per_day, len(hours)))))
+
+
+def should_send_random_quote(hour: int, sends_per_day: int = 1) -> bool:
     """Determine if we should send a quote at this hour (for random scheduling).
 
-    Uses the date as a seed so we get the same result for all hours on the same day.
-    Only ONE hour per day will return True.
+    The selection depends only on the date, so all hours on the same day
+    see the same schedule. Exactly ``sends_per_day`` hours return True.
 
     Args:
         hour: Hour of day (0-23)
+        sends_per_day: Number of random sends per day
 
     Returns:
-        True if this is the selected hour for today, False otherwise
+        True if this is one of the selected hours for today, False otherwise
     """
-    today = datetime.now().date()
-    # Use date as seed to get consistent random number across all hours today
-    random.seed(today.isoformat())
-    selected_hour = random.randint(RANDOM_HOUR_MIN, RANDOM_HOUR_MAX)
+    selected_hours = get_random_hours_for_day(datetime.now().date(), sends_per_day)
 
-    logger.info(f"Random quote scheduled for today at {selected_hour}:00, current hour: {hour}")
-    return hour == selected_hour
+    logger.info(f"Random quotes scheduled for today at {selected_hours}, current hour: {hour}")
+    return hour in selected_hours
 
 
-def send_quote_for_period(time_period: str, config) -> dict:
-    """Send a quote for a specific time period.
+async def _send_quote_for_period_async(time_period: str, config, bot: Bot) -> dict:
+    """Generate and send a quote for a specific time period.
 
     Args:
         time_period: 'morning', 'evening', or 'random'
         config: Configuration object
+        bot: Shared Telegram Bot instance
 
     Returns:
-        Dictionary with 'period', 'status', and optional 'error' or 'hour' keys
+        Dictionary with 'period', 'status', and optional 'error' key
     """
     logger.info(f"Sending {time_period} quote...")
 
     try:
-        quote = get_quote(language=config.quote_language)
-        success = send_quote_sync(quote, time_period=time_period)
+        with tracing.span('send_period', time_period=time_period):
+            # Quote generation is blocking (Anthropic SDK), so run it off the loop
+            quote = await asyncio.to_thread(get_quote, language=config.quote_language,
+                                            time_period=time_period)
+            success = await send_quote_to_chat(quote, time_period=time_period, bot=bot)
 
         if success:
             logger.info(f"{time_period.capitalize()} quote sent successfully")
@@ -72,23 +99,45 @@ def send_quote_for_period(time_period: str, config) -> dict:
         return {'period': time_period, 'status': 'failed', 'error': str(e)}
 
 
-def check_and_send_random_quote(hour: int, config) -> dict:
-    """Check if random quote should be sent and send it if appropriate.
+async def send_quotes_for_periods(periods: List[str], config,
+                                  deadline: float = SEND_DEADLINE_SECONDS) -> List[dict]:
+    """Send quotes for several time periods concurrently.
+
+    All periods run on the same event loop and share its Bot, whose
+    connection pool has room for every period's send and is reused by
+    later invocations of a warm instance.
+    Periods that have not finished when the deadline expires are cancelled
+    and reported as failed, so the caller can still return partial results
+    before the function timeout.
 
     Args:
-        hour: Current hour of day
+        periods: Time periods to send ('morning', 'evening', 'random')
         config: Configuration object
+        deadline: Overall time budget in seconds
 
     Returns:
-        Dictionary with result information
+        List of result dictionaries in the same order as ``periods``
     """
-    logger.info(f"Checking random quote schedule for hour {hour}...")
-
-    if should_send_random_quote(hour):
-        return send_quote_for_period('random', config)
-
-    logger.info("Not the randomly selected hour for today, skipping...")
-    return {'period': 'random', 'hour': hour, 'status': 'skipped', 'message': 'Not selected hour'}
+    bot = get_bot(config)
+    tasks = [
+        asyncio.create_task(_send_quote_for_period_async(period, config, bot))
+        for period in periods
+    ]
+
+    _, pending = await asyncio.wait(tasks, timeout=deadline)
+    for task in pending:
+        task.cancel()
+    # Let the cancellations finish so no task outlives this invocation
+    await asyncio.gather(*pending, return_exceptions=True)
+
+    results = []
+    for period, task in zip(periods, tasks):
+        if task in pending:
+            logger.error(f"Deadline exceeded sending {period} quote")
+            results.append({'period': period, 'status': 'failed', 'error': 'Deadline exceeded'})
+        else:
+            results.append(task.result())
+    return results
 
 
 def send_daily_quote(request):
@@ -110,23 +159,38 @@ def send_daily_quote(request):
     try:
         config = load_config()
         logger.info(f"Configuration loaded: {config.schedule_window}")
+        tracing.configure_tracing(config.trace_exporter, config.trace_file)
 
         time_period = request.args.get('period', 'both')
         current_hour = request.args.get('hour', datetime.now().hour, type=int)
 
         results = []
+        periods = []
 
-        # Process morning quote
+        # Collect morning quote
         if time_period in ('morning', 'both') and config.schedule_window in ('morning', 'both'):
-            results.append(send_quote_for_period('morning', config))
+            periods.append('morning')
 
-        # Process evening quote
+        # Collect evening quote
         if time_period in ('evening', 'both') and config.schedule_window in ('evening', 'both'):
-            results.append(send_quote_for_period('evening', config))
+            periods.append('evening')
 
-        # Process random quote
+        # Collect random quote
         if time_period == 'random':
-            results.append(check_and_send_random_quote(current_hour, config))
+            logger.info(f"Checking random quote schedule for hour {current_hour}...")
+            if should_send_random_quote(current_hour, config.random_sends_per_day):
+                periods.append('random')
+            else:
+                logger.info("Not the randomly selected hour for today, skipping...")
+                results.append({'period': 'random', 'hour': current_hour,
+                                'status': 'skipped', 'message': 'Not selected hour'})
+
+        # Send all collected periods concurrently under one trace
+        if periods:
+            with tracing.span('gcf.send_daily_quote', periods=",".join(periods)):
+                results.extend(get_event_loop().run_until_complete(
+                    send_quotes_for_periods(periods, config)
+                ))
 
         logger.info(f"Cloud Function completed: {results}")
 
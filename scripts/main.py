@@ -7,6 +7,8 @@ import signal
 import sys
 from typing import Optional
 
+from bot.metrics import start_metrics_server
+from bot.tracing import configure_tracing
 from bot.telegram_bot import run_bot
 from bot.scheduler import get_scheduler, QuoteScheduler
 from config.settings import load_config, Config
@@ -66,6 +68,13 @@ def main():
         logger.info(f"  Schedule window: {config.schedule_window}")
         logger.info(f"  Quote language: {config.quote_language}")
 
+        # Export tracing spans if enabled
+        configure_tracing(config.trace_exporter, config.trace_file)
+
+        # Expose metrics on a local endpoint
+        if config.metrics_port:
+            start_metrics_server(config.metrics_port)
+
         # Setup scheduler
         logger.info("Setting up scheduler...")
         global _scheduler
@@ -0,0 +1,27 @@
+"""Shared setup for the test suite."""
+import os
+
+import pytest
+
+# Tests never talk to real services, but importing the bot needs a complete
+# configuration
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "123456:test")
+os.environ.setdefault("TELEGRAM_CHAT_ID", "1")
+os.environ.setdefault("ANTHROPIC_API_KEY", "test")
+
+# Configured data files the bot writes at run time, redirected so tests never
+# touch data/
+DATA_FILES = ('stats_file', 'scheduler_state_file', 'subscribers_file', 'send_index_file',
+              'feedback_file', 'token_usage_file', 'profiles_file', 'cards_dir', 'trace_file')
+
+
+@pytest.fixture(autouse=True, scope="session")
+def data_dir(tmp_path_factory):
+    """Point every writable data file at a temporary directory."""
+    from config.settings import config
+
+    data_dir = tmp_path_factory.mktemp("data")
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        for name in DATA_FILES:
+            monkeypatch.setattr(config, name, data_dir / getattr(config, name).name)
+        yield data_dir
@@ -0,0 +1,118 @@
+"""Replay of slots missed while the scheduler was down, against a fake clock."""
+from datetime import date, datetime, timedelta
+
+import pytest
+from apscheduler.events import EVENT_JOB_EXECUTED, JobExecutionEvent
+from apscheduler.triggers.cron import CronTrigger
+from apscheduler.util import localize
+
+from bot.job_state import MemoryJobStateStore
+from bot.scheduler import (
+    CATCHUP_INTERVAL_SECONDS,
+    CATCHUP_MAX_AGE,
+    CATCHUP_MAX_SENDS,
+    JOBS,
+    QuoteScheduler,
+    send_scheduled_quote,
+)
+
+# Day the fake clock is set to; away from daylight saving changes
+DAY = date(2026, 6, 10)
+
+# Job fired every hour, so several of its slots fall within CATCHUP_MAX_AGE
+HOURLY_JOB = 'hourly_quote'
+
+# Job that has never fired and must be ignored
+NEW_JOB = 'new_quote'
+
+
+@pytest.fixture
+def scheduler():
+    """Paused scheduler with the morning, evening and hourly jobs.
+
+    The process has been down since yesterday evening's sends: the morning
+    job's last slot is two days back, so yesterday's morning slot is
+    already too old to replay.
+    """
+    scheduler = QuoteScheduler(state_store=MemoryJobStateStore())
+    scheduler.scheduler.pause()
+    scheduler._schedule_quote('morning', '07:00', '09:00')
+    scheduler._schedule_quote('evening', '19:00', '21:00')
+    timezone = scheduler.scheduler.timezone
+    for job_id in (HOURLY_JOB, NEW_JOB):
+        scheduler.scheduler.add_job(send_scheduled_quote, CronTrigger(minute=0, timezone=timezone),
+                                    args=['hourly'], id=job_id, name=job_id)
+
+    jobs = {job.id: job for job in scheduler.scheduler.get_jobs()}
+    scheduler.morning = jobs[JOBS['morning']['id']].trigger.get_fire_time_for_day
+    evening = jobs[JOBS['evening']['id']].trigger.get_fire_time_for_day
+    scheduler.now = localize(datetime.combine(DAY, datetime.min.time()), timezone) + timedelta(hours=12)
+
+    state = scheduler.state_store
+    state.set_last_fired(JOBS['morning']['id'], scheduler.morning(DAY - timedelta(days=2)))
+    state.set_last_fired(JOBS['evening']['id'], evening(DAY - timedelta(days=1)))
+    state.set_last_fired(HOURLY_JOB, scheduler.now - timedelta(hours=16))
+    yield scheduler
+    scheduler.shutdown()
+
+
+def expected_missed(scheduler) -> list:
+    """Get the slots the fixture's jobs missed, oldest first."""
+    # Hourly slots after the 12-hour cutoff (midnight) and before now
+    missed = [(HOURLY_JOB, scheduler.now - timedelta(hours=hours)) for hours in range(11, 0, -1)]
+    missed.append((JOBS['morning']['id'], scheduler.morning(DAY)))
+    return sorted(missed, key=lambda item: item[1])
+
+
+def catchup_runs(scheduler) -> list:
+    """Get the catch-up jobs scheduled, in run order, as (job ID, slot, run time)."""
+    jobs = [job for job in scheduler.scheduler.get_jobs() if job.id in scheduler._catchup_jobs]
+    jobs.sort(key=lambda job: job.trigger.run_date)
+    return [scheduler._catchup_jobs[job.id] + (job.trigger.run_date,) for job in jobs]
+
+
+def run_catchups(scheduler):
+    """Simulate every scheduled catch-up job running."""
+    for job in scheduler.scheduler.get_jobs():
+        if job.id in scheduler._catchup_jobs:
+            scheduler._on_job_executed(JobExecutionEvent(
+                EVENT_JOB_EXECUTED, job.id, 'default', job.trigger.run_date
+            ))
+
+
+def test_find_missed_runs(scheduler):
+    assert scheduler.find_missed_runs(scheduler.now) == expected_missed(scheduler)
+
+
+def test_slot_older_than_max_age_ignored(scheduler):
+    too_old = (JOBS['morning']['id'], scheduler.morning(DAY - timedelta(days=1)))
+    assert scheduler.now - too_old[1] > CATCHUP_MAX_AGE
+    assert too_old not in scheduler.find_missed_runs(scheduler.now)
+
+
+def test_job_that_never_fired_ignored(scheduler):
+    assert NEW_JOB not in {job_id for job_id, _ in scheduler.find_missed_runs(scheduler.now)}
+
+
+@pytest.mark.parametrize('policy', ['coalesce', 'all', 'skip'])
+def test_replay_missed_runs(scheduler, policy):
+    missed = expected_missed(scheduler)
+    latest = dict(missed)
+    if policy == 'coalesce':
+        expected = sorted(latest.items(), key=lambda item: item[1])
+    elif policy == 'all':
+        expected = missed[-CATCHUP_MAX_SENDS:]
+    else:
+        expected = []
+
+    assert scheduler.replay_missed_runs(policy, now=scheduler.now) == expected
+    assert catchup_runs(scheduler) == [
+        (job_id, slot, scheduler.now + timedelta(seconds=i * CATCHUP_INTERVAL_SECONDS))
+        for i, (job_id, slot) in enumerate(expected)
+    ]
+
+    run_catchups(scheduler)
+    state = scheduler.state_store.all_last_fired()
+    assert {job_id: state.get(job_id) for job_id in latest} == latest
+    assert [job_id for job_id in state if '_catchup_' in job_id] == []
+    assert scheduler.find_missed_runs(scheduler.now) == []
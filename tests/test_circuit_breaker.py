@@ -0,0 +1,83 @@
+"""Circuit breaker state changes against a fake clock."""
+import pytest
+
+from bot.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+class FakeClock:
+    """Monotonic clock that only moves when told to."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker(failure_threshold=3, reset_timeout=60.0, half_open_max_calls=1, clock=clock)
+
+
+def trip(breaker):
+    """Fail calls until the breaker opens."""
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+
+def test_opens_after_consecutive_failures(breaker):
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+
+
+def test_success_resets_failure_count(breaker):
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+def test_half_open_after_reset_timeout(breaker, clock):
+    trip(breaker)
+    clock.now += 59.9
+    assert breaker.state == OPEN
+
+    clock.now += 0.1
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+
+def test_successful_probe_closes(breaker, clock):
+    trip(breaker)
+    clock.now += 60.0
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow_request()
+
+
+def test_failed_probe_reopens_for_another_timeout(breaker, clock):
+    trip(breaker)
+    clock.now += 60.0
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    clock.now += 59.9
+    assert not breaker.allow_request()
+    clock.now += 0.1
+    assert breaker.state == HALF_OPEN
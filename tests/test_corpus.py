@@ -0,0 +1,39 @@
+"""Compiled, memory-mapped quote corpus."""
+import json
+
+import pytest
+
+from bot.corpus import QuoteCorpus, compile_corpus
+from bot.quote import Quote
+from bot.tag_index import TagIndex
+
+# quotes.json entries, one without a language or author
+QUOTES = [
+    {'text': "Rise and shine.", 'author': "Anon", 'language': 'en', 'tags': ['morning']},
+    {'text': "No language given."},
+    {'text': "ราตรีสวัสดิ์", 'author': "ไม่ระบุ", 'language': 'th', 'tags': ['evening', 'calm']},
+]
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    source = tmp_path / "quotes.json"
+    source.write_text(json.dumps({'quotes': QUOTES}), encoding='utf-8')
+    assert compile_corpus(source, tmp_path / "quotes.bin") == len(QUOTES)
+    corpus = QuoteCorpus(tmp_path / "quotes.bin")
+    yield corpus
+    corpus.close()
+
+
+def test_corpus_matches_tag_index(corpus):
+    index = TagIndex(Quote.from_dict(data) for data in QUOTES)
+    for language in ('en', 'th', 'both'):
+        for tag in (None, 'morning', 'evening', 'calm', 'short'):
+            assert corpus.count(language, tag) == index.count(language, tag)
+            for position in range(corpus.count(language, tag)):
+                assert corpus.pick(language, tag, position) == index.pick(language, tag, position)
+
+
+def test_missing_language_defaults_like_quotes_json(corpus):
+    assert corpus.count('en') == 2
+    assert corpus.pick('en', None, 1) == Quote("No language given.", "Unknown", "en")
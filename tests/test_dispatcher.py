@@ -0,0 +1,139 @@
+"""Per-subscriber dispatch and the next-send index."""
+from datetime import datetime, time, timedelta, timezone
+
+import pytest
+
+import bot.dispatcher as dispatcher_module
+from bot.dispatcher import DISPATCH_MAX_LATENESS, SubscriberDispatcher
+from bot.profiles import ChatProfile, ProfileStore
+from bot.quote import Quote
+from bot.send_index import NextSendIndex
+from bot.subscribers import Subscriber, SubscriberStore
+
+# Start of the day every dispatcher under test is created on
+START = datetime(2026, 6, 10, tzinfo=timezone.utc)
+
+
+def at(hours: float) -> datetime:
+    """Get the time some hours after START."""
+    return START + timedelta(hours=hours)
+
+
+def test_index_pops_due_entries_in_order():
+    index = NextSendIndex()
+    index.set_many([('a', at(3)), ('b', at(1)), ('c', at(5))])
+    index.set('a', at(2))
+    assert index.pop_due(at(2.5)) == [('b', at(1)), ('a', at(2))]
+    assert index.pop_due(at(2.5)) == []
+    assert index.chat_ids() == ['c']
+
+
+def test_index_pages_and_removes():
+    index = NextSendIndex()
+    index.set_many([(str(i), at(i)) for i in range(5)])
+    assert index.page(1, 2) == [('1', at(1)), ('2', at(2))]
+    index.remove('0')
+    assert len(index) == 4
+    assert index.page(0, 1) == [('1', at(1))]
+
+
+def test_index_persists(tmp_path):
+    NextSendIndex(tmp_path / "index.sqlite").set('a', at(1))
+    assert NextSendIndex(tmp_path / "index.sqlite").page() == [('a', at(1))]
+
+
+class Sends:
+    """Quotes generated and sends made by the dispatcher under test."""
+
+    def __init__(self):
+        self.quotes = []
+        self.deliveries = []
+
+    def get_quote(self, language, topics=()):
+        self.quotes.append((language, tuple(topics)))
+        return Quote(f"A quote in {language}.", language='th' if language == 'th' else 'en')
+
+    async def send_quotes_to_chats(self, deliveries, time_period="unknown"):
+        self.deliveries.extend(chat_id for chat_id, _ in deliveries)
+        return [True] * len(deliveries)
+
+
+@pytest.fixture
+def sends(monkeypatch):
+    sends = Sends()
+    profiles = ProfileStore()
+    monkeypatch.setattr(dispatcher_module, 'get_quote', sends.get_quote)
+    monkeypatch.setattr(dispatcher_module, 'send_quotes_to_chats', sends.send_quotes_to_chats)
+    monkeypatch.setattr(dispatcher_module, 'get_profile_store', lambda: profiles)
+    sends.profiles = profiles
+    return sends
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Three subscribers: two morning ones in UTC, one evening one in Bangkok."""
+    store = SubscriberStore(tmp_path / "subscribers.json")
+    store.add(Subscriber('1', 'UTC', '07:00', '09:00', 'en'))
+    store.add(Subscriber('2', 'UTC', '07:00', '09:00', 'en'))
+    store.add(Subscriber('3', 'Asia/Bangkok', '19:00', '20:00', 'th'))
+    return store
+
+
+@pytest.fixture
+def dispatcher(store, sends):
+    return SubscriberDispatcher(store, NextSendIndex(), now=START)
+
+
+def local_time(dispatcher, chat_id) -> datetime:
+    """Get a subscriber's next send time in their own timezone."""
+    send_at = dict(dispatcher.upcoming(limit=100))[chat_id]
+    return send_at.astimezone(dispatcher._make_trigger(dispatcher.store.get(chat_id)).timezone)
+
+
+def test_subscribers_indexed_inside_their_window(dispatcher):
+    assert len(dispatcher) == 3
+    for chat_id in ('1', '2'):
+        assert time(7) <= local_time(dispatcher, chat_id).time() <= time(9)
+    assert time(19) <= local_time(dispatcher, '3').time() <= time(20)
+
+
+def test_tick_sends_due_subscribers_once_a_day(dispatcher, sends):
+    assert dispatcher.tick(at(6)) == 0
+    assert dispatcher.tick(at(10)) == 2
+    assert sorted(sends.deliveries) == ['1', '2']
+    assert sends.quotes == [('en', ())]
+    assert dispatcher.tick(at(10)) == 0
+
+    for chat_id in ('1', '2'):
+        assert local_time(dispatcher, chat_id).date() == (START + timedelta(days=1)).date()
+
+
+def test_profile_language_overrides_subscription(dispatcher, sends):
+    sends.profiles.save(ChatProfile('2', 'th', ('calm',)))
+    dispatcher.tick(at(10))
+    assert sorted(sends.quotes) == [('en', ()), ('th', ('calm',))]
+
+
+def test_overdue_sends_are_skipped_and_rescheduled(dispatcher, sends):
+    late = at(9) + DISPATCH_MAX_LATENESS + timedelta(minutes=1)
+    assert dispatcher.tick(late) == 1
+    assert sends.deliveries == ['3']
+    for chat_id in ('1', '2'):
+        assert dict(dispatcher.upcoming())[chat_id] > late
+
+
+def test_changes_from_another_process_are_rescheduled(dispatcher, store):
+    listener = SubscriberStore(store.subscribers_file)
+    listener.add(Subscriber('1', 'UTC', '20:00', '21:00', 'en'))
+    listener.add(Subscriber('4', 'UTC', '07:00', '09:00', 'en'))
+    listener.remove('2')
+
+    assert dispatcher.tick(at(6)) == 0
+    assert sorted(dict(dispatcher.upcoming()).keys()) == ['1', '3', '4']
+    assert time(20) <= local_time(dispatcher, '1').time() <= time(21)
+
+
+def test_unsubscribe_removes_indexed_send(dispatcher):
+    assert dispatcher.unsubscribe('1')
+    assert '1' not in dict(dispatcher.upcoming())
+    assert not dispatcher.unsubscribe('1')
@@ -0,0 +1,61 @@
+"""Quote reactions and Thompson-sampling selection."""
+import random
+import sqlite3
+from collections import Counter
+
+import pytest
+
+from bot.feedback import FeedbackStore, thompson_pick
+from bot.quote import Quote
+
+
+def test_reactions_count_once_per_user():
+    store = FeedbackStore()
+    assert store.record('q1', 'alice', 'like') == (1, 0)
+    assert store.record('q1', 'alice', 'like') == (1, 0)
+    assert store.record('q1', 'bob', 'like') == (2, 0)
+    assert store.record('q1', 'alice', 'dislike') == (1, 1)
+    assert store.scores('q1') == (1, 1)
+    assert store.scores('q2') == (0, 0)
+    assert len(store) == 1
+
+
+def test_unknown_reaction_rejected():
+    with pytest.raises(ValueError):
+        FeedbackStore().record('q1', 'alice', 'love')
+
+
+def test_reactions_from_another_process_are_picked_up(tmp_path):
+    bot_store = FeedbackStore(tmp_path / "feedback.sqlite")
+    sender_store = FeedbackStore(tmp_path / "feedback.sqlite")
+    assert len(sender_store) == 0
+    bot_store.record('q1', 'alice', 'like')
+    assert len(sender_store) == 1
+    assert sender_store.scores('q1') == (1, 0)
+
+
+def test_unavailable_database_keeps_selection_uniform(tmp_path):
+    (tmp_path / "file").write_text("")
+    store = FeedbackStore(tmp_path / "file" / "feedback.sqlite")
+    assert len(store) == 0
+    with pytest.raises(sqlite3.Error):
+        store.record('q1', 'alice', 'like')
+
+
+def test_thompson_pick_without_feedback_explores():
+    candidates = [Quote(f"Quote {i}.") for i in range(4)]
+    rng = random.Random(5)
+    assert {thompson_pick(candidates, FeedbackStore(), rng) for _ in range(200)} == set(candidates)
+
+
+def test_thompson_pick_favours_liked_quotes():
+    liked, disliked, unrated = Quote("Liked."), Quote("Disliked."), Quote("Unrated.")
+    store = FeedbackStore()
+    for user in range(20):
+        store.record(liked.key, str(user), 'like')
+        store.record(disliked.key, str(user), 'dislike')
+
+    rng = random.Random(6)
+    picks = Counter(thompson_pick([disliked, unrated, liked], store, rng) for _ in range(1000))
+    assert picks[liked] > 900
+    assert picks[disliked] == 0
@@ -0,0 +1,73 @@
+"""Quote escaping against recorded adversarial AI outputs and the fake Telegram parser."""
+import html
+import json
+import re
+from pathlib import Path
+
+import pytest
+
+import bot.telegram_bot as telegram_bot
+from benchmarks import fake_telegram
+from bot.markup import BOLD, bold, escape
+from bot.quote import Quote
+from config.settings import config
+
+RECORDINGS_FILE = Path(__file__).parent.parent / "benchmarks" / "recordings" / "adversarial_quotes.json"
+
+# Quotes whose text or author contains characters Telegram treats as markup
+RECORDINGS = json.loads(RECORDINGS_FILE.read_text(encoding='utf-8'))['quotes']
+
+# Inverse of the MarkdownV2 escaper
+_MARKDOWN_V2_ESCAPE = re.compile(r"\\(.)", re.DOTALL)
+
+UNESCAPE = {
+    'MarkdownV2': lambda text: _MARKDOWN_V2_ESCAPE.sub(r"\1", text),
+    'HTML': html.unescape,
+}
+
+
+@pytest.fixture
+def fake_server(monkeypatch):
+    """Fake Telegram server the bot sends to."""
+    server = fake_telegram.start_fake_telegram(port=0)
+    monkeypatch.setattr(config, 'telegram_base_url', fake_telegram.base_url(server))
+    yield server
+    server.shutdown()
+
+
+def send_all(quotes) -> int:
+    """Send quotes to one chat each and count the successful sends."""
+    deliveries = [(str(100000 + i), quote) for i, quote in enumerate(quotes)]
+    loop = telegram_bot.get_event_loop()
+    return sum(loop.run_until_complete(telegram_bot.send_quotes_to_chats(deliveries)))
+
+
+@pytest.mark.parametrize('parse_mode', sorted(UNESCAPE))
+@pytest.mark.parametrize('recording', RECORDINGS, ids=[r['name'] for r in RECORDINGS])
+def test_formatted_quote_parses_and_round_trips(recording, parse_mode):
+    text, author = recording['text'], recording['author']
+    message = f"🌟 {bold(text, parse_mode)}\n\n— {escape(author, parse_mode)}"
+    assert fake_telegram.markup_error(message, parse_mode) is None
+
+    start, end = BOLD[parse_mode]
+    unescape = UNESCAPE[parse_mode]
+    assert unescape(bold(text, parse_mode)[len(start):-len(end)]) == text
+    assert unescape(escape(author, parse_mode)) == author
+
+
+def test_escaped_sends_are_accepted(fake_server):
+    quotes = [Quote(recording['text'], recording['author']) for recording in RECORDINGS]
+    assert send_all(quotes) == len(quotes)
+    assert fake_server.state.counts['parse_errors'] == 0
+
+
+def test_unescaped_sends_fall_back_to_plain_text(fake_server, monkeypatch):
+    monkeypatch.setattr(telegram_bot, 'escape', lambda text, parse_mode: text)
+    monkeypatch.setattr(telegram_bot, 'bold', lambda text, parse_mode: f"*{text}*")
+    telegram_bot._prepared_message.cache_clear()
+    try:
+        quotes = [Quote(recording['text'], recording['author']) for recording in RECORDINGS]
+        assert send_all(quotes) == len(quotes)
+    finally:
+        telegram_bot._prepared_message.cache_clear()
+    assert fake_server.state.counts['parse_errors'] > 0
@@ -0,0 +1,59 @@
+"""Per-chat preference profiles."""
+import sqlite3
+
+import pytest
+
+import bot.profiles as profiles
+from bot.profiles import MAX_TOPICS, ChatProfile, ProfileStore
+from config.settings import config
+
+
+def test_chat_without_profile_gets_default():
+    profile = ProfileStore().get(42)
+    assert profile == ChatProfile('42')
+    assert profile.quote_language == config.quote_language
+
+
+def test_saved_profile_is_returned():
+    store = ProfileStore()
+    store.save(ChatProfile('42', 'th', ('calm', 'work')))
+    assert store.get('42') == ChatProfile('42', 'th', ('calm', 'work'))
+    assert store.get('42').quote_language == 'th'
+    assert len(store) == 1
+
+
+def test_profile_survives_cache_eviction():
+    store = ProfileStore(cache_size=1)
+    store.save(ChatProfile('1', 'en'))
+    store.get('2')
+    assert store.get('1') == ChatProfile('1', 'en')
+
+
+def test_changes_from_another_process_are_picked_up(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiles, 'PROFILE_REFRESH_SECONDS', 0.0)
+    bot_store = ProfileStore(tmp_path / "profiles.sqlite")
+    sender_store = ProfileStore(tmp_path / "profiles.sqlite")
+    assert sender_store.get('42').language is None
+    bot_store.save(ChatProfile('42', 'th'))
+    assert sender_store.get('42').language == 'th'
+
+
+@pytest.mark.parametrize('language, topics', [
+    ('xx', ()),
+    (None, tuple(f"topic{i}" for i in range(MAX_TOPICS + 1))),
+    (None, ('a,b',)),
+    (None, ('',)),
+])
+def test_invalid_profile_rejected(language, topics):
+    with pytest.raises(ValueError):
+        ChatProfile('42', language, topics)
+
+
+def test_unavailable_database_gives_default_profiles(tmp_path):
+    (tmp_path / "file").write_text("")
+    store = ProfileStore(tmp_path / "file" / "profiles.sqlite")
+    assert store.get('42') == ChatProfile('42')
+    assert len(store) == 0
+    with pytest.raises(sqlite3.Error):
+        store.save(ChatProfile('42', 'th'))
+    assert store.get('42') == ChatProfile('42')
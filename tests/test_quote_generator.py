@@ -0,0 +1,90 @@
+"""Choice between local, AI and fallback quotes."""
+import json
+from datetime import date
+
+import pytest
+
+from benchmarks.fakes import FakeAnthropic
+from bot.feedback import FeedbackStore
+from bot.quote_generator import QuoteGenerator
+from bot.source_policy import SourcePolicy
+from bot.token_usage import TokenUsageStore
+
+# Budget day of every generator under test
+DAY = date(2026, 6, 10)
+
+
+class CountingAnthropic(FakeAnthropic):
+    """FakeAnthropic that counts its messages.create() calls."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+        create = self.messages.create
+
+        def counted(**kwargs):
+            self.calls += 1
+            return create(**kwargs)
+        self.messages.create = counted
+
+
+@pytest.fixture
+def generator(tmp_path):
+    """Generator with English local quotes only and a 1000-token budget."""
+    quotes_file = tmp_path / "quotes.json"
+    quotes = [{'text': f"Local quote number {i}.", 'author': "Tester", 'language': 'en',
+               'tags': ['morning'] if i % 2 else []} for i in range(10)]
+    quotes_file.write_text(json.dumps({'quotes': quotes}), encoding='utf-8')
+
+    usage = TokenUsageStore()
+    generator = QuoteGenerator(quotes_file, api_key="test", feedback=FeedbackStore(),
+                               token_usage=usage)
+    generator.client = CountingAnthropic()
+    generator.policy = SourcePolicy(1000, today=lambda: DAY, usage=usage)
+    generator.hedge_seconds = 0
+    generator.streaming = False
+    return generator
+
+
+def test_local_quote_from_pool(generator):
+    quote = generator.get_local_quote('en', time_period='morning')
+    assert quote.source == 'local'
+    assert quote.language == 'en'
+    assert generator.client.calls == 0
+
+
+def test_empty_pool_asks_ai_within_budget(generator):
+    quote = generator.get_local_quote('th')
+    assert quote.source == 'ai'
+    assert quote.language == 'th'
+    assert generator.client.calls == 1
+
+
+def test_empty_pool_with_spent_budget_sends_fallback(generator):
+    generator.policy.usage.add(DAY, 1000)
+    quote = generator.get_local_quote('th')
+    assert quote == generator.languages.get('th').fallback
+    assert generator.client.calls == 0
+
+
+def test_empty_pool_does_not_ask_ai_twice(generator):
+    def fail(**kwargs):
+        generator.client.calls += 1
+        raise RuntimeError("API down")
+    generator.client.messages.create = fail
+
+    quote = generator.get_quote(prefer_ai=True, language='th')
+    assert quote == generator.languages.get('th').fallback
+    assert generator.client.calls == 1
+
+
+def test_prefer_ai_skips_local_pool(generator):
+    assert generator.get_quote(prefer_ai=True, language='en').source == 'ai'
+    assert generator.client.calls == 1
+
+
+def test_open_breaker_falls_back_to_local(generator):
+    for _ in range(generator.breaker.failure_threshold):
+        generator.breaker.record_failure()
+    assert generator.get_quote(prefer_ai=True, language='en').source == 'local'
+    assert generator.client.calls == 0
@@ -0,0 +1,27 @@
+"""Extraction and validation of recorded complete AI responses."""
+import json
+from pathlib import Path
+
+import pytest
+
+from bot.languages import get_language_registry
+from bot.quote_schema import InvalidQuote, parse_quote_response
+
+RECORDINGS_FILE = Path(__file__).parent.parent / "benchmarks" / "recordings" / "ai_responses.json"
+
+# Responses with the quote expected from each, or the reason it is rejected for
+RESPONSES = json.loads(RECORDINGS_FILE.read_text(encoding='utf-8'))['responses']
+
+
+@pytest.mark.parametrize('recording', RESPONSES, ids=[r['name'] for r in RESPONSES])
+def test_recorded_response(recording):
+    language = get_language_registry().get(recording['language'])
+    if recording.get('reason'):
+        with pytest.raises(InvalidQuote) as excinfo:
+            parse_quote_response(recording['response'], language)
+        assert excinfo.value.reason == recording['reason']
+        assert recording['expected'] is None
+    else:
+        quote = parse_quote_response(recording['response'], language)
+        assert {'text': quote.text, 'author': quote.author,
+                'language': quote.language} == recording['expected']
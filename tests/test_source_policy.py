@@ -0,0 +1,87 @@
+"""AI share adaptation and the daily token budget."""
+import random
+from datetime import date
+
+import pytest
+
+from bot.source_policy import (
+    BASE_AI_SHARE,
+    LATENCY_TARGET_SECONDS,
+    MAX_AI_SHARE,
+    MIN_AI_SHARE,
+    SMALL_POOL_SIZE,
+    SourcePolicy,
+)
+from bot.token_usage import TokenUsageStore
+
+# Budget day of every policy under test
+DAY = date(2026, 6, 10)
+
+
+def make_policy(budget: int = 0, usage: TokenUsageStore = None) -> SourcePolicy:
+    return SourcePolicy(budget, today=lambda: DAY, usage=usage)
+
+
+def test_healthy_api_gets_base_share():
+    assert make_policy().ai_share(pool_size=SMALL_POOL_SIZE) == pytest.approx(BASE_AI_SHARE)
+
+
+def test_small_pool_raises_share():
+    policy = make_policy()
+    assert policy.ai_share(pool_size=0) == pytest.approx(MAX_AI_SHARE)
+    assert BASE_AI_SHARE < policy.ai_share(pool_size=SMALL_POOL_SIZE // 2) < MAX_AI_SHARE
+
+
+def test_slow_api_reduces_share_in_proportion():
+    policy = make_policy()
+    policy.record_success(LATENCY_TARGET_SECONDS * 2)
+    assert policy.ai_share() == pytest.approx(BASE_AI_SHARE / 2)
+
+
+def test_failing_api_keeps_probe_share():
+    policy = make_policy()
+    for _ in range(20):
+        policy.record_failure(1.0)
+    assert policy.ai_share() == pytest.approx(MIN_AI_SHARE)
+
+
+def test_share_tapers_over_last_part_of_budget():
+    policy = make_policy(budget=1000)
+    policy.record_success(1.0, input_tokens=500, output_tokens=400)
+    assert policy.ai_share() == pytest.approx(BASE_AI_SHARE / 2)
+    assert not policy.budget_exhausted()
+
+
+def test_spent_budget_stops_ai():
+    policy = make_policy(budget=1000)
+    policy.record_success(1.0, input_tokens=600, output_tokens=400)
+    assert policy.budget_exhausted()
+    assert policy.ai_share(pool_size=0) == 0.0
+    assert not any(policy.choose_ai(0, random.Random(seed)) for seed in range(100))
+
+
+def test_unlimited_budget_is_never_exhausted():
+    policy = make_policy()
+    policy.record_success(1.0, input_tokens=10 ** 9)
+    assert not policy.budget_exhausted()
+
+
+def test_budget_shared_through_usage_store(tmp_path):
+    first = make_policy(1000, TokenUsageStore(tmp_path / "usage.sqlite"))
+    second = make_policy(1000, TokenUsageStore(tmp_path / "usage.sqlite"))
+    first.record_success(1.0, input_tokens=700)
+    second.record_success(1.0, input_tokens=300)
+    assert first.tokens_used == second.tokens_used == 1000
+    assert first.budget_exhausted()
+
+
+def test_snapshot():
+    policy = make_policy(budget=1000)
+    policy.record_success(2.0, input_tokens=10, output_tokens=5)
+    assert policy.snapshot() == {
+        'latency': 2.0,
+        'error_rate': 0.0,
+        'tokens_used': 15,
+        'daily_token_budget': 1000,
+        'budget_day': DAY.isoformat(),
+    }
@@ -0,0 +1,23 @@
+"""Incremental quote parsing of recorded AI response streams."""
+import json
+from pathlib import Path
+
+import pytest
+
+from bot.stream_parser import QuoteStreamParser
+
+RECORDINGS_FILE = Path(__file__).parent.parent / "benchmarks" / "recordings" / "ai_streams.json"
+
+# Text deltas of streamed responses and the quote object expected from each
+STREAMS = json.loads(RECORDINGS_FILE.read_text(encoding='utf-8'))['streams']
+
+
+@pytest.mark.parametrize('stream', STREAMS, ids=[s['name'] for s in STREAMS])
+def test_recorded_stream(stream):
+    parser = QuoteStreamParser()
+    result = None
+    for chunk in stream['chunks']:
+        if parser.feed(chunk) is not None:
+            result = parser.result
+            break
+    assert result == stream['expected']
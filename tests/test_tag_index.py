@@ -0,0 +1,86 @@
+"""Alias sampling and weighted quote selection over tag buckets."""
+import random
+from collections import Counter
+
+import pytest
+
+from bot.quote import Quote
+from bot.tag_index import AliasSampler, TagIndex, TagSampler, index_tags, length_tag
+
+# Draws per distribution check; with a fixed seed the shares land well
+# within the tolerance below
+DRAWS = 20000
+
+
+def shares(counts: Counter) -> dict:
+    total = sum(counts.values())
+    return {key: count / total for key, count in counts.items()}
+
+
+@pytest.mark.parametrize('weights', [[1, 1], [1, 3], [0.5, 0, 2, 7.5], [5]])
+def test_alias_sampler_matches_weights(weights):
+    sampler = AliasSampler(weights)
+    rng = random.Random(1)
+    got = shares(Counter(sampler.sample(rng) for _ in range(DRAWS)))
+    for outcome, weight in enumerate(weights):
+        assert got.get(outcome, 0.0) == pytest.approx(weight / sum(weights), abs=0.015)
+
+
+@pytest.mark.parametrize('weights', [[], [0, 0], [1, -1]])
+def test_alias_sampler_rejects_bad_weights(weights):
+    with pytest.raises(ValueError):
+        AliasSampler(weights)
+
+
+def test_length_tags():
+    assert length_tag("x" * 40) == 'short'
+    assert length_tag("x" * 41) == 'medium'
+    assert length_tag("x" * 81) == 'long'
+    assert index_tags(Quote("Short.", tags=['calm', 'morning'])) == ('calm', 'morning', 'short')
+
+
+@pytest.fixture
+def quotes():
+    """Ten English quotes, two of them tagged 'morning', and one Thai quote."""
+    return ([Quote(f"English quote {i}.", tags=['morning'] if i < 2 else []) for i in range(10)]
+            + [Quote("คำคมภาษาไทย", language='th')])
+
+
+def test_tag_index_buckets(quotes):
+    index = TagIndex(quotes)
+    assert index.count('en') == 10
+    assert index.count('th') == 1
+    assert index.count('both') == 11
+    assert index.count('en', 'morning') == 2
+    assert index.pick('th', None, 0) == quotes[-1]
+
+
+def test_uniform_pick_stays_in_language(quotes):
+    sampler = TagSampler(TagIndex(quotes))
+    rng = random.Random(2)
+    assert {sampler.sample('th', rng=rng) for _ in range(20)} == {quotes[-1]}
+
+
+def test_weighted_pick_favours_tagged_quotes(quotes):
+    sampler = TagSampler(TagIndex(quotes))
+    rng = random.Random(3)
+    picks = Counter(sampler.sample('en', {'morning': 4}, rng) for _ in range(DRAWS))
+    # Two quotes of weight 4 against eight of weight 1
+    morning = sum(count for quote, count in picks.items() if 'morning' in quote.tags)
+    assert morning / DRAWS == pytest.approx(8 / 16, abs=0.015)
+
+
+def test_empty_language_raises(quotes):
+    sampler = TagSampler(TagIndex(quotes[:-1]))
+    with pytest.raises(IndexError):
+        sampler.sample('th')
+
+
+def test_invalidate_after_adding_quotes(quotes):
+    index = TagIndex(quotes[:-1])
+    sampler = TagSampler(index)
+    sampler.sample('both')
+    index.add(quotes[-1])
+    sampler.invalidate('th')
+    rng = random.Random(4)
+    assert quotes[-1] in {sampler.sample('both', rng=rng) for _ in range(500)}
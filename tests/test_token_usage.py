@@ -0,0 +1,40 @@
+"""Daily AI token usage shared between processes."""
+from datetime import date, timedelta
+
+from bot.token_usage import USAGE_HISTORY_DAYS, TokenUsageStore
+
+# Budget day of the usage under test
+DAY = date(2026, 6, 10)
+
+
+def test_usage_adds_up_per_day():
+    store = TokenUsageStore()
+    assert store.add(DAY, 100) == 100
+    assert store.add(DAY, 50) == 150
+    assert store.add(DAY + timedelta(days=1), 10) == 10
+    assert store.used(DAY) == 150
+    assert store.used(DAY - timedelta(days=1)) == 0
+
+
+def test_usage_shared_between_processes(tmp_path):
+    first = TokenUsageStore(tmp_path / "usage.sqlite")
+    second = TokenUsageStore(tmp_path / "usage.sqlite")
+    first.add(DAY, 100)
+    assert second.add(DAY, 50) == 150
+    assert first.used(DAY) == 150
+
+
+def test_old_days_are_pruned(tmp_path):
+    first = TokenUsageStore(tmp_path / "usage.sqlite")
+    old_day = DAY - timedelta(days=USAGE_HISTORY_DAYS + 1)
+    first.add(old_day, 100)
+    first.add(DAY, 10)
+    assert TokenUsageStore(tmp_path / "usage.sqlite").used(old_day) == 0
+
+
+def test_unavailable_database_counts_this_process(tmp_path):
+    (tmp_path / "file").write_text("")
+    store = TokenUsageStore(tmp_path / "file" / "usage.sqlite")
+    assert store.add(DAY, 100) == 100
+    assert store.add(DAY, 50) == 150
+    assert store.used(DAY) == 150